@@ -1,14 +1,29 @@
-from .domain import task, class_encodings, Dataset, Image, Annotation, AnnotationSet, Bbox, Segment
-from .sdk import SDK
+import functools
+import importlib.util
+import inspect
+import sys
+import types
+
+from .domain import task, class_encodings, Dataset, Image, Annotation, AnnotationSet, AnnotationTable, Bbox, Segment
 from .version import __version__
 
 _sdk = None
 
 
-def connect(server: str = None, email: str = None, password: str = None, viewer: str = None, remo_home: str = None):
+def connect(
+    server: str = None,
+    email: str = None,
+    password: str = None,
+    viewer: str = None,
+    remo_home: str = None,
+    **api_options
+):
     """
     Connect to a remo server.
     If no parameters are passed, it connects to a local running remo server. To connect to a remote remo, specify connection details.
+
+    It's not needed to call it to use a local server: ``import remo`` doesn't connect, and the first call
+    of an SDK function, e.g. ``remo.list_datasets()``, connects with the settings of the remo config file.
     
     Args:
         server: address where remo is running
@@ -16,9 +31,17 @@ def connect(server: str = None, email: str = None, password: str = None, viewer:
         password: password used for authentication
         (optional) viewer: viewer to use, one between 'browser', 'electron' and 'jupyter'
         (optional) remo_home: location of remo home
+        (optional) cache_ttl: if set, caches datasets, annotation sets and images metadata for the given number of seconds
+        (optional) local_store: if True, keeps a local copy of datasets metadata and can work offline
+        (optional) image_cache_size: if set, caches downloaded image files on disk, up to the given size in bytes
+        (optional) token_cache: if True, shares the auth token with other processes through remo home,
+            instead of logging in again in each process
+        (optional) api_options: connection pool settings, e.g. ``pool_maxsize``, ``keep_alive``, ``timeout``.
+            See also: :class:`remo.api.BaseAPI`
     """
 
     from .config import Config, set_remo_home, set_remo_home_from_default_remo_config
+    from .sdk import SDK
     if remo_home:
         set_remo_home(remo_home)
     else:
@@ -32,20 +55,76 @@ def connect(server: str = None, email: str = None, password: str = None, viewer:
         viewer = config.viewer
 
     global _sdk
-    _sdk = SDK(server, email, password, viewer)
+    _sdk = SDK(server, email, password, viewer, **api_options)
     if config.public_url:
         _sdk.set_public_url(config.public_url)
     # set access to public SDK methods
-    import sys
-
     is_public_sdk_method = lambda name: not name.startswith('_') and callable(getattr(_sdk, name))
     functions = filter(is_public_sdk_method, dir(_sdk))
     for name in functions:
         setattr(sys.modules[__name__], name, getattr(_sdk, name))
 
-try:
-    connect()
-except:
-    print("""Warning: Can't find a running remo app. 
+
+def _get_sdk():
+    """
+    Returns the SDK object, connecting with the remo config settings on first use
+    """
+    if _sdk is None:
+        try:
+            connect()
+        except Exception:
+            print("""Warning: Can't find a running remo app. 
 To start a local server: 'python -m remo_app' and then run remo.connect(). 
 You can also use 'remo.connect()' to connect to a remote server""")
+            raise
+    return _sdk
+
+
+def _lazy_sdk_function(name: str, method):
+    """
+    Returns a function which calls the SDK method, connecting to the server only when it's called.
+    It has the same name, docstring and signature as the method, for ``help()`` and tab completion
+    """
+
+    @functools.wraps(method)
+    def function(*args, **kwargs):
+        return getattr(_get_sdk(), name)(*args, **kwargs)
+
+    if inspect.isfunction(method):
+        # drops ``self``, as in the bound method
+        signature = inspect.signature(method)
+        function.__signature__ = signature.replace(parameters=list(signature.parameters.values())[1:])
+    return function
+
+
+class _LazyModule(types.ModuleType):
+    """
+    Loads SDK classes only when used, and connects to the server on the first call of an SDK function,
+    so ``import remo`` is fast and doesn't need a running server
+    """
+
+    def __getattr__(self, name):
+        if name == 'SDK':
+            from .sdk import SDK as value
+        elif name == 'AsyncSDK':
+            from .async_sdk import AsyncSDK as value
+        elif name.startswith('_') or importlib.util.find_spec('{}.{}'.format(__name__, name)):
+            # submodules not imported yet, e.g. in ``from . import arrow``, are left to the import system
+            raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+        else:
+            from .sdk import SDK
+
+            method = inspect.getattr_static(SDK, name, None)
+            if isinstance(method, (staticmethod, classmethod)):
+                method = getattr(SDK, name)
+            if not callable(method):
+                raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+            # looking the function up, e.g. with hasattr() or tab completion, doesn't connect.
+            # connect() replaces it with the SDK methods
+            value = _lazy_sdk_function(name, method)
+
+        setattr(self, name, value)
+        return value
+
+
+sys.modules[__name__].__class__ = _LazyModule
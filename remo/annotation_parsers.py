@@ -0,0 +1,279 @@
+"""
+Fast local readers of annotation files, to pre-process annotations before uploading them.
+
+Numeric columns are converted with NumPy in one go, instead of value by value,
+and folders of per-image files (Pascal VOC, YOLO) are parsed in parallel with a process pool.
+Readers return a list of :class:`remo.Annotation`, or a :class:`remo.AnnotationTable` with ``as_table=True``.
+"""
+import csv
+import json
+import os
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from .domain.annotation_table import AnnotationTable, _import_numpy
+
+# below this number of files, parsing in the current process is faster than starting a process pool
+MIN_FILES_FOR_PROCESS_POOL = 64
+
+
+def _build_table(img_names: list, class_names: list, bboxes=None, segments: list = None) -> AnnotationTable:
+    """
+    Builds annotation table from per-annotation columns.
+    Class names can contain more classes separated by ``;``, which are split in more rows of the same annotation
+    """
+    np = _import_numpy()
+    n = len(img_names)
+    split_classes = [name.split(';') if name and ';' in name else [name] for name in class_names]
+    counts = np.array([len(names) for names in split_classes], dtype=np.int64)
+    annotation_ids = np.repeat(np.arange(n, dtype=np.int64), counts)
+    row_classes = [name or '' for names in split_classes for name in names]
+
+    classes, class_codes = np.unique(np.array(row_classes, dtype=object), return_inverse=True)
+    classes = classes.tolist()
+    class_codes = class_codes.astype(np.int32)
+    if '' in classes:
+        empty = classes.index('')
+        class_codes = np.where(class_codes == empty, -1, class_codes - (class_codes > empty)).astype(np.int32)
+        classes.remove('')
+
+    if bboxes is None:
+        bboxes = np.full((n, 4), np.nan)
+
+    if segments:
+        lengths = np.array([len(segment) for segment in segments], dtype=np.int64)
+        coordinates = np.concatenate([np.asarray(segment, dtype=np.float64) for segment in segments] or [[]])
+    else:
+        lengths = np.zeros(n, dtype=np.int64)
+        coordinates = np.zeros(0)
+    # rows of the same annotation share its segment, so it's repeated for each class
+    row_lengths = lengths[annotation_ids]
+    starts = np.concatenate(([0], np.cumsum(lengths)))[annotation_ids]
+    segment_offsets = np.concatenate(([0], np.cumsum(row_lengths))).astype(np.int64)
+    coordinate_index = np.repeat(starts - segment_offsets[:-1], row_lengths) + np.arange(segment_offsets[-1])
+
+    return AnnotationTable(
+        classes=classes,
+        image_ids=np.full(len(annotation_ids), -1, dtype=np.int64),
+        image_names=np.array(img_names, dtype=object)[annotation_ids],
+        class_codes=class_codes,
+        annotation_ids=annotation_ids,
+        bboxes=np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)[annotation_ids],
+        segment_coordinates=coordinates[coordinate_index],
+        segment_offsets=segment_offsets,
+    )
+
+
+def _result(table: AnnotationTable, as_table: bool):
+    return table if as_table else table.to_annotations()
+
+
+def _list_files(paths, extension: str) -> List[str]:
+    if isinstance(paths, str):
+        paths = [paths]
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files += [os.path.join(root, name) for name in sorted(names) if name.lower().endswith(extension)]
+        else:
+            files.append(path)
+    return files
+
+
+def _parse_in_parallel(parse_files, files: List[str], max_workers: int = None) -> list:
+    """
+    Splits files in chunks and parses them with a process pool
+
+    Returns:
+        list of results of each chunk, in order
+    """
+    if len(files) < MIN_FILES_FOR_PROCESS_POOL or max_workers == 1:
+        return [parse_files(files)]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    chunk_size = max(1, len(files) // (max_workers * 4))
+    chunks = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+    with ProcessPoolExecutor(max_workers) as ex:
+        return list(ex.map(parse_files, chunks))
+
+
+def parse_csv(file_path: str, as_table: bool = False):
+    """
+    Reads annotations from a Remo CSV file. Supported headers are:
+
+    - ``file_name, class_name, xmin, ymin, xmax, ymax`` for object detection
+    - ``file_name, class_name, coordinates`` for instance segmentation, with coordinates as ``x0; y0; x1; y1; ...``
+    - ``file_name, class_name`` for image classification
+
+    Multiple classes can be separated by ``;``.
+
+    Args:
+        file_path: path to CSV file
+        as_table: if True, returns :class:`remo.AnnotationTable`
+
+    Returns:
+        List[:class:`remo.Annotation`] or :class:`remo.AnnotationTable`
+    """
+    np = _import_numpy()
+    with open(file_path, newline='') as file:
+        reader = csv.reader(file)
+        headers = [header.strip() for header in next(reader, [])]
+        columns = dict(zip(headers, zip(*reader)))
+
+    if 'file_name' not in headers or 'class_name' not in headers:
+        raise Exception("CSV file {} needs 'file_name' and 'class_name' columns".format(file_path))
+
+    img_names = list(columns.get('file_name', []))
+    class_names = list(columns.get('class_name', []))
+    bboxes, segments = None, None
+
+    if 'xmin' in columns:
+        bboxes = np.column_stack(
+            [np.asarray(columns[name], dtype=np.float64) for name in ('xmin', 'ymin', 'xmax', 'ymax')]
+        )
+    elif 'coordinates' in columns:
+        coordinates = columns['coordinates']
+        values = np.asarray(';'.join(coordinates).split(';'), dtype=np.float64) if coordinates else np.zeros(0)
+        lengths = [value.count(';') + 1 for value in coordinates]
+        segments = np.split(values, np.cumsum(lengths)[:-1]) if lengths else []
+
+    return _result(_build_table(img_names, class_names, bboxes, segments), as_table)
+
+
+def parse_coco(file_path: str, as_table: bool = False):
+    """
+    Reads annotations from a COCO JSON file.
+    Polygon segmentations are read as segments, one per polygon, other annotations as bounding boxes
+
+    Args:
+        file_path: path to COCO JSON file
+        as_table: if True, returns :class:`remo.AnnotationTable`
+
+    Returns:
+        List[:class:`remo.Annotation`] or :class:`remo.AnnotationTable`
+    """
+    np = _import_numpy()
+    with open(file_path) as file:
+        data = json.load(file)
+
+    img_names_by_id = {img['id']: img['file_name'] for img in data.get('images', [])}
+    classes_by_id = {category['id']: category['name'] for category in data.get('categories', [])}
+
+    img_names, class_names, boxes, segments = [], [], [], []
+    for annotation in data.get('annotations', []):
+        img_name = img_names_by_id.get(annotation['image_id'])
+        class_name = classes_by_id.get(annotation.get('category_id'))
+        polygons = annotation.get('segmentation')
+        if isinstance(polygons, list) and polygons:
+            for polygon in polygons:
+                img_names.append(img_name)
+                class_names.append(class_name)
+                boxes.append([np.nan] * 4)
+                segments.append(polygon)
+        else:
+            img_names.append(img_name)
+            class_names.append(class_name)
+            boxes.append(annotation.get('bbox') or [np.nan] * 4)
+            segments.append([])
+
+    # COCO boxes are x, y, width, height
+    bboxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    bboxes[:, 2:] += bboxes[:, :2]
+    return _result(_build_table(img_names, class_names, bboxes, segments), as_table)
+
+
+def _parse_voc_files(files: List[str]) -> tuple:
+    img_names, class_names, boxes = [], [], []
+    for path in files:
+        root = ET.parse(path).getroot()
+        img_name = root.findtext('filename') or os.path.splitext(os.path.basename(path))[0]
+        for obj in root.iter('object'):
+            box = obj.find('bndbox')
+            img_names.append(img_name)
+            class_names.append(obj.findtext('name'))
+            boxes.append(
+                [box.findtext(name) for name in ('xmin', 'ymin', 'xmax', 'ymax')] if box is not None else ['nan'] * 4
+            )
+    return img_names, class_names, boxes
+
+
+def parse_voc(paths, as_table: bool = False, max_workers: int = None):
+    """
+    Reads bounding boxes from Pascal VOC XML files
+
+    Args:
+        paths: XML file, folder of XML files, or list of them. Folders are scanned recursively
+        as_table: if True, returns :class:`remo.AnnotationTable`
+        max_workers: number of processes used to parse files. By default uses all CPUs
+
+    Returns:
+        List[:class:`remo.Annotation`] or :class:`remo.AnnotationTable`
+    """
+    np = _import_numpy()
+    img_names, class_names, boxes = [], [], []
+    for names, classes, chunk_boxes in _parse_in_parallel(_parse_voc_files, _list_files(paths, '.xml'), max_workers):
+        img_names += names
+        class_names += classes
+        boxes += chunk_boxes
+
+    bboxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    return _result(_build_table(img_names, class_names, bboxes), as_table)
+
+
+def _parse_yolo_files(files: List[str]) -> tuple:
+    np = _import_numpy()
+    stems, counts, values = [], [], []
+    for path in files:
+        with open(path) as file:
+            tokens = file.read().split()
+        stems.append(os.path.splitext(os.path.basename(path))[0])
+        counts.append(len(tokens) // 5)
+        values += tokens[: len(tokens) // 5 * 5]
+    return stems, counts, np.asarray(values, dtype=np.float64).reshape(-1, 5)
+
+
+def parse_yolo(
+    paths,
+    classes: List[str],
+    image_sizes: dict = None,
+    image_extension: str = '.jpg',
+    as_table: bool = False,
+    max_workers: int = None,
+):
+    """
+    Reads bounding boxes from YOLO txt files, with one ``class_index x_center y_center width height`` row per box,
+    and coordinates relative to image size
+
+    Args:
+        paths: txt file, folder of txt files, or list of them. Folders are scanned recursively
+        classes: class names, by class index
+        image_sizes: dictionary of ``(width, height)`` by image file name, to convert coordinates to pixels.
+            Boxes of images not in the dictionary keep relative coordinates
+        image_extension: extension of image files, used to get image file names from txt file names
+        as_table: if True, returns :class:`remo.AnnotationTable`
+        max_workers: number of processes used to parse files. By default uses all CPUs
+
+    Returns:
+        List[:class:`remo.Annotation`] or :class:`remo.AnnotationTable`
+    """
+    np = _import_numpy()
+    stems, counts, chunks = [], [], []
+    for chunk_stems, chunk_counts, values in _parse_in_parallel(_parse_yolo_files, _list_files(paths, '.txt'), max_workers):
+        stems += chunk_stems
+        counts += chunk_counts
+        chunks.append(values)
+
+    values = np.concatenate(chunks) if chunks else np.zeros((0, 5))
+    img_names = np.repeat(np.array([stem + image_extension for stem in stems], dtype=object), counts)
+    class_names = np.array(classes, dtype=object)[values[:, 0].astype(np.int64)]
+
+    half_sizes = values[:, 3:5] / 2
+    bboxes = np.hstack([values[:, 1:3] - half_sizes, values[:, 1:3] + half_sizes])
+    if image_sizes:
+        sizes = np.array([image_sizes.get(name, (1, 1)) for name in img_names], dtype=np.float64).reshape(-1, 2)
+        bboxes *= np.hstack([sizes, sizes])
+
+    return _result(_build_table(img_names.tolist(), class_names.tolist(), bboxes), as_table)
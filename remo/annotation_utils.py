@@ -1,7 +1,8 @@
 import csv
+import itertools
 import os
 import tempfile
-from typing import List, TypeVar
+from typing import Iterable, Iterator, List, TypeVar
 from .domain.task import *
 
 Annotation = TypeVar('Annotation')
@@ -28,15 +29,22 @@ class SimpleCSVBase:
             return classes
         return ''
 
-    def validate_annotation_task(self, annotations: List[Annotation]):
+    def validate_annotation_task(self, annotations: Iterable[Annotation]):
         for annotation in annotations:
             check_annotation_task(self.task, annotation.task)
 
-    def prepare_data(self, annotations: List[Annotation]) -> List[List[str]]:
-        self.validate_annotation_task(annotations)
-        return [self.headers, *self._csv_data(annotations)]
+    def prepare_data(self, annotations: Iterable[Annotation]) -> List[List[str]]:
+        return [self.headers, *self.rows(annotations)]
 
-    def _csv_data(self, annotations: List[Annotation]) -> List[List[str]]:
+    def rows(self, annotations: Iterable[Annotation]) -> Iterator[List[str]]:
+        """
+        Validates annotations and converts them to CSV rows one by one, without headers
+        """
+        for annotation in annotations:
+            check_annotation_task(self.task, annotation.task)
+            yield self._csv_row(annotation)
+
+    def _csv_row(self, annotation: Annotation) -> List[str]:
         return []
 
 
@@ -44,11 +52,8 @@ class SimpleCSVForObjectDetection(SimpleCSVBase):
     task = object_detection
     headers = ["file_name", "class_name", "xmin", "ymin", "xmax", "ymax"]
 
-    def _csv_data(self, annotations: List[Annotation]) -> List[List[str]]:
-        return [
-            [annotation.img_filename,  self.inline_classes(annotation.classes), *annotation.coordinates]
-            for annotation in annotations
-        ]
+    def _csv_row(self, annotation: Annotation) -> List[str]:
+        return [annotation.img_filename, self.inline_classes(annotation.classes), *annotation.coordinates]
 
 
 class SimpleCSVForInstanceSegmentation(SimpleCSVBase):
@@ -59,14 +64,11 @@ class SimpleCSVForInstanceSegmentation(SimpleCSVBase):
     def inline_coordinates(coordinates):
         return '; '.join(map(str, coordinates))
 
-    def _csv_data(self, annotations: List[Annotation]) -> List[List[str]]:
+    def _csv_row(self, annotation: Annotation) -> List[str]:
         return [
-            [
-                annotation.img_filename,
-                self.inline_classes(annotation.classes),
-                self.inline_coordinates(annotation.coordinates),
-            ]
-            for annotation in annotations
+            annotation.img_filename,
+            self.inline_classes(annotation.classes),
+            self.inline_coordinates(annotation.coordinates),
         ]
 
 
@@ -74,8 +76,8 @@ class SimpleCSVForImageClassification(SimpleCSVBase):
     task = image_classification
     headers = ["file_name", "class_name"]
 
-    def _csv_data(self, annotations: List[Annotation]) -> List[List[str]]:
-        return [[annotation.img_filename, self.inline_classes(annotation.classes)] for annotation in annotations]
+    def _csv_row(self, annotation: Annotation) -> List[str]:
+        return [annotation.img_filename, self.inline_classes(annotation.classes)]
 
 
 csv_makers = {
@@ -85,7 +87,7 @@ csv_makers = {
 }
 
 
-def prepare_annotations_for_upload(annotations: List[Annotation], annotation_task):
+def get_csv_maker(annotation_task) -> SimpleCSVBase:
     csv_maker = csv_makers.get(annotation_task)
     if not csv_maker:
         raise Exception(
@@ -93,32 +95,130 @@ def prepare_annotations_for_upload(annotations: List[Annotation], annotation_tas
             "Supported annotation tasks are 'instance_segmentation', 'object_detection' and "
             "'image_classification'".format(annotation_task)
         )
+    return csv_maker
 
-    return csv_maker.prepare_data(annotations)
 
+def prepare_annotations_for_upload(annotations: Iterable[Annotation], annotation_task):
+    return get_csv_maker(annotation_task).prepare_data(annotations)
 
-def create_tempfile(annotations: List[Annotation]) -> (str, List[str]):
-    fd, temp_path = tempfile.mkstemp(suffix='.csv')
 
-    annotation_task = annotations[0].task
-    prepared_data = prepare_annotations_for_upload(annotations, annotation_task)
+def peek_annotation_task(annotations: Iterable[Annotation]) -> (str, Iterator[Annotation]):
+    """
+    Gets annotation task from the first annotation, without consuming the annotations
+
+    Returns:
+        tuple of annotation task and iterator over all annotations
+    """
+    annotations = iter(annotations)
+    first = next(annotations, None)
+    if first is None:
+        raise Exception('No annotations were given')
+    return first.task, itertools.chain([first], annotations)
 
-    # getting a list of classes. Skipping the first row as it contains the csv header
-    list_of_classes = [row[1] for row in prepared_data[1:]]
+
+def write_annotations_csv(annotations: Iterable[Annotation], file) -> (str, List[str]):
+    """
+    Writes annotations to CSV file in a single pass, validating the annotation task and collecting classes on the way.
+    Annotations can be any iterable, e.g. a generator, so they don't need to be all in memory.
+
+    Args:
+        annotations: annotations, all of the same task
+        file: text file object to write to
+
+    Returns:
+        tuple of annotation task and list of classes
+    """
+    annotation_task, annotations = peek_annotation_task(annotations)
+    csv_maker = get_csv_maker(annotation_task)
 
     classes = set()
-    if isinstance(list_of_classes, list) and list_of_classes:
-        for item in list_of_classes:
-            if isinstance(item, list):
-                classes.union(item)
-            else:
-                classes.add(item)
-
-    list_of_classes = list(classes)
-
-    with os.fdopen(fd, 'w') as temp:
-        writer = csv.writer(temp)
-        writer.writerows(prepared_data)
+
+    def collect_classes(annotations):
+        for annotation in annotations:
+            classes.update(annotation.classes)
+            yield annotation
+
+    writer = csv.writer(file)
+    writer.writerow(csv_maker.headers)
+    writer.writerows(csv_maker.rows(collect_classes(annotations)))
+    return annotation_task, list(classes)
+
+
+class _CountingWriter:
+    """
+    Text file wrapper which counts number of written bytes, as encoded in utf-8
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.size = 0
+
+    def write(self, data: str):
+        self.size += len(data.encode('utf-8'))
+        return self.file.write(data)
+
+
+def iter_csv_chunks(
+    annotations: Iterable[Annotation], max_rows: int = None, max_bytes: int = None
+) -> Iterator[tuple]:
+    """
+    Splits annotations into temporary CSV files, each one with at most ``max_rows`` annotations
+    and about ``max_bytes`` size. Files are written one by one, while annotations are consumed.
+    Files need to be removed by the caller.
+
+    Args:
+        annotations: annotations, all of the same task. Can be any iterable, e.g. a generator
+        max_rows: maximum number of annotations in each file
+        max_bytes: approximate maximum size of each file
+
+    Returns:
+        Iterator of tuples of temporary file path and number of annotations in it
+    """
+    if not (max_rows or max_bytes):
+        raise Exception('Define max_rows or max_bytes to split annotations in chunks')
+
+    annotation_task, annotations = peek_annotation_task(annotations)
+    csv_maker = get_csv_maker(annotation_task)
+    rows = csv_maker.rows(annotations)
+
+    row = next(rows, None)
+    while row is not None:
+        fd, temp_path = tempfile.mkstemp(suffix='.csv')
+        n_rows = 0
+        try:
+            with os.fdopen(fd, 'w', newline='', encoding='utf-8') as temp:
+                counter = _CountingWriter(temp)
+                writer = csv.writer(counter)
+                writer.writerow(csv_maker.headers)
+                while row is not None:
+                    writer.writerow(row)
+                    n_rows += 1
+                    row = next(rows, None)
+                    if (max_rows and n_rows >= max_rows) or (max_bytes and counter.size >= max_bytes):
+                        break
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        yield temp_path, n_rows
+
+
+def create_tempfile(annotations: Iterable[Annotation]) -> (str, List[str]):
+    """
+    Writes annotations to a temporary CSV file, in a single streaming pass.
+
+    Args:
+        annotations: annotations, all of the same task. Can be any iterable, e.g. a generator
+
+    Returns:
+        tuple of temporary file path and list of classes
+    """
+    fd, temp_path = tempfile.mkstemp(suffix='.csv')
+    try:
+        with os.fdopen(fd, 'w', newline='') as temp:
+            _, list_of_classes = write_annotations_csv(annotations, temp)
+    except Exception:
+        os.remove(temp_path)
+        raise
 
     return temp_path, list_of_classes
 
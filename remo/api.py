@@ -1,26 +1,43 @@
 import http
 import os
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import filetype
 import requests
-from urllib.parse import quote
+from typing import Iterator
+from urllib.parse import quote, parse_qs, urlparse
 
 from .endpoints import backend
-from .utils import FileResolver
+from .multipart import MultipartEncoder
+from .token_cache import TokenCache
+from .config import remo_home_path
+from .dedup import UploadIndex
+from .upload_manifest import UploadManifest
+from .utils import FileResolver, iter_pages
 
 
 class UploadStatus:
+    """
+    Tracks and reports upload progress. Can be shared between upload threads.
+    """
+
     def __init__(self, total_count):
         self.total_count = total_count
         self.current_count = 0
         self.start = datetime.now()
         self.reported_progress = 0
+        self._lock = threading.Lock()
 
     def update(self, count):
-        self.current_count += count
+        with self._lock:
+            self.current_count += count
 
     def progress(self):
+        with self._lock:
+            self._progress()
+
+    def _progress(self):
         percentage = int(self.current_count / self.total_count * 100)
         if percentage > self.reported_progress:
             elapsed = (datetime.now() - self.start).seconds + 1e-3
@@ -39,16 +56,118 @@ class UploadStatus:
         self.reported_progress = percentage
 
 
+class ExportError(ValueError):
+    """
+    Raised when the server fails to export annotations
+    """
+
+
 class BaseAPI:
-    def __init__(self, server, email, password):
+    """
+    Keeps authenticated connection to remo server.
+
+    All requests share one :class:`requests.Session`, so TCP and TLS connections are pooled and kept alive
+    between calls instead of being re-established on every request.
+
+    Args:
+        server: server host name, e.g. ``http://localhost:8123/``
+        email: user credentials
+        password: user credentials
+        pool_connections: number of per-host connection pools to cache
+        pool_maxsize: maximum number of connections kept open per host.
+            Should be at least the number of threads sharing the API
+        pool_block: if True, limits the number of connections per host to ``pool_maxsize``
+            and blocks until one is free, otherwise extra connections are opened and discarded after use
+        keep_alive: if False, closes connection after each request
+        timeout: default timeout in seconds for all requests, can be a ``(connect, read)`` tuple.
+            None means wait forever
+        max_retries: number of retries for failed connection attempts
+        login: if False, logs in on first request instead of immediately
+        token_cache: if True, reuses auth tokens stored in remo home by other processes, and stores new ones.
+            See also: :class:`remo.token_cache.TokenCache`
+
+    If the server rejects the token with 401 Unauthorized, it logs in again once and repeats the request.
+    When many threads get 401 at the same time, only one logs in and the others wait for the new token.
+    """
+
+    def __init__(
+        self,
+        server,
+        email,
+        password,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout=None,
+        max_retries: int = 0,
+        login: bool = True,
+        token_cache: bool = False,
+    ):
         self.server = server
         self.token = None
+        self.token_cache = TokenCache() if token_cache else None
+        self._login_lock = threading.Lock()
+        self._email = email
+        self._password = password
         self._public_url = ''
-        self._login(email, password)
+        self.timeout = timeout
+        self.session = self._new_session(pool_connections, pool_maxsize, pool_block, keep_alive, max_retries)
+        if login:
+            self.login()
+
+    @staticmethod
+    def _new_session(pool_connections, pool_maxsize, pool_block, keep_alive, max_retries):
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=max_retries,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def close(self):
+        """
+        Closes all pooled connections
+        """
+        self.session.close()
+
+    def login(self):
+        """
+        Logs in to the server. With token cache, it uses the cached token if there is a new one
+        """
+        self._refresh_token(rejected_token=self.token)
+
+    def _refresh_token(self, rejected_token: str = None):
+        """
+        Gets a new token in place of ``rejected_token``. If another thread or process already got one,
+        it's used, instead of logging in again
+        """
+        with self._login_lock:
+            if self.token is not None and self.token != rejected_token:
+                return
+
+            if self.token_cache is None:
+                self._login(self._email, self._password)
+                return
+
+            with self.token_cache.lock(self.server, self._email):
+                token = self.token_cache.get(self.server, self._email)
+                if token and token != rejected_token:
+                    self.token = token
+                    return
+
+                self._login(self._email, self._password)
+                self.token_cache.set(self.server, self._email, self.token)
 
     def _login(self, email, password):
         try:
-            resp = requests.post(self.url(backend.login), data={"password": password, "email": email})
+            resp = self._request('post', self.url(backend.login), data={"password": password, "email": email})
         except requests.exceptions.ConnectionError:
             raise Exception('Failed connect to server: {}'.format(self.server))
 
@@ -62,7 +181,7 @@ class BaseAPI:
 
     def _auth_header(self):
         if not self._is_authenticated():
-            raise Exception('Not authenticated')
+            self._refresh_token()
         return {'Authorization': 'Token {}'.format(self.token)}
 
     def set_public_url(self, public_url: str):
@@ -75,14 +194,35 @@ class BaseAPI:
     def url(self, endpoint, *args, **kwargs):
         return self._build_url(self.server, endpoint, *args, **kwargs)
 
+    def _request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def _auth_request(self, method, url, headers=None, **kwargs):
+        auth_header = self._auth_header()
+        resp = self._request(method, url, headers=dict(headers or {}, **auth_header), **kwargs)
+        if resp.status_code != http.HTTPStatus.UNAUTHORIZED:
+            return resp
+
+        # token expired or was revoked: logs in again, once, and repeats the request, if its body can be sent again
+        data = kwargs.get('data')
+        if data is not None and not isinstance(data, (dict, list, str, bytes)):
+            if not hasattr(data, 'rewind'):
+                return resp
+            data.rewind()
+
+        resp.close()
+        self._refresh_token(rejected_token=auth_header['Authorization'].split(' ', 1)[1])
+        return self._request(method, url, headers=dict(headers or {}, **self._auth_header()), **kwargs)
+
     def post(self, *args, **kwargs):
-        return requests.post(*args, headers=self._auth_header(), **kwargs)
+        return self._auth_request('post', *args, **kwargs)
 
     def get(self, *args, **kwargs):
-        return requests.get(*args, headers=self._auth_header(), **kwargs)
+        return self._auth_request('get', *args, **kwargs)
 
     def delete(self, *args, **kwargs):
-        return requests.delete(*args, headers=self._auth_header(), **kwargs)
+        return self._auth_request('delete', *args, **kwargs)
 
     @staticmethod
     def _build_url(*args, **kwargs):
@@ -124,6 +264,19 @@ class BaseAPI:
 
 
 class API(BaseAPI):
+    min_search_page_size = 25
+    max_search_page_size = 1000
+    _upload_index = None
+
+    @property
+    def upload_index(self) -> UploadIndex:
+        """
+        Local index of content uploaded to datasets, used to skip duplicated uploads
+        """
+        if self._upload_index is None:
+            self._upload_index = UploadIndex()
+        return self._upload_index
+
     def create_dataset(self, name):
         return self.post(self.url(backend.dataset), json={"name": name}).json()
 
@@ -171,14 +324,18 @@ class API(BaseAPI):
             return self.post(url, json=payload).json()
 
     def upload_file(self, dataset_id, path, annotation_task=None, folder_id=None):
-        name = os.path.basename(path)
-        files = {'files': (name, open(path, 'rb'), filetype.guess_mime(path))}
-        data = {}
+        fields = []
         if annotation_task:
-            data['annotation_task'] = annotation_task
+            fields.append(('annotation_task', annotation_task))
 
         url = self.url(backend.dataset_upload.format(dataset_id), folder_id=folder_id)
-        return self.post(url, files=files, data=data).json()
+        return self._post_multipart(url, MultipartEncoder(fields, [('files', path)])).json()
+
+    def _post_multipart(self, url, encoder: MultipartEncoder):
+        try:
+            return self.post(url, data=encoder, headers={'Content-Type': encoder.content_type})
+        finally:
+            encoder.close()
 
     # TODO: fix progress to include both local files and uploads
     def upload_files(
@@ -192,25 +349,45 @@ class API(BaseAPI):
         class_encoding=None,
         session_id: str = None
     ):
-        files = [
-            ('files', (os.path.basename(path), open(path, 'rb'), filetype.guess_mime(path)))
-            for path in files_to_upload
-        ]
-        data = {}
+        return self._upload_files(
+            dataset_id, files_to_upload, annotation_task, folder_id, status, annotation_set_id, class_encoding, session_id
+        ).json()
+
+    def _upload_files(
+        self,
+        dataset_id,
+        files_to_upload,
+        annotation_task=None,
+        folder_id=None,
+        status=None,
+        annotation_set_id=None,
+        class_encoding=None,
+        session_id: str = None
+    ):
+        """
+        Uploads one group of files
+
+        Returns:
+            server response
+        """
+        fields = []
         if annotation_task:
-            data['annotation_task'] = annotation_task
+            fields.append(('annotation_task', annotation_task))
         if session_id:
-            data['session_id'] = session_id
+            fields.append(('session_id', session_id))
         if isinstance(class_encoding, dict):
             for key, val in class_encoding.items():
-                data['class_encoding_{}'.format(key)] = val
+                fields.append(('class_encoding_{}'.format(key), val))
+
+        # files are streamed from disk one by one, so the whole group is never loaded in memory
+        files = [('files', path) for path in files_to_upload]
 
         url = self.url(
             backend.dataset_upload.format(dataset_id),
             folder_id=folder_id,
             annotation_set_id=annotation_set_id,
         )
-        r = self.post(url, files=files, data=data)
+        r = self._post_multipart(url, MultipartEncoder(fields, files))
         json_resp = r.json()
         
         if (r.status_code >= http.HTTPStatus.BAD_REQUEST) and ('errors' in json_resp):
@@ -219,9 +396,10 @@ class API(BaseAPI):
         if r.status_code != http.HTTPStatus.OK:
             print('Error - Response:', r.text, 'files:', files_to_upload)
 
-        status.update(len(files))
-        status.progress()
-        return json_resp
+        if status:
+            status.update(len(files))
+            status.progress()
+        return r
 
     # TODO: fix progress to include both local files and uploads
     def bulk_upload_files(
@@ -232,23 +410,74 @@ class API(BaseAPI):
         folder_id=None,
         annotation_set_id=None,
         class_encoding=None,
-        session_id: str = None
+        session_id: str = None,
+        max_workers: int = 1,
+        manifest: UploadManifest = None,
+        deduplicate: bool = False,
     ):
+        """
+        Uploads files in groups of about 8 MB.
+
+        Args:
+            max_workers: number of groups uploaded in parallel.
+                To reuse connections, keep it below ``pool_maxsize`` of the API
+            manifest: checkpoint of the upload. Groups already recorded as uploaded in the manifest are skipped,
+                newly uploaded groups are recorded in it
+            deduplicate: if True, skips images whose content was already uploaded to the dataset from this machine.
+                See also: :class:`remo.dedup.UploadIndex`
+
+        Returns:
+            list of upload results, one per group, in upload order
+        """
 
-        # files to upload
-        files = FileResolver(files_to_upload, annotation_task or annotation_set_id).resolve()
-        groups = self.split_files_by_size(files)
-        status = UploadStatus(len(files))
-        with ThreadPoolExecutor(1) as ex:
-            results = ex.map(
-                lambda bulk: self.upload_files(
-                    dataset_id, bulk, annotation_task, folder_id, status, annotation_set_id, class_encoding, session_id
-                ),
-                groups,
+        if manifest and manifest.groups is not None:
+            groups = manifest.groups
+        else:
+            # files to upload
+            files = FileResolver(files_to_upload, annotation_task or annotation_set_id).resolve()
+            if deduplicate:
+                files = self._skip_uploaded_files(dataset_id, files, max_workers)
+            groups = self.split_files_by_size(files)
+            if manifest:
+                manifest.set_groups(groups)
+
+        status = UploadStatus(sum(map(len, groups)))
+
+        def upload_group(index):
+            if manifest and manifest.is_group_done(index):
+                status.update(len(groups[index]))
+                return manifest.results[index]
+
+            r = self._upload_files(
+                dataset_id, groups[index], annotation_task, folder_id, status, annotation_set_id, class_encoding, session_id
             )
+            result = r.json()
+            # a failed group is not recorded, so it's uploaded again when the upload is resumed or repeated
+            if r.status_code == http.HTTPStatus.OK:
+                if manifest:
+                    manifest.mark_group_done(index, result)
+                if deduplicate:
+                    self.upload_index.add_uploaded(self.server, dataset_id, groups[index])
+            return result
+
+        with ThreadPoolExecutor(max(1, max_workers)) as ex:
+            results = list(ex.map(upload_group, range(len(groups))))
 
         return results
 
+    def _skip_uploaded_files(self, dataset_id, files, max_workers=1):
+        new_files, skipped_bytes = self.upload_index.filter_new(
+            self.server, dataset_id, files, max_workers=max(max_workers, os.cpu_count() or 1)
+        )
+        skipped = len(files) - len(new_files)
+        if skipped:
+            print(
+                'Skipping {} files already uploaded to the dataset - saved {:.1f} MB'.format(
+                    skipped, skipped_bytes / (1024 * 1024)
+                )
+            )
+        return new_files
+
     def chunks(self, my_list, chunk_size=2000):
         groups = []
         """Yield successive n-sized chunks from l."""
@@ -257,7 +486,8 @@ class API(BaseAPI):
 
         return groups
 
-    def split_files_by_size(self, files):
+    @staticmethod
+    def split_files_by_size(files):
         groups = []
         bulk = []
         total_size = 0
@@ -397,7 +627,44 @@ class API(BaseAPI):
             annotation file content
         """
 
-        url = self.url(
+        url = self._export_annotations_url(
+            annotation_set_id, annotation_format, export_coordinates, full_path, export_tags, filter_by_tags
+        )
+        return self.get(url).content
+
+    def open_export_annotations(
+        self,
+        annotation_set_id: int,
+        annotation_format='json',
+        export_coordinates='pixel',
+        full_path=True,
+        export_tags: bool = False,
+        filter_by_tags: list = None
+    ):
+        """
+        Same as :func:`export_annotations`, but returns file-like object to read annotations content while it's downloaded.
+        It needs to be closed after use.
+
+        Returns:
+            file-like object
+
+        Raises:
+            ExportError: if the server doesn't return the export
+        """
+        url = self._export_annotations_url(
+            annotation_set_id, annotation_format, export_coordinates, full_path, export_tags, filter_by_tags
+        )
+        resp = self.get(url, stream=True)
+        if resp.status_code != http.HTTPStatus.OK:
+            raise ExportError('Failed to export annotation set {}: {}'.format(annotation_set_id, resp.text))
+
+        resp.raw.decode_content = True
+        return resp.raw
+
+    def _export_annotations_url(
+        self, annotation_set_id, annotation_format, export_coordinates, full_path, export_tags, filter_by_tags
+    ):
+        return self.url(
             backend.v1_export_annotations.format(annotation_set_id),
             annotation_format=annotation_format,
             export_coordinates=export_coordinates,
@@ -405,7 +672,6 @@ class API(BaseAPI):
             export_tags=str(export_tags).lower(),
             filter_by_tags=filter_by_tags
         )
-        return self.get(url).content
 
     def get_annotation_info(self, dataset_id, annotation_set_id, image_id):
         """
@@ -435,6 +701,23 @@ class API(BaseAPI):
     def get_image_content(self, url) -> bytes:
         return self.get(self.url(url)).content
 
+    def iter_image_content(self, url, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        """
+        Downloads image file content in chunks, without keeping the whole file in memory
+
+        Args:
+            url: image url
+            chunk_size: size of chunks, in bytes
+
+        Returns:
+            Iterator[bytes] of content chunks
+        """
+        resp = self.get(self.url(url), stream=True)
+        with resp:
+            if resp.status_code != http.HTTPStatus.OK:
+                raise Exception('Failed to download image {}: {}'.format(url, resp.text))
+            yield from resp.iter_content(chunk_size)
+
     def get_image(self, image_id):
         url = self.url(backend.v1_sdk_images, image_id, tail_slash=True)
         return self.get(url).json()
@@ -464,36 +747,9 @@ class API(BaseAPI):
             list of JSON objects (images and annotations)
         """
 
-        def stringify(val) -> str:
-            """
-            Converts list of string to coma separated string
-            :param val: can be int, string or list of these types
-            :return: string
-            """
-            if type(val) not in (int, str, list):
-                return ''
-
-            if isinstance(val, list):
-                if any(map(lambda v: type(v) not in (str, int), val)):
-                    return ''
-
-                return ','.join(map(str, val))
-
-            return str(val)
-
-        params = {}
-        if annotation_sets:
-            params['sets'] = stringify(annotation_sets)
-        if classes:
-            params['classes'] = stringify(classes)
-        if classes_not:
-            params['classes_not'] = stringify(classes_not)
-        if tags:
-            params['tags'] = stringify(tags)
-        if tags_not:
-            params['tags_not'] = stringify(tags_not)
-        if image_name_contains:
-            params['image_name'] = image_name_contains
+        params = self._search_params(
+            annotation_sets, classes, classes_not, tags, tags_not, image_name_contains
+        )
 
         page_limit = 25
         load_all_results = True
@@ -531,6 +787,169 @@ class API(BaseAPI):
             url = self.url(next_url)
         return results
 
+    def iter_search_images(
+            self,
+            dataset_id: int,
+            annotation_sets: int = None,
+            classes: str = None, classes_not: str = None,
+            tags: str = None, tags_not: str = None,
+            image_name_contains: str = None,
+            limit=None,
+            page_size: int = None,
+            max_pages_in_flight: int = 4,
+    ) -> Iterator[dict]:
+        """
+        Search images given a list of classes and tasks, yielding results as soon as each page arrives.
+
+        When the server paginates by offset, next pages are requested concurrently, in the background.
+        Unless ``page_size`` is set, page size starts small, to get first results quickly,
+        and then adapts to keep each request around one second.
+
+        Args:
+            dataset_id: narrows search result to given dataset
+            annotation_sets: narrows search result to given annotation sets (can be multiple, e.g. [1, 2])
+            classes: string or list of strings - search for images which match all given classes
+            classes_not: string or list of strings - search for images which excludes all given classes
+            tags: string or list of strings - search for images which match all given tags
+            tags_not: string or list of strings - search for images which excludes all given tags
+            image_name_contains: search for images which name contains given pattern
+            limit: limits number of search results (by default returns all results)
+            page_size: fixed number of results per page
+            max_pages_in_flight: maximum number of pages requested at the same time
+
+        Returns:
+            generator of JSON objects (images and annotations)
+        """
+        params = self._search_params(
+            annotation_sets, classes, classes_not, tags, tags_not, image_name_contains
+        )
+        if not isinstance(limit, int) or (isinstance(limit, int) and limit <= 0):
+            limit = None
+
+        endpoint = backend.v1_search_in_dataset.format(dataset_id)
+        size = page_size or self.min_search_page_size
+        if limit:
+            size = min(size, limit)
+
+        start = time.monotonic()
+        data = self._search_page(self.url(endpoint, limit=size, **params))
+        if not data:
+            return
+
+        elapsed = time.monotonic() - start
+        results = data.get('results', [])
+        yield from results
+
+        count = len(results)
+        next_url = data.get('next')
+        if not next_url or (limit and count >= limit):
+            return
+
+        max_page_size = self.max_search_page_size
+        if len(results) < size:
+            # server caps page size
+            max_page_size = size = len(results)
+
+        def adapt_page_size(size, elapsed, target=1.0):
+            size = int(min(max(size * target / max(elapsed, 1e-3), size / 2), size * 2))
+            return max(min(size, max_page_size), min(self.min_search_page_size, max_page_size))
+
+        if not page_size:
+            size = adapt_page_size(size, elapsed)
+
+        if 'offset' in parse_qs(urlparse(next_url).query):
+            def fetch_page(offset, limit):
+                data = self._search_page(self.url(endpoint, limit=limit, offset=offset, **params))
+                return data.get('results', []) if data else []
+
+            remaining = None
+            if limit:
+                remaining = limit - count
+            elif 'count' in data:
+                remaining = data['count'] - count
+
+            pages = iter_pages(
+                fetch_page,
+                size,
+                max_pages_in_flight,
+                limit=remaining,
+                offset=count,
+                adapt_page_size=None if page_size else adapt_page_size,
+            )
+            for page in pages:
+                yield from page
+            return
+
+        # unknown pagination: follow next links one by one
+        url = self.url(next_url)
+        while url:
+            data = self._search_page(url)
+            if not data:
+                return
+
+            results = data.get('results', [])
+            if limit:
+                results = results[: limit - count]
+            yield from results
+
+            count += len(results)
+            if limit and count >= limit:
+                return
+
+            next_url = data.get('next')
+            url = self.url(next_url) if next_url else None
+
+    def _search_page(self, url: str) -> dict:
+        response = self.get(url)
+        if response.status_code > 200:
+            return None
+
+        try:
+            return response.json()
+        except Exception as err:
+            print('Failed to decode in JSON server response:', response.content)
+            print('ERROR:', err)
+
+    @staticmethod
+    def _search_params(
+        annotation_sets=None, classes=None, classes_not=None, tags=None, tags_not=None, image_name_contains=None
+    ) -> dict:
+        """
+        Converts search arguments to query parameters of search endpoint
+        """
+
+        def stringify(val) -> str:
+            """
+            Converts list of string to coma separated string
+            :param val: can be int, string or list of these types
+            :return: string
+            """
+            if type(val) not in (int, str, list):
+                return ''
+
+            if isinstance(val, list):
+                if any(map(lambda v: type(v) not in (str, int), val)):
+                    return ''
+
+                return ','.join(map(str, val))
+
+            return str(val)
+
+        params = {}
+        if annotation_sets:
+            params['sets'] = stringify(annotation_sets)
+        if classes:
+            params['classes'] = stringify(classes)
+        if classes_not:
+            params['classes_not'] = stringify(classes_not)
+        if tags:
+            params['tags'] = stringify(tags)
+        if tags_not:
+            params['tags_not'] = stringify(tags_not)
+        if image_name_contains:
+            params['image_name'] = image_name_contains
+        return params
+
     def delete_dataset(self, dataset_id: int):
         """
         Deletes dataset
@@ -539,4 +958,10 @@ class API(BaseAPI):
             dataset_id: dataset id
         """
         url = self.url(backend.delete_dataset.format(dataset_id))
-        self.delete(url)
+        r = self.delete(url)
+        if r.status_code >= http.HTTPStatus.BAD_REQUEST:
+            return
+
+        # doesn't create the index, nor remo home, just to clean them up
+        if self._upload_index or os.path.exists(remo_home_path(UploadIndex.name, create=False)):
+            self.upload_index.remove_dataset(self.server, dataset_id)
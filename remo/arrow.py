@@ -0,0 +1,76 @@
+from typing import Iterator
+
+IMAGE_COLUMNS = ['id', 'name', 'dataset_id', 'path', 'url', 'size', 'width', 'height', 'upload_date']
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.csv
+        import pyarrow.parquet
+    except ImportError:
+        raise Exception('Arrow export requires pyarrow. You can install it with: pip install remo-python[arrow]')
+    return pyarrow
+
+
+def open_csv_batches(file, block_size: int = 1 << 20):
+    """
+    Opens reader of Arrow record batches from CSV file-like object.
+    CSV is parsed by Arrow in blocks of ``block_size`` bytes, while it's read
+
+    Returns:
+        :class:`pyarrow.csv.CSVStreamingReader`
+    """
+    pa = _import_pyarrow()
+    return pa.csv.open_csv(pa.PythonFile(file, mode='r'), read_options=pa.csv.ReadOptions(block_size=block_size))
+
+
+def write_parquet(batches, schema, output_file: str):
+    """
+    Writes record batches to Parquet file, one by one
+
+    Args:
+        batches: iterable of :class:`pyarrow.RecordBatch`
+        schema: schema of the batches
+        output_file: output file path
+    """
+    pa = _import_pyarrow()
+    with pa.parquet.ParquetWriter(output_file, schema) as writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_batches([batch], schema))
+
+
+def image_schema():
+    pa = _import_pyarrow()
+    return pa.schema(
+        [
+            ('id', pa.int64()),
+            ('name', pa.string()),
+            ('dataset_id', pa.int64()),
+            ('path', pa.string()),
+            ('url', pa.string()),
+            ('size', pa.int64()),
+            ('width', pa.int64()),
+            ('height', pa.int64()),
+            ('upload_date', pa.string()),
+        ]
+    )
+
+
+def image_batches(pages: Iterator[list], dataset_id: int) -> Iterator:
+    """
+    Converts pages of images, as returned by the server, to Arrow record batches
+
+    Args:
+        pages: iterable of lists of images
+        dataset_id: dataset id, used if images don't have it
+
+    Returns:
+        Iterator[:class:`pyarrow.RecordBatch`]
+    """
+    pa = _import_pyarrow()
+    schema = image_schema()
+    for page in pages:
+        columns = {name: [img.get(name) for img in page] for name in IMAGE_COLUMNS}
+        columns['dataset_id'] = [value if value is not None else dataset_id for value in columns['dataset_id']]
+        yield pa.RecordBatch.from_arrays([pa.array(columns[name], schema.field(name).type) for name in IMAGE_COLUMNS], schema=schema)
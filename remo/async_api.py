@@ -0,0 +1,488 @@
+import asyncio
+import http
+import json
+import os
+
+from .api import BaseAPI, API, UploadStatus
+from .endpoints import backend
+from .multipart import MultipartEncoder
+from .token_cache import TokenCache
+from .utils import FileResolver
+
+
+def _import_aiohttp():
+    try:
+        import aiohttp
+    except ImportError:
+        raise Exception("AsyncAPI requires 'aiohttp'. You can install it with: pip install remo-python[async]")
+    return aiohttp
+
+
+class Response:
+    """
+    Fully read server response, mimics the parts of :class:`requests.Response` used by the API
+    """
+
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class AsyncBaseAPI:
+    """
+    Asyncio counterpart of :class:`remo.api.BaseAPI`, built on ``aiohttp``.
+
+    Login happens on the first request, and all requests share one connection pool.
+    The number of requests in flight is bounded by ``max_concurrency``,
+    so thousands of calls can be scheduled at once on the same event loop.
+
+    Args:
+        server: server host name, e.g. ``http://localhost:8123/``
+        email: user credentials
+        password: user credentials
+        max_concurrency: maximum number of requests in flight
+        limit_per_host: maximum number of open connections per host, 0 means no limit
+        timeout: default timeout in seconds for each request. None means wait forever
+        token_cache: if True, reuses auth tokens stored in remo home by other processes, and stores new ones.
+            See also: :class:`remo.token_cache.TokenCache`
+
+    If the server rejects the token with 401 Unauthorized, it logs in again once and repeats the request.
+    When many requests get 401 at the same time, only one logs in and the others wait for the new token.
+    """
+
+    def __init__(
+        self,
+        server,
+        email,
+        password,
+        max_concurrency: int = 100,
+        limit_per_host: int = 0,
+        timeout=None,
+        token_cache: bool = False,
+    ):
+        self.server = server
+        self.token = None
+        self.token_cache = TokenCache() if token_cache else None
+        self._public_url = ''
+        self._email = email
+        self._password = password
+        self.max_concurrency = max_concurrency
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self._session = None
+        self._semaphore = None
+        self._login_lock = None
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_session(self):
+        if self._session is None:
+            aiohttp = _import_aiohttp()
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._login_lock = asyncio.Lock()
+        return self._session
+
+    async def close(self):
+        """
+        Closes all pooled connections
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def login(self):
+        """
+        Authenticates user, if not done yet
+        """
+        if not self._is_authenticated():
+            await self._refresh_token()
+
+    async def _refresh_token(self, rejected_token: str = None):
+        """
+        Gets a new token in place of ``rejected_token``. If another request or process already got one,
+        it's used, instead of logging in again
+        """
+        self._get_session()
+        async with self._login_lock:
+            if self.token is not None and self.token != rejected_token:
+                return
+
+            if self.token_cache is None:
+                await self._login()
+                return
+
+            # the file lock blocks until other processes log in, so it's taken outside of the event loop
+            loop = asyncio.get_running_loop()
+            lock = self.token_cache.lock(self.server, self._email)
+            await loop.run_in_executor(None, lock.__enter__)
+            try:
+                token = self.token_cache.get(self.server, self._email)
+                if token and token != rejected_token:
+                    self.token = token
+                    return
+
+                await self._login()
+                self.token_cache.set(self.server, self._email, self.token)
+            finally:
+                await loop.run_in_executor(None, lock.__exit__, None, None, None)
+
+    async def _login(self):
+        aiohttp = _import_aiohttp()
+        try:
+            resp = await self._request(
+                'post', self.url(backend.login), data={"password": self._password, "email": self._email}
+            )
+        except aiohttp.ClientConnectionError:
+            raise Exception('Failed connect to server: {}'.format(self.server))
+
+        if resp.status_code != http.HTTPStatus.OK:
+            raise Exception(resp.json())
+
+        self.token = resp.json().get('key')
+
+    def _is_authenticated(self):
+        return self.token is not None
+
+    def _auth_header(self):
+        if not self._is_authenticated():
+            raise Exception('Not authenticated')
+        return {'Authorization': 'Token {}'.format(self.token)}
+
+    def set_public_url(self, public_url: str):
+        self._public_url = public_url
+
+    def public_url(self, endpoint, *args, **kwargs):
+        url = self._public_url if self._public_url else self.server
+        return BaseAPI._build_url(url, endpoint, *args, **kwargs)
+
+    def url(self, endpoint, *args, **kwargs):
+        return BaseAPI._build_url(self.server, endpoint, *args, **kwargs)
+
+    async def _request(self, method, url, **kwargs) -> Response:
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.request(method, url, **kwargs) as resp:
+                return Response(resp.status, await resp.read())
+
+    async def _auth_request(self, method, url, headers=None, **kwargs) -> Response:
+        await self.login()
+        token = self.token
+        resp = await self._request(method, url, headers=dict(headers or {}, **self._auth_header()), **kwargs)
+        if resp.status_code != http.HTTPStatus.UNAUTHORIZED:
+            return resp
+
+        # token expired or was revoked: logs in again, once, and repeats the request, if its body can be sent again.
+        # Streamed bodies, e.g. async generators, are repeated by the caller
+        data = kwargs.get('data')
+        if data is not None and not isinstance(data, (dict, list, str, bytes)):
+            return resp
+
+        await self._refresh_token(rejected_token=token)
+        return await self._request(method, url, headers=dict(headers or {}, **self._auth_header()), **kwargs)
+
+    async def post(self, *args, **kwargs) -> Response:
+        return await self._auth_request('post', *args, **kwargs)
+
+    async def get(self, *args, **kwargs) -> Response:
+        return await self._auth_request('get', *args, **kwargs)
+
+    async def delete(self, *args, **kwargs) -> Response:
+        return await self._auth_request('delete', *args, **kwargs)
+
+
+class AsyncAPI(AsyncBaseAPI):
+    """
+    Asyncio version of :class:`remo.api.API`. All methods are coroutines with the same arguments and results.
+    """
+
+    async def create_dataset(self, name):
+        return (await self.post(self.url(backend.dataset), json={"name": name})).json()
+
+    async def create_annotation_set(self, annotation_task, dataset_id, name, classes=[]):
+        payload = {
+            "annotation_task": annotation_task,
+            "classes": classes,
+            "dataset_id": dataset_id,
+            "name": name,
+        }
+        return (await self.post(self.url(backend.v1_create_annotation_set), json=payload)).json()
+
+    async def add_annotation(
+        self, dataset_id, annotation_set_id, image_id, existing_annotations=None, classes=None, objects=None
+    ):
+        url = self.url(backend.add_annotation).format(dataset_id, annotation_set_id, image_id)
+        existing_annotations = existing_annotations if existing_annotations else []
+
+        payload = {}
+        if objects:
+            payload = {"objects": existing_annotations + objects}
+        elif classes:
+            payload = {"classes": existing_annotations + classes}
+
+        if payload:
+            payload['status'] = 'done'
+            return (await self.post(url, json=payload)).json()
+
+    async def upload_files(
+        self,
+        dataset_id,
+        files_to_upload=[],
+        annotation_task=None,
+        folder_id=None,
+        status=None,
+        annotation_set_id=None,
+        class_encoding=None,
+        session_id: str = None
+    ):
+        fields = []
+        if annotation_task:
+            fields.append(('annotation_task', annotation_task))
+        if session_id:
+            fields.append(('session_id', session_id))
+        if isinstance(class_encoding, dict):
+            for key, val in class_encoding.items():
+                fields.append(('class_encoding_{}'.format(key), val))
+
+        encoder = MultipartEncoder(fields, [('files', path) for path in files_to_upload])
+
+        loop = asyncio.get_running_loop()
+
+        async def body():
+            # files are read in the default executor, so disk reads don't block the event loop
+            while True:
+                chunk = await loop.run_in_executor(None, encoder.read, encoder.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+        url = self.url(
+            backend.dataset_upload.format(dataset_id),
+            folder_id=folder_id,
+            annotation_set_id=annotation_set_id,
+        )
+        headers = {'Content-Type': encoder.content_type, 'Content-Length': str(len(encoder))}
+        try:
+            await self.login()
+            token = self.token
+            r = await self.post(url, data=body(), headers=headers)
+            if r.status_code == http.HTTPStatus.UNAUTHORIZED:
+                encoder.rewind()
+                await self._refresh_token(rejected_token=token)
+                r = await self.post(url, data=body(), headers=headers)
+        finally:
+            encoder.close()
+
+        json_resp = r.json()
+        if (r.status_code >= http.HTTPStatus.BAD_REQUEST) and ('errors' in json_resp):
+            raise Exception('Error description:' + '\n'.join(json_resp['errors']))
+
+        if r.status_code != http.HTTPStatus.OK:
+            print('Error - Response:', r.text, 'files:', files_to_upload)
+
+        if status:
+            status.update(len(files_to_upload))
+            status.progress()
+        return json_resp
+
+    async def bulk_upload_files(
+        self,
+        dataset_id,
+        files_to_upload,
+        annotation_task=None,
+        folder_id=None,
+        annotation_set_id=None,
+        class_encoding=None,
+        session_id: str = None
+    ):
+        files = FileResolver(files_to_upload, annotation_task or annotation_set_id).resolve()
+        groups = API.split_files_by_size(files)
+        status = UploadStatus(len(files))
+        return await asyncio.gather(
+            *[
+                self.upload_files(
+                    dataset_id, bulk, annotation_task, folder_id, status, annotation_set_id, class_encoding, session_id
+                )
+                for bulk in groups
+            ]
+        )
+
+    async def upload_local_files(
+        self,
+        dataset_id,
+        local_files,
+        annotation_task=None,
+        folder_id=None,
+        annotation_set_id=None,
+        class_encoding=None,
+        session_id: str = None
+    ):
+        payload = {"local_files": [os.path.abspath(path) for path in local_files if os.path.exists(path)]}
+        if annotation_task:
+            payload['annotation_task'] = annotation_task
+        if folder_id:
+            payload['folder_id'] = folder_id
+        if isinstance(class_encoding, dict):
+            payload['class_encoding'] = class_encoding
+        if session_id:
+            payload['session_id'] = session_id
+
+        url = self.url(backend.dataset_upload.format(dataset_id), annotation_set_id=annotation_set_id)
+        return (await self.post(url, json=payload)).json()
+
+    async def upload_urls(
+        self,
+        dataset_id,
+        urls,
+        annotation_task=None,
+        folder_id=None,
+        annotation_set_id=None,
+        class_encoding=None,
+        session_id: str = None
+    ):
+        payload = {"urls": urls}
+        if annotation_task:
+            payload['annotation_task'] = annotation_task
+        if folder_id:
+            payload['folder_id'] = folder_id
+        if isinstance(class_encoding, dict):
+            payload['class_encoding'] = class_encoding
+        if session_id:
+            payload['session_id'] = session_id
+
+        url = self.url(backend.dataset_upload.format(dataset_id), annotation_set_id=annotation_set_id)
+        return (await self.post(url, json=payload)).json()
+
+    async def create_new_upload_session(self, dataset_id: int) -> str:
+        payload = {'dataset_id': dataset_id}
+        data = (await self.post(self.url(backend.v1_uploads), json=payload)).json()
+        return data.get('session_id')
+
+    async def complete_upload_session(self, session_id: str):
+        await self.post(self.url(backend.v1_uploads_complete.format(session_id)))
+
+    async def get_upload_session_status(self, session_id: str):
+        url = self.url(backend.v1_uploads_status.format(session_id))
+        try:
+            return (await self.get(url)).json()
+        except:
+            return {}
+
+    async def list_datasets(self):
+        return (await self.get(self.url(backend.v1_datasets))).json()
+
+    async def list_dataset_images(self, dataset_id, limit=None, offset=None):
+        url = self.url(backend.v1_sdk_dataset_images.format(dataset_id), limit=limit, offset=offset)
+        return (await self.get(url)).json()
+
+    async def get_dataset(self, id):
+        url = self.url(backend.v1_datasets, id, tail_slash=True)
+        return (await self.get(url)).json()
+
+    async def list_annotation_sets(self, dataset_id):
+        url = self.url(backend.v1_dataset_annotation_sets.format(dataset_id))
+        return (await self.get(url)).json()
+
+    async def get_annotation_set(self, id):
+        url = self.url(backend.v1_annotation_set.format(id))
+        return (await self.get(url)).json()
+
+    async def export_annotations(
+        self,
+        annotation_set_id: int,
+        annotation_format='json',
+        export_coordinates='pixel',
+        full_path=True,
+        export_tags: bool = True,
+        filter_by_tags: list = None
+    ) -> bytes:
+        url = self.url(
+            backend.v1_export_annotations.format(annotation_set_id),
+            annotation_format=annotation_format,
+            export_coordinates=export_coordinates,
+            full_path=str(full_path).lower(),
+            export_tags=str(export_tags).lower(),
+            filter_by_tags=filter_by_tags
+        )
+        return (await self.get(url)).content
+
+    async def get_annotation_info(self, dataset_id, annotation_set_id, image_id):
+        url = self.url(backend.annotation_info.format(dataset_id, annotation_set_id, image_id))
+        return (await self.get(url)).json()
+
+    async def list_annotation_set_classes(self, annotation_set_id: int):
+        url = self.url(backend.annotation_set.format(annotation_set_id))
+        json_data = (await self.get(url)).json()
+        return json_data.get('classes', [])
+
+    async def get_image_content(self, url) -> bytes:
+        return (await self.get(self.url(url))).content
+
+    async def get_image(self, image_id):
+        url = self.url(backend.v1_sdk_images, image_id, tail_slash=True)
+        return (await self.get(url)).json()
+
+    async def search_images(
+            self,
+            dataset_id: int,
+            annotation_sets: int = None,
+            classes: str = None, classes_not: str = None,
+            tags: str = None, tags_not: str = None,
+            image_name_contains: str = None,
+            limit=None
+    ) -> list:
+        params = API._search_params(annotation_sets, classes, classes_not, tags, tags_not, image_name_contains)
+
+        page_limit = 25
+        load_all_results = True
+        if not isinstance(limit, int) or (isinstance(limit, int) and limit <= 0):
+            limit = None
+
+        if limit:
+            page_limit = limit
+            load_all_results = False
+
+        params['limit'] = page_limit
+
+        results = []
+        url = self.url(backend.v1_search_in_dataset.format(dataset_id), **params)
+
+        while url:
+            response = await self.get(url)
+            if response.status_code > 200:
+                break
+
+            try:
+                data = response.json()
+            except Exception as err:
+                print('Failed to decode in JSON server response:', response.content)
+                print('ERROR:', err)
+                break
+
+            results.extend(data.get('results', []))
+            if not load_all_results:
+                break
+
+            next_url = data.get('next')
+            if not next_url:
+                break
+            url = self.url(next_url)
+        return results
+
+    async def delete_dataset(self, dataset_id: int):
+        await self.delete(self.url(backend.delete_dataset.format(dataset_id)))
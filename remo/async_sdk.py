@@ -0,0 +1,498 @@
+import asyncio
+import json
+import os
+from typing import List
+
+from .domain import Image, Dataset, AnnotationSet, class_encodings, Annotation, AnnotatedImage
+from .async_api import AsyncAPI
+from .sdk import SDK
+
+
+class _AsyncBoundSDK:
+    """
+    Stands for the SDK in objects returned by :class:`AsyncSDK`, so that their methods
+    don't make blocking requests on the event loop, nor connect the global SDK
+    """
+
+    def __init__(self, async_sdk):
+        self.async_sdk = async_sdk
+
+    def __getattr__(self, name):
+        if callable(getattr(AsyncSDK, name, None)):
+            hint = 'Use AsyncSDK.{} instead, e.g. await sdk.{}(...)'.format(name, name)
+        else:
+            hint = 'Use AsyncSDK methods instead'
+        raise Exception("Methods of objects returned by AsyncSDK don't make requests. " + hint)
+
+
+class AsyncSDK:
+    """
+    Asyncio version of :class:`remo.sdk.SDK`.
+
+    Methods have the same arguments and return the same objects as their :class:`remo.sdk.SDK` counterparts,
+    but are coroutines, so many calls can run concurrently on a single event loop.
+    Returned objects, like :class:`remo.Dataset`, are bound to the async client: their fields can be used,
+    but their methods which make requests, e.g. ``dataset.images()``, raise an exception
+    pointing to the AsyncSDK coroutine to await instead.
+
+    Args:
+        server: server host name, e.g. ``http://localhost:8123/``
+        email: user credentials
+        password: user credentials
+        api_options: connection settings, e.g. ``max_concurrency``, ``limit_per_host``, ``timeout``.
+            See also: :class:`remo.async_api.AsyncBaseAPI`
+
+    Example::
+
+        import asyncio
+        import remo
+
+        async def main():
+            async with remo.AsyncSDK('http://localhost:8123', 'admin@remo.ai', 'adminpass') as sdk:
+                images = await sdk.list_dataset_images(1)
+                annotations = await asyncio.gather(*[sdk.list_image_annotations(1, 1, img.id) for img in images])
+
+        asyncio.run(main())
+    """
+
+    def __init__(self, server: str, email: str, password: str, **api_options):
+        self.api = AsyncAPI(server, email, password, **api_options)
+        self._bound_sdk = _AsyncBoundSDK(self)
+
+    def _bind(self, value):
+        """
+        Binds returned domain object, or list of them, to the async client
+        """
+        for obj in value if isinstance(value, list) else [value]:
+            if isinstance(obj, (Dataset, AnnotationSet, Image)):
+                obj._sdk = self._bound_sdk
+        return value
+
+    async def __aenter__(self):
+        await self.api.login()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes all connections to the server
+        """
+        await self.api.close()
+
+    def set_public_url(self, public_url: str):
+        self.api.set_public_url(public_url)
+
+    async def create_dataset(
+        self,
+        name: str,
+        local_files: List[str] = None,
+        paths_to_upload: List[str] = None,
+        urls: List[str] = None,
+        annotation_task: str = None,
+        class_encoding=None,
+        wait_for_complete=True
+    ) -> Dataset:
+        """
+        Creates a new dataset in Remo and optionally populate it with images and annotations.
+        See also: :meth:`remo.sdk.SDK.create_dataset`
+
+        Returns:
+            :class:`remo.Dataset`
+        """
+        json_data = await self.api.create_dataset(name)
+        ds = self._bind(Dataset(**json_data))
+        await self.add_data_to_dataset(
+            ds.id, local_files, paths_to_upload, urls, annotation_task=annotation_task,
+            class_encoding=class_encoding, wait_for_complete=wait_for_complete
+        )
+        return await self.get_dataset(ds.id)
+
+    async def add_data_to_dataset(
+        self,
+        dataset_id: int,
+        local_files: List[str] = None,
+        paths_to_upload: List[str] = None,
+        urls: List[str] = None,
+        annotation_task: str = None,
+        folder_id: int = None,
+        annotation_set_id: int = None,
+        class_encoding=None,
+        wait_for_complete=True
+    ) -> dict:
+        """
+        Adds images and/or annotations to an existing dataset.
+        See also: :meth:`remo.sdk.SDK.add_data_to_dataset`
+
+        Returns:
+            upload session status
+        """
+        kwargs = {
+            'annotation_task': annotation_task,
+            'folder_id': folder_id,
+            'annotation_set_id': annotation_set_id,
+        }
+
+        if annotation_task and (not annotation_set_id):
+            annotation_sets = await self.list_annotation_sets(dataset_id)
+
+            if len(annotation_sets) > 1:
+                raise Exception(
+                    'Define which annotation set you want to use. Dataset {} has {} annotation sets. '
+                    'You can see them with my_dataset.annotation_sets()'.format(dataset_id, len(annotation_sets))
+                )
+
+            elif len(annotation_sets) == 1:
+                kwargs['annotation_set_id'] = annotation_sets[0].id
+
+        if local_files:
+            SDK._raise_value_error(local_files, 'local_files', list, 'list of paths')
+        if paths_to_upload:
+            SDK._raise_value_error(paths_to_upload, 'paths_to_upload', list, 'list of paths')
+        if urls:
+            SDK._raise_value_error(urls, 'urls', list, 'list of URLs')
+
+        session_id = await self.api.create_new_upload_session(dataset_id)
+        kwargs['session_id'] = session_id
+
+        uploads = []
+        if local_files:
+            encoding = class_encodings.for_linking(class_encoding)
+            uploads.append(self.api.upload_local_files(dataset_id, local_files, class_encoding=encoding, **kwargs))
+
+        if paths_to_upload:
+            encoding = class_encodings.for_upload(class_encoding)
+            uploads.append(self.api.bulk_upload_files(dataset_id, paths_to_upload, class_encoding=encoding, **kwargs))
+
+        if urls:
+            encoding = class_encodings.for_linking(class_encoding)
+            uploads.append(self.api.upload_urls(dataset_id, urls, class_encoding=encoding, **kwargs))
+
+        await asyncio.gather(*uploads)
+        await self.api.complete_upload_session(session_id)
+
+        if not wait_for_complete:
+            return {'session_id': session_id}
+
+        return await self._wait_for_upload_session(session_id)
+
+    async def _wait_for_upload_session(self, session_id: str, poll_interval: float = 1) -> dict:
+        while True:
+            session = await self.api.get_upload_session_status(session_id)
+            if not session:
+                raise Exception('Something went wrong, got empty session from server')
+
+            if session.get('status') in ('done', 'failed'):
+                SDK._print_session_result(session)
+                return session
+            await asyncio.sleep(poll_interval)
+
+    async def list_datasets(self) -> List[Dataset]:
+        """
+        Lists the available datasets
+
+        Returns:
+            List[:class:`remo.Dataset`]
+        """
+        json_data = await self.api.list_datasets()
+        return self._bind([Dataset(**ds_item) for ds_item in json_data.get('results', [])])
+
+    async def get_dataset(self, dataset_id: int) -> Dataset:
+        """
+        Retrieves a dataset with given dataset id.
+
+        Args:
+            dataset_id: dataset id
+
+        Returns:
+            :class:`remo.Dataset`
+        """
+        json_data = await self.api.get_dataset(dataset_id)
+        return self._bind(SDK._parse_dataset(json_data, dataset_id))
+
+    async def delete_dataset(self, dataset_id: int):
+        """
+        Deletes dataset
+
+        Args:
+            dataset_id: dataset id
+        """
+        await self.api.delete_dataset(dataset_id)
+
+    async def list_annotation_sets(self, dataset_id: int) -> List[AnnotationSet]:
+        """
+        Returns a list of AnnotationSet containing all the AnnotationSets of a given dataset
+
+        Args:
+            dataset_id: dataset id
+
+        Returns:
+            List[:class:`remo.AnnotationSet`]
+        """
+        result = await self.api.list_annotation_sets(dataset_id)
+        return self._bind(SDK._parse_annotation_sets(result, dataset_id))
+
+    async def get_annotation_set(self, annotation_set_id: int) -> AnnotationSet:
+        """
+        Retrieves annotation set
+
+        Args:
+            annotation_set_id: annotation set id
+
+        Returns:
+             :class:`remo.AnnotationSet`
+        """
+        annotation_set = await self.api.get_annotation_set(annotation_set_id)
+        return self._bind(SDK._parse_annotation_set(annotation_set, annotation_set_id))
+
+    async def create_annotation_set(
+        self, annotation_task: str, dataset_id: int, name: str, classes: List[str] = []
+    ) -> AnnotationSet:
+        """
+        Creates a new annotation set within the given dataset
+
+        Args:
+            annotation_task: specified task for the annotation set. See also: :class:`remo.task`
+            dataset_id: dataset id
+            name: name of the annotation set
+            classes: list of classes. Default is no classes
+
+        Returns:
+            :class:`remo.AnnotationSet`
+        """
+        annotation_set = await self.api.create_annotation_set(annotation_task, dataset_id, name, classes)
+        return self._bind(SDK._parse_created_annotation_set(annotation_set))
+
+    async def export_annotations(
+        self,
+        annotation_set_id: int,
+        annotation_format: str = 'json',
+        export_coordinates: str = 'pixel',
+        append_path: bool = True,
+        export_tags: bool = True,
+        filter_by_tags: list = None
+    ) -> bytes:
+        """
+        Exports annotations in a Binary format for a given annotation set.
+        See also: :meth:`remo.sdk.SDK.export_annotations_to_file`
+
+        Returns:
+            annotation file content
+        """
+        return await self.api.export_annotations(
+            annotation_set_id,
+            annotation_format=annotation_format,
+            export_coordinates=export_coordinates,
+            full_path=append_path,
+            export_tags=export_tags,
+            filter_by_tags=filter_by_tags
+        )
+
+    async def export_annotations_to_file(
+        self,
+        output_file: str,
+        annotation_set_id: int,
+        annotation_format: str = 'json',
+        export_coordinates: str = 'pixel',
+        append_path: bool = True,
+        export_tags: bool = True,
+        filter_by_tags: list = None
+    ):
+        """
+        Exports annotations in a given format and saves it to a file.
+        See also: :meth:`remo.sdk.SDK.export_annotations_to_file`
+        """
+        _, file_extension = os.path.splitext(output_file)
+        if export_tags and file_extension != '.zip':
+            raise Exception("If export_tags = True, output_file needs to be a ZIP file. \nChange {} to be .zip or set export_tags = False".format(output_file))
+
+        content = await self.export_annotations(
+            annotation_set_id,
+            annotation_format=annotation_format,
+            export_coordinates=export_coordinates,
+            append_path=append_path,
+            export_tags=export_tags,
+            filter_by_tags=filter_by_tags
+        )
+        SDK._save_to_file(content, output_file)
+
+    async def get_annotation_info(self, dataset_id: int, annotation_set_id: int, image_id: int) -> list:
+        """
+        Returns current annotations for the image
+
+        Args:
+            dataset_id: dataset id
+            annotation_set_id: annotation set id
+            image_id: image id
+
+        Returns:
+            annotations info - list of annotation objects or classes
+        """
+        resp = await self.api.get_annotation_info(dataset_id, annotation_set_id, image_id)
+        return resp.get('annotation_info', [])
+
+    async def list_image_annotations(
+        self, dataset_id: int, annotation_set_id: int, image_id: int
+    ) -> List[Annotation]:
+        """
+        Returns annotations for a given image
+
+        Args:
+            dataset_id: dataset id
+            annotation_set_id: annotation set id
+            image_id: image id
+
+        Returns:
+             List[:class:`remo.Annotation`]
+        """
+        annotation_items, img = await asyncio.gather(
+            self.get_annotation_info(dataset_id, annotation_set_id, image_id), self.get_image(image_id)
+        )
+        if not img:
+            return None
+
+        return SDK._parse_annotation_info(annotation_items, img.name)
+
+    async def list_annotations(self, dataset_id: int, annotation_set_id: int) -> List[Annotation]:
+        """
+        Returns all annotations for a given annotation set.
+        The whole annotation set is fetched in one request, by exporting it in JSON format.
+        If the export can't be used, annotations of all images are requested concurrently.
+
+        Args:
+            dataset_id: dataset id
+            annotation_set_id: annotation set id
+
+        Returns:
+             List[:class:`remo.Annotation`]
+        """
+        try:
+            content = await self.api.export_annotations(
+                annotation_set_id, annotation_format='json', full_path=False, export_tags=False
+            )
+            return SDK._parse_exported_annotations(json.loads(content))
+        except ValueError:
+            pass
+
+        images = await self.list_dataset_images(dataset_id)
+
+        async def image_annotations(img):
+            annotation_items = await self.get_annotation_info(dataset_id, annotation_set_id, img.id)
+            return SDK._parse_annotation_info(annotation_items, img.name)
+
+        annotations = []
+        for image_annotations in await asyncio.gather(*[image_annotations(img) for img in images]):
+            annotations += image_annotations
+        return annotations
+
+    async def add_annotations_to_image(self, annotation_set_id: int, image_id: int, annotations: List[Annotation]):
+        """
+        Adds annotation to a given image
+
+        Args:
+            annotation_set_id: annotation set id
+            image_id: image id
+            annotations: Annotation object
+        """
+        annotation_set = await self.get_annotation_set(annotation_set_id)
+        dataset_id = annotation_set.dataset_id
+
+        annotation_info = await self.get_annotation_info(dataset_id, annotation_set_id, image_id)
+        classes, objects = SDK._prepare_annotations_payload(annotations, len(annotation_info))
+
+        return await self.api.add_annotation(
+            dataset_id, annotation_set_id, image_id, annotation_info, classes=classes, objects=objects
+        )
+
+    async def list_annotation_set_classes(self, annotation_set_id: int) -> List[str]:
+        """
+        List classes within the annotation set
+
+        Args:
+            annotation_set_id: annotation set id
+
+        Returns:
+            list of classes
+        """
+        classes_with_ids = await self.api.list_annotation_set_classes(annotation_set_id)
+        return [item.get('name') for item in classes_with_ids]
+
+    async def list_dataset_images(self, dataset_id: int, limit: int = None, offset: int = None) -> List[Image]:
+        """
+        Returns a list of images within a dataset with given dataset_id
+
+        Args:
+            dataset_id: dataset id
+            limit: limits result images
+            offset: specifies offset
+
+        Returns:
+             List[:class:`remo.Image`]
+        """
+        json_data = await self.api.list_dataset_images(dataset_id, limit=limit, offset=offset)
+        return self._bind(SDK._parse_dataset_images(json_data, dataset_id))
+
+    async def get_image_content(self, url: str) -> bytes:
+        """
+        Get image file content by url
+
+        Args:
+            url: image url
+
+        Returns:
+            image binary data
+        """
+        return await self.api.get_image_content(url)
+
+    async def get_image(self, image_id: int) -> Image:
+        """
+        Retrieves image by a given image id
+
+        Args:
+            image_id: image id
+
+        Returns:
+            :class:`remo.Image`
+        """
+        json_data = await self.api.get_image(image_id)
+        return self._bind(SDK._parse_image(json_data, image_id))
+
+    async def search_images(
+            self,
+            dataset_id: int,
+            annotation_sets_id: int = None,
+            classes: str = None, classes_not: str = None,
+            tags: str = None, tags_not: str = None,
+            image_name_contains: str = None,
+            limit: int = None,
+    ) -> List[AnnotatedImage]:
+        """
+        Search images by classes and tags.
+        See also: :meth:`remo.sdk.SDK.search_images`
+
+        Returns:
+            List[:class:`remo.AnnotatedImage`]
+        """
+        if not isinstance(dataset_id, int):
+            raise Exception("Enter a valid dataset_id to search into")
+
+        if any((classes, classes_not, tags, tags_not)) and not annotation_sets_id:
+            annotation_sets = await self.list_annotation_sets(dataset_id)
+            if len(annotation_sets) > 1:
+                raise Exception(
+                    'Define which annotation set you want to use. Dataset {} has {} annotation sets. '
+                    'You can see them with my_dataset.annotation_sets()'.format(dataset_id, len(annotation_sets))
+                )
+
+            elif len(annotation_sets) == 1:
+                annotation_sets_id = annotation_sets[0].id
+
+        json_data = await self.api.search_images(
+            dataset_id,
+            annotation_sets=annotation_sets_id,
+            classes=classes, classes_not=classes_not,
+            tags=tags, tags_not=tags_not,
+            image_name_contains=image_name_contains,
+            limit=limit)
+        return self._bind(SDK._parse_search_results(json_data, dataset_id))
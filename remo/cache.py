@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class MetadataCache:
+    """
+    Read-through cache for metadata that rarely changes, like datasets and annotation sets.
+
+    Entries expire ``ttl`` seconds after being loaded. When the cache holds more than ``maxsize`` entries,
+    least recently used entries are evicted.
+
+    Keys are tuples, starting with the kind of entry, e.g. ``('dataset', 1)``,
+    so related entries can be invalidated together with :func:`invalidate`.
+
+    Args:
+        ttl: time to live of entries, in seconds
+        maxsize: maximum number of entries
+
+    Example::
+
+        cache = MetadataCache(ttl=60)
+        dataset = cache.get(('dataset', 1), lambda: api.get_dataset(1))
+        cache.invalidate('dataset', 1)
+    """
+
+    def __init__(self, ttl: float = 60, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, load):
+        """
+        Returns cached value for the key, or loads it with ``load()`` if missing or expired
+
+        Args:
+            key: cache key
+            load: function without arguments, which returns the value
+
+        Returns:
+            cached or loaded value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = load()
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, *prefix):
+        """
+        Removes entries whose key starts with the given values.
+        E.g. ``invalidate('annotation_set')`` removes all annotation sets, ``invalidate('dataset', 1)`` only dataset 1
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[: len(prefix)] == prefix]:
+                del self._entries[key]
+
+    def clear(self):
+        """
+        Removes all entries and resets counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        """
+        Returns cache statistics
+
+        Returns:
+            dictionary with hits, misses, current size and max size
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
@@ -13,6 +13,19 @@ def get_remo_home():
             return path
 
 
+def remo_home_path(*paths, create: bool = True) -> str:
+    """
+    Returns path inside remo home, creating remo home subdirectories if needed.
+    Falls back to default remo home, if remo home is not set up.
+    With ``create=False`` only builds the path, without creating anything.
+    """
+    remo_home = get_remo_home() or os.getenv(REMO_HOME_ENV, default_remo_home)
+    path = os.path.join(remo_home, *paths)
+    if create:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
 def set_remo_home(path: str):
     os.makedirs(path, exist_ok=True)
     os.environ[REMO_HOME_ENV] = path
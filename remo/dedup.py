@@ -0,0 +1,137 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from .config import remo_home_path
+from .utils import is_image_file
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Computes SHA-256 digest of file content
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadIndex:
+    """
+    Local index of image content already uploaded to datasets, used to skip re-uploading the same images.
+
+    It keeps two tables in ``REMO_HOME/upload_index.sqlite3``:
+
+    - content hashes of local files, cached by path, size and modification time, so unchanged files are not hashed again
+    - hashes of content uploaded to each dataset of each server
+
+    Args:
+        path: location of the index database. By default is stored in remo home
+    """
+
+    name = 'upload_index.sqlite3'
+
+    def __init__(self, path: str = None):
+        self.path = path or remo_home_path(self.name)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS file_hashes '
+                '(path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, digest TEXT)'
+            )
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS uploaded '
+                '(server TEXT, dataset_id INTEGER, digest TEXT, PRIMARY KEY (server, dataset_id, digest))'
+            )
+
+    def close(self):
+        self._db.close()
+
+    def hash_files(self, paths: List[str], max_workers: int = 8) -> dict:
+        """
+        Computes content hashes of files, in parallel. Hashes of unchanged files are taken from cache.
+
+        Returns:
+            dictionary of path and hash
+        """
+        stats = {path: os.stat(path) for path in paths}
+        digests = {}
+        with self._lock:
+            for path, stat in stats.items():
+                row = self._db.execute(
+                    'SELECT digest FROM file_hashes WHERE path = ? AND size = ? AND mtime = ?',
+                    (path, stat.st_size, stat.st_mtime_ns),
+                ).fetchone()
+                if row:
+                    digests[path] = row[0]
+
+        to_hash = [path for path in paths if path not in digests]
+        if not to_hash:
+            return digests
+
+        with ThreadPoolExecutor(max_workers) as ex:
+            new_digests = dict(zip(to_hash, ex.map(hash_file, to_hash)))
+
+        with self._lock, self._db:
+            self._db.executemany(
+                'INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?)',
+                [
+                    (path, stats[path].st_size, stats[path].st_mtime_ns, digest)
+                    for path, digest in new_digests.items()
+                ],
+            )
+        digests.update(new_digests)
+        return digests
+
+    def filter_new(self, server: str, dataset_id: int, paths: List[str], max_workers: int = 8) -> (List[str], int):
+        """
+        Removes images whose content was already uploaded to the dataset.
+        Other files, like annotations and archives, are always kept.
+
+        Returns:
+            tuple of files to upload and number of bytes skipped
+        """
+        images = [path for path in paths if is_image_file(path)]
+        digests = self.hash_files(images, max_workers)
+
+        with self._lock:
+            uploaded = {
+                digest
+                for digest in set(digests.values())
+                if self._db.execute(
+                    'SELECT 1 FROM uploaded WHERE server = ? AND dataset_id = ? AND digest = ?',
+                    (server, dataset_id, digest),
+                ).fetchone()
+            }
+
+        new_files, skipped_bytes = [], 0
+        for path in paths:
+            if digests.get(path) in uploaded:
+                skipped_bytes += os.path.getsize(path)
+            else:
+                new_files.append(path)
+        return new_files, skipped_bytes
+
+    def add_uploaded(self, server: str, dataset_id: int, paths: List[str]):
+        """
+        Records images as uploaded to the dataset
+        """
+        images = [path for path in paths if is_image_file(path)]
+        digests = self.hash_files(images)
+        with self._lock, self._db:
+            self._db.executemany(
+                'INSERT OR IGNORE INTO uploaded VALUES (?, ?, ?)',
+                [(server, dataset_id, digest) for digest in set(digests.values())],
+            )
+
+    def remove_dataset(self, server: str, dataset_id: int):
+        """
+        Forgets content uploaded to the dataset, e.g. when the dataset is deleted
+        """
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM uploaded WHERE server = ? AND dataset_id = ?', (server, dataset_id))
@@ -2,3 +2,4 @@ from .annotation_set import AnnotationSet
 from .dataset import Dataset
 from .image import Image, AnnotatedImage
 from .annotation import Annotation, Bbox, Segment
+from .annotation_table import AnnotationTable
@@ -13,16 +13,46 @@ class Bbox:
         ymax: Y max
     """
 
+    __slots__ = ('coordinates',)
+
     task = object_detection
     type = 'Bounding Box'
 
     def __init__(self, xmin: int, ymin: int, xmax: int, ymax: int):
-        self.xmin = xmin
-        self.ymin = ymin
-        self.xmax = xmax
-        self.ymax = ymax
         self.coordinates = [xmin, ymin, xmax, ymax]
 
+    @property
+    def xmin(self):
+        return self.coordinates[0]
+
+    @xmin.setter
+    def xmin(self, value):
+        self.coordinates[0] = value
+
+    @property
+    def ymin(self):
+        return self.coordinates[1]
+
+    @ymin.setter
+    def ymin(self, value):
+        self.coordinates[1] = value
+
+    @property
+    def xmax(self):
+        return self.coordinates[2]
+
+    @xmax.setter
+    def xmax(self, value):
+        self.coordinates[2] = value
+
+    @property
+    def ymax(self):
+        return self.coordinates[3]
+
+    @ymax.setter
+    def ymax(self, value):
+        self.coordinates[3] = value
+
 
 class Segment:
     """
@@ -32,13 +62,26 @@ class Segment:
         points: list of segment coordinates ``[x0, y0, x1, y1, ..., xN, yN]``
     """
 
+    __slots__ = ('coordinates',)
+
     task = instance_segmentation
     type = 'Polygon'
 
     def __init__(self, points: List[int]):
-        self.points = [{'x': x, 'y': y} for x, y in zip(points[::2], points[1::2])]
         self.coordinates = points
 
+    @property
+    def points(self) -> List[dict]:
+        """
+        Segment points as a list of ``{'x': x, 'y': y}`` dictionaries, built from coordinates on access.
+        Changing the returned list doesn't change the segment: assign new points instead
+        """
+        return [{'x': x, 'y': y} for x, y in zip(self.coordinates[::2], self.coordinates[1::2])]
+
+    @points.setter
+    def points(self, points: List[dict]):
+        self.coordinates = [value for point in points for value in (point['x'], point['y'])]
+
 
 class Annotation:
     """
@@ -63,6 +106,8 @@ class Annotation:
             annotation.segment = [1, 23, 3, 2, 1, 2, 1, 2]
     """
 
+    __slots__ = ('img_filename', '__classes', 'object')
+
     def __init__(self, img_filename: str = None, classes=None, object=None):
         if object and (
             not isinstance(object, Bbox) and not isinstance(object, Segment)
@@ -1,4 +1,4 @@
-from typing import List, TypeVar
+from typing import Iterable, Iterator, List, TypeVar
 
 from .annotation import Annotation
 from remo.annotation_utils import create_tempfile
@@ -37,9 +37,6 @@ class AnnotationSet:
         total_annotation_objects: int = None,
         **kwargs
     ):
-        from remo import _sdk
-        self.sdk = _sdk
-        
         self.id = id
         self.name = name
         self.task = task
@@ -50,6 +47,16 @@ class AnnotationSet:
         self.total_images = total_images
         self.top3_classes = top3_classes
         self.total_annotation_objects = total_annotation_objects
+        self._sdk = None
+
+    @property
+    def sdk(self):
+        if self._sdk is not None:
+            return self._sdk
+
+        from remo import _get_sdk
+
+        return _get_sdk()
 
     def __str__(self):
         return "Annotation set {id} - '{name}', task: {task}, #classes: {total_classes}".format(
@@ -59,7 +66,13 @@ class AnnotationSet:
     def __repr__(self):
         return self.__str__()
 
-    def add_annotations(self, annotations: List[Annotation]):
+    def add_annotations(
+        self,
+        annotations: Iterable[Annotation],
+        chunk_size: int = None,
+        chunk_bytes: int = None,
+        max_workers: int = 4,
+    ):
         
         """
         Upload of annotations to the annotation set.
@@ -87,10 +100,25 @@ class AnnotationSet:
             ann_set.add_annotations(annotations)
             
         Args:
-            annotations: list of Annotation objects
-            
+            annotations: list of Annotation objects. Can be any iterable, e.g. a generator, to upload annotations without keeping them all in memory
+            chunk_size: if set, annotations are split in chunks of ``chunk_size`` annotations,
+                uploaded concurrently in one upload session. See also: :func:`remo.SDK.upload_annotations`
+            chunk_bytes: if set, annotations are split in chunks of about ``chunk_bytes`` bytes
+            max_workers: number of chunks uploaded at the same time
+
+        Returns:
+            upload result by chunk, if annotations are uploaded in chunks
         """
-            
+        if chunk_size or chunk_bytes:
+            return self.sdk.upload_annotations(
+                self.dataset_id,
+                self.id,
+                annotations,
+                chunk_size=chunk_size,
+                chunk_bytes=chunk_bytes,
+                max_workers=max_workers,
+            )
+
         temp_path, _ = create_tempfile(annotations)
         
             
@@ -111,6 +139,21 @@ class AnnotationSet:
         """
         self.sdk.add_annotations_to_image(self.id, image_id, annotation)
 
+    def add_images_annotations(self, annotations: List[Annotation], max_workers: int = 8) -> dict:
+        """
+        Adds annotations to many images at once, annotating images concurrently.
+        Failures on some images don't stop the others.
+        See also: :func:`remo.SDK.add_annotations_to_images`
+
+        Args:
+            annotations: list of Annotation objects, with img_filename set
+            max_workers: maximum number of images annotated at the same time
+
+        Returns:
+            dictionary with number of ``annotated`` images and ``errors`` by image file name
+        """
+        return self.sdk.add_annotations_to_images(self.id, annotations, max_workers=max_workers)
+
     def _export_annotations(
         self, 
         annotation_format: str = 'json', 
@@ -187,6 +230,71 @@ class AnnotationSet:
             filter_by_tags=filter_by_tags
         )
 
+    def to_arrow(self, export_coordinates: str = 'pixel', append_path: bool = False, filter_by_tags: list = None):
+        """
+        Exports annotations to an Arrow table, with the same columns as the CSV export.
+        Requires pyarrow.
+
+        Example::
+            table = my_annotation_set.to_arrow()
+            df = table.to_pandas()
+
+        Args:
+            export_coordinates: converts output values to percentage or pixels, can be one of ['pixel', 'percent']. Default='pixel'
+            append_path: if True, appends the path to the filename (e.g. local path). Default: False
+            filter_by_tags: allows to filter results by tags, can be list or str
+
+        Returns:
+            :class:`pyarrow.Table`
+        """
+        return self.sdk.export_annotations_to_arrow(
+            self.id, export_coordinates=export_coordinates, append_path=append_path, filter_by_tags=filter_by_tags
+        )
+
+    def to_parquet(
+        self, output_file: str, export_coordinates: str = 'pixel', append_path: bool = False, filter_by_tags: list = None
+    ):
+        """
+        Exports annotations to a Parquet file, with the same columns as the CSV export.
+        Requires pyarrow.
+
+        Args:
+            output_file: output Parquet file path
+            export_coordinates: converts output values to percentage or pixels, can be one of ['pixel', 'percent']. Default='pixel'
+            append_path: if True, appends the path to the filename (e.g. local path). Default: False
+            filter_by_tags: allows to filter results by tags, can be list or str
+        """
+        self.sdk.export_annotations_to_parquet(
+            output_file,
+            self.id,
+            export_coordinates=export_coordinates,
+            append_path=append_path,
+            filter_by_tags=filter_by_tags,
+        )
+
+    def iter_exported_annotations(
+        self, export_coordinates: str = 'pixel', append_path: bool = False, filter_by_tags: list = None
+    ) -> Iterator[dict]:
+        """
+        Exports annotations in JSON format and yields them image by image, while they are downloaded.
+        Memory usage doesn't depend on the size of the annotation set.
+
+        Example::
+            for record in my_annotation_set.iter_exported_annotations():
+                print(record['file_name'], len(record['annotations']))
+
+        Args:
+            export_coordinates: converts output values to percentage or pixels, can be one of ['pixel', 'percent']. Default='pixel'
+            append_path: if True, appends the path to the filename (e.g. local path). Default: False
+            filter_by_tags: allows to filter results by tags, can be list or str
+
+        Returns:
+            Iterator[dict] of image records, as in the JSON export
+        """
+        return self.sdk.iter_exported_annotations(
+            self.id, export_coordinates=export_coordinates, append_path=append_path, filter_by_tags=filter_by_tags
+        )
+
     def classes(self) -> List[str]:
         """
         List classes within the annotation set
@@ -0,0 +1,270 @@
+from typing import List
+
+from .annotation import Annotation
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise Exception('AnnotationTable requires numpy. You can install it with: pip install remo-python[numpy]')
+    return numpy
+
+
+class AnnotationTable:
+    """
+    Columnar representation of annotations, backed by NumPy arrays, for fast analysis of large annotation sets.
+
+    There is one row per annotation and class, so an annotation with two classes takes two rows,
+    sharing the same ``annotation_ids`` value.
+
+    Columns:
+
+    - ``image_ids``: image id, -1 if not known
+    - ``image_names``: image file name
+    - ``class_codes``: index of the class in ``classes``, -1 if the annotation has no class
+    - ``annotation_ids``: index of the original annotation
+    - ``bboxes``: ``(n, 4)`` array of ``xmin, ymin, xmax, ymax``, NaN for annotations which are not bounding boxes
+    - ``segment_offsets``: segment of row ``i`` is ``segment_coordinates[segment_offsets[i]:segment_offsets[i + 1]]``
+
+    Example::
+
+        table = my_dataset.annotations(as_table=True)
+        print(table.class_counts())
+        large_dogs = table.filter(classes='Dog').filter(table.box_areas() > 10000)
+        annotations = large_dogs.to_annotations()
+
+    Args:
+        classes: list of class names
+        image_ids: image ids column
+        image_names: image names column
+        class_codes: class codes column
+        annotation_ids: annotation index column
+        bboxes: bounding boxes column
+        segment_coordinates: flat array of all segments coordinates
+        segment_offsets: start of segment coordinates of each row
+    """
+
+    __slots__ = (
+        'classes',
+        'image_ids',
+        'image_names',
+        'class_codes',
+        'annotation_ids',
+        'bboxes',
+        'segment_coordinates',
+        'segment_offsets',
+    )
+
+    def __init__(
+        self,
+        classes: List[str],
+        image_ids,
+        image_names,
+        class_codes,
+        annotation_ids,
+        bboxes,
+        segment_coordinates,
+        segment_offsets,
+    ):
+        self.classes = classes
+        self.image_ids = image_ids
+        self.image_names = image_names
+        self.class_codes = class_codes
+        self.annotation_ids = annotation_ids
+        self.bboxes = bboxes
+        self.segment_coordinates = segment_coordinates
+        self.segment_offsets = segment_offsets
+
+    def __len__(self):
+        return len(self.class_codes)
+
+    def __str__(self):
+        return 'AnnotationTable: {} rows, {} images, {} classes'.format(
+            len(self), len(set(self.image_names.tolist())), len(self.classes)
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+    @classmethod
+    def from_annotations(cls, annotations: List[Annotation], image_ids: dict = None):
+        """
+        Builds table from annotations
+
+        Args:
+            annotations: list of annotations
+            image_ids: dictionary of image ids by image file name
+
+        Returns:
+            :class:`AnnotationTable`
+        """
+        np = _import_numpy()
+        image_ids = image_ids or {}
+
+        class_index = {}
+        names, codes, annotation_ids, bboxes, segments, offsets = [], [], [], [], [], [0]
+        nan_box = [float('nan')] * 4
+        for i, annotation in enumerate(annotations):
+            bbox = annotation.bbox.coordinates if annotation.bbox else nan_box
+            segment = annotation.segment.coordinates if annotation.segment else []
+            for class_name in annotation.classes or [None]:
+                codes.append(-1 if class_name is None else class_index.setdefault(class_name, len(class_index)))
+                names.append(annotation.img_filename)
+                annotation_ids.append(i)
+                bboxes.append(bbox)
+                segments.extend(segment)
+                offsets.append(len(segments))
+
+        return cls(
+            classes=list(class_index),
+            image_ids=np.array([image_ids.get(name, -1) for name in names], dtype=np.int64),
+            image_names=np.array(names, dtype=object),
+            class_codes=np.array(codes, dtype=np.int32),
+            annotation_ids=np.array(annotation_ids, dtype=np.int64),
+            bboxes=np.array(bboxes, dtype=np.float64).reshape(-1, 4),
+            segment_coordinates=np.array(segments, dtype=np.float64),
+            segment_offsets=np.array(offsets, dtype=np.int64),
+        )
+
+    @property
+    def class_names(self):
+        """
+        Class name of each row, None for rows without class
+        """
+        np = _import_numpy()
+        names = np.array(self.classes + [None], dtype=object)
+        return names[self.class_codes]
+
+    @property
+    def segment_lengths(self):
+        """
+        Number of segment coordinates of each row, 0 for rows which are not segments
+        """
+        np = _import_numpy()
+        return np.diff(self.segment_offsets)
+
+    def box_widths(self):
+        return self.bboxes[:, 2] - self.bboxes[:, 0]
+
+    def box_heights(self):
+        return self.bboxes[:, 3] - self.bboxes[:, 1]
+
+    def box_areas(self):
+        """
+        Area of bounding boxes, NaN for rows which are not bounding boxes
+        """
+        return self.box_widths() * self.box_heights()
+
+    def box_aspect_ratios(self):
+        """
+        Width to height ratio of bounding boxes, NaN for rows which are not bounding boxes
+        """
+        np = _import_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.box_widths() / self.box_heights()
+
+    def class_counts(self) -> dict:
+        """
+        Counts rows by class
+
+        Returns:
+            dictionary of number of rows by class name
+        """
+        np = _import_numpy()
+        counts = np.bincount(self.class_codes[self.class_codes >= 0], minlength=len(self.classes))
+        return dict(zip(self.classes, counts.tolist()))
+
+    def filter(self, mask=None, classes=None, img_filenames=None):
+        """
+        Selects rows matching all the given conditions
+
+        Args:
+            mask: boolean array or array of row indexes
+            classes: class name or list of class names
+            img_filenames: image file name or list of image file names
+
+        Returns:
+            :class:`AnnotationTable` with selected rows
+        """
+        np = _import_numpy()
+        selected = np.ones(len(self), dtype=bool)
+        if mask is not None:
+            mask = np.asarray(mask)
+            if mask.dtype != bool:
+                mask = np.isin(np.arange(len(self)), mask)
+            selected &= mask
+
+        if classes is not None:
+            classes = [classes] if isinstance(classes, str) else classes
+            codes = [self.classes.index(name) for name in classes if name in self.classes]
+            selected &= np.isin(self.class_codes, codes)
+
+        if img_filenames is not None:
+            img_filenames = [img_filenames] if isinstance(img_filenames, str) else img_filenames
+            selected &= np.isin(self.image_names, list(img_filenames))
+
+        return self._take(np.flatnonzero(selected))
+
+    def _take(self, rows):
+        np = _import_numpy()
+        starts, ends = self.segment_offsets[rows], self.segment_offsets[rows + 1]
+        lengths = ends - starts
+        segment_offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        # index of each selected segment coordinate in the original flat array
+        coordinate_index = np.repeat(starts - segment_offsets[:-1], lengths) + np.arange(segment_offsets[-1])
+
+        return AnnotationTable(
+            classes=self.classes,
+            image_ids=self.image_ids[rows],
+            image_names=self.image_names[rows],
+            class_codes=self.class_codes[rows],
+            annotation_ids=self.annotation_ids[rows],
+            bboxes=self.bboxes[rows],
+            segment_coordinates=self.segment_coordinates[coordinate_index],
+            segment_offsets=segment_offsets,
+        )
+
+    def groupby_class(self) -> dict:
+        """
+        Splits table by class
+
+        Returns:
+            dictionary of :class:`AnnotationTable` by class name
+        """
+        np = _import_numpy()
+        order = np.argsort(self.class_codes, kind='stable')
+        codes = self.class_codes[order]
+        bounds = np.searchsorted(codes, np.arange(len(self.classes) + 1))
+        return {
+            name: self._take(order[bounds[code]:bounds[code + 1]])
+            for code, name in enumerate(self.classes)
+            if bounds[code] < bounds[code + 1]
+        }
+
+    def to_annotations(self) -> List[Annotation]:
+        """
+        Converts table back to annotation objects. Rows of the same annotation are merged in one annotation
+
+        Returns:
+            List[:class:`remo.Annotation`]
+        """
+        np = _import_numpy()
+        annotations = {}
+        has_bbox = ~np.isnan(self.bboxes).any(axis=1)
+        class_names = self.class_names.tolist()
+        for row, annotation_id in enumerate(self.annotation_ids.tolist()):
+            annotation = annotations.get(annotation_id)
+            if annotation is None:
+                annotation = Annotation(img_filename=self.image_names[row])
+                if has_bbox[row]:
+                    annotation.bbox = self.bboxes[row].tolist()
+                elif self.segment_offsets[row + 1] > self.segment_offsets[row]:
+                    start, end = self.segment_offsets[row], self.segment_offsets[row + 1]
+                    annotation.segment = self.segment_coordinates[start:end].tolist()
+                annotations[annotation_id] = annotation
+
+            if class_names[row] is not None:
+                annotation.classes = annotation.classes + [class_names[row]]
+
+        return list(annotations.values())
@@ -1,9 +1,9 @@
 import os
-from typing import List, TypeVar
+from typing import Iterable, List, TypeVar, Iterator
 
 from .annotation import Annotation
 from .image import Image
-from remo.annotation_utils import create_tempfile
+from remo.annotation_utils import create_tempfile, peek_annotation_task
 
 AnnotationSet = TypeVar('AnnotationSet')
 
@@ -18,13 +18,13 @@ class Dataset:
         quantity: number of images
     """
 
-    def __init__(self, id: int = None, name: str = None, quantity: int = 0, **kwargs):
-        from remo import _sdk
+    __slots__ = ('id', 'name', 'n_images', '_sdk')
 
-        self.sdk = _sdk
+    def __init__(self, id: int = None, name: str = None, quantity: int = 0, **kwargs):
         self.id = id
         self.name = name
         self.n_images = quantity
+        self._sdk = None
 
     def __str__(self):
         return "Dataset {id:2d} - {name:5s} - {n_images:,} images".format(
@@ -34,6 +34,15 @@ class Dataset:
     def __repr__(self):
         return self.__str__()
 
+    @property
+    def sdk(self):
+        if self._sdk is not None:
+            return self._sdk
+
+        from remo import _get_sdk
+
+        return _get_sdk()
+
     def info(self):
         """
         Prints basic info about the dataset:
@@ -62,6 +71,9 @@ Annotation Sets: {n_annotation_sets}""".format(
         annotation_set_id: int = None,
         class_encoding=None,
         wait_for_complete=True,
+        max_workers: int = 1,
+        resume: bool = False,
+        deduplicate: bool = False,
     ) -> dict:
         """
         Adds images and/or annotations to the dataset.
@@ -112,6 +124,14 @@ Annotation Sets: {n_annotation_sets}""".format(
 
             wait_for_complete: if True, the function waits for upload data to complete
 
+            max_workers: number of parallel uploads for ``paths_to_upload``.
+                Files are uploaded in groups of about 8 MB, and up to ``max_workers`` groups are sent at the same time
+
+            resume: if True, resumes the latest interrupted upload of the same data to this dataset,
+                skipping files that were already uploaded
+
+            deduplicate: if True, skips images whose content was already uploaded to this dataset from this machine
+
         Returns:
             Dictionary with results for linking files, upload files and upload urls::
 
@@ -139,6 +159,9 @@ Annotation Sets: {n_annotation_sets}""".format(
             annotation_set_id=annotation_set_id,
             class_encoding=class_encoding,
             wait_for_complete=wait_for_complete,
+            max_workers=max_workers,
+            resume=resume,
+            deduplicate=deduplicate,
         )
 
     def fetch(self):
@@ -146,7 +169,8 @@ Annotation Sets: {n_annotation_sets}""".format(
         Updates dataset information from server
         """
         dataset = self.sdk.get_dataset(self.id)
-        self.__dict__.update(dataset.__dict__)
+        for field in ('id', 'name', 'n_images'):
+            setattr(self, field, getattr(dataset, field))
 
     def annotation_sets(self) -> List[AnnotationSet]:
         """
@@ -159,9 +183,12 @@ Annotation Sets: {n_annotation_sets}""".format(
 
     def add_annotations(
         self,
-        annotations: List[Annotation],
+        annotations: Iterable[Annotation],
         annotation_set_id: int = None,
         create_new_annotation_set: bool = False,
+        chunk_size: int = None,
+        chunk_bytes: int = None,
+        max_workers: int = 4,
     ):
         """
         Fast upload of annotations to the Dataset.
@@ -194,11 +221,16 @@ Annotation Sets: {n_annotation_sets}""".format(
             my_dataset.add_annotations(annotations)
 
         Args:
-            annotations: list of Annotation objects
+            annotations: list of Annotation objects. Can be any iterable, e.g. a generator, to upload annotations without keeping them all in memory
             annotation_set_id: annotation set id
             create_new_annotation_set: if True, a new annotation set will be created
+            chunk_size: if set, annotations are split in chunks of ``chunk_size`` annotations,
+                uploaded concurrently in one upload session. See also: :func:`remo.SDK.upload_annotations`
+            chunk_bytes: if set, annotations are split in chunks of about ``chunk_bytes`` bytes
+            max_workers: number of chunks uploaded at the same time
 
-
+        Returns:
+            upload result by chunk, if annotations are uploaded in chunks
         """
         if annotation_set_id and create_new_annotation_set:
             raise Exception(
@@ -213,12 +245,29 @@ Annotation Sets: {n_annotation_sets}""".format(
                 annotation_set = self.get_annotation_set()
                 annotation_set_id = annotation_set.id
 
+        annotation_task, annotations = peek_annotation_task(annotations)
+        if chunk_size or chunk_bytes:
+            if create_new_annotation_set or (not annotation_set_id):
+                n_annotation_sets = len(self.annotation_sets())
+                annotation_set = self.create_annotation_set(
+                    annotation_task=annotation_task, name='my_ann_set_{}'.format(n_annotation_sets + 1)
+                )
+
+            return self.sdk.upload_annotations(
+                self.id,
+                annotation_set.id,
+                annotations,
+                chunk_size=chunk_size,
+                chunk_bytes=chunk_bytes,
+                max_workers=max_workers,
+            )
+
         temp_path, list_of_classes = create_tempfile(annotations)
 
         if create_new_annotation_set or (not annotation_set_id):
             n_annotation_sets = len(self.annotation_sets())
             self.create_annotation_set(
-                annotation_task=annotations[0].task,
+                annotation_task=annotation_task,
                 name='my_ann_set_{}'.format(n_annotation_sets + 1),
                 classes=list_of_classes,
                 paths_to_files=temp_path,
@@ -471,20 +520,25 @@ Annotation Sets: {n_annotation_sets}""".format(
         if annotation_set:
             return annotation_set.classes()
 
-    def annotations(self, annotation_set_id: int = None) -> List[Annotation]:
+    def annotations(self, annotation_set_id: int = None, as_table: bool = False):
         """
         Returns all annotations for a given annotation set.
         If no annotation set is specified, the default annotation set will be used
 
+        Example::
+            table = my_dataset.annotations(as_table=True)
+            print(table.class_counts())
+
         Args:
             annotation_set_id: annotation set id
+            as_table: if True, returns annotations as :class:`remo.AnnotationTable`, which requires numpy
 
         Returns:
-             List[:class:`remo.Annotation`]
+             List[:class:`remo.Annotation`] or :class:`remo.AnnotationTable`
         """
         annotation_set = self.get_annotation_set(annotation_set_id)
         if annotation_set:
-            return self.sdk.list_annotations(self.id, annotation_set.id)
+            return self.sdk.list_annotations(self.id, annotation_set.id, as_table=as_table)
         print('ERROR: annotation set was not defined.')
 
     def images(self, limit: int = None, offset: int = None) -> List[Image]:
@@ -504,6 +558,28 @@ Annotation Sets: {n_annotation_sets}""".format(
         """
         return self.sdk.list_dataset_images(self.id, limit=limit, offset=offset)
 
+    def iter_images(self, page_size: int = 100, max_pages_in_flight: int = 2, limit: int = None) -> Iterator[Image]:
+        """
+        Iterates over images within the dataset, without loading all of them in memory.
+        Images are fetched page by page, and next pages are loaded in background while iterating.
+
+        Args:
+            page_size: number of images requested at once
+            max_pages_in_flight: maximum number of pages fetched ahead
+            limit: limits number of images. By default iterates over all images
+
+        Returns:
+            Iterator[:class:`remo.Image`]
+
+        Example::
+            for image in my_dataset.iter_images(page_size=500):
+                print(image.name)
+
+        """
+        return self.sdk.iter_dataset_images(
+            self.id, page_size=page_size, max_pages_in_flight=max_pages_in_flight, limit=limit
+        )
+
     def image(self, img_filename=None, img_id=None) -> Image:
         """
         Returns the :class:`remo.Image` with matching img_filename or img_id.
@@ -517,19 +593,104 @@ Annotation Sets: {n_annotation_sets}""".format(
             :class:`remo.Image`
         """
         # TODO ALR: do we need to raise an error if no image is found?
-        # TODO ALR: we have a sdk.get_image by img_id. Should we implement get_image by img_name in the server for faster processing?
 
         if (img_filename) and (img_id):
             raise Exception("You passed both img_filename and img_id. Pass only one of the two")
 
         if img_filename:
-            list_of_images = self.images()
-            for i_image in list_of_images:
-                if i_image.name == img_filename:
-                    return i_image
+            return self.sdk.get_image_by_name(self.id, img_filename)
         elif img_id:
             return self.sdk.get_image(img_id)
 
+    def images_to_parquet(self, output_file: str, page_size: int = 1000):
+        """
+        Exports metadata of the dataset images to a Parquet file. Requires pyarrow.
+
+        Example::
+            my_dataset.images_to_parquet('./images.parquet')
+
+        Args:
+            output_file: output Parquet file path
+            page_size: number of images requested at once
+        """
+        self.sdk.export_dataset_images_to_parquet(output_file, self.id, page_size=page_size)
+
+    def download(
+        self,
+        output_dir: str,
+        filter: dict = None,
+        max_workers: int = 8,
+        overwrite: bool = False,
+        link: str = 'copy',
+    ) -> dict:
+        """
+        Downloads dataset images to a folder, many images at the same time.
+        Images already in the folder with the same size are skipped, so the download can be resumed.
+
+        Example::
+            my_dataset.download('./dogs', filter={'classes': 'Dog', 'tags': 'train'}, max_workers=16)
+            my_dataset.download('./train', filter={'tags': 'train'}, link='hardlink')
+
+        Args:
+            output_dir: output folder
+            filter: search filters, to download only matching images. Accepts the same arguments
+                as :func:`search_images`, e.g. ``{'classes': 'Dog', 'image_name_contains': 'pic'}``.
+                By default downloads all images
+            max_workers: maximum number of images downloaded at the same time
+            overwrite: if True, downloads also images which already exist in the folder
+            link: how to materialize images added from local files, or cached images,
+                one of ``hardlink``, ``symlink``, ``reflink``, ``copy``. See also: :func:`remo.utils.link_file`
+
+        Returns:
+            dictionary with number of ``downloaded`` and ``skipped`` images, ``bytes`` downloaded,
+            ``seconds`` taken and ``errors`` by image file name. See also: :func:`remo.SDK.download_images`
+        """
+        if filter:
+            images = self.sdk.iter_search_images(self.id, **filter)
+        else:
+            images = self.sdk.iter_dataset_images(self.id, page_size=1000)
+        return self.sdk.download_images(images, output_dir, max_workers=max_workers, overwrite=overwrite, link=link)
+
+    def tags(self) -> List[str]:
+        """
+        Lists tags of the dataset images
+
+        Returns:
+            sorted list of tags
+        """
+        return self.sdk.list_dataset_tags(self.id)
+
+    def images_by_tag(self, tag: str) -> List[Image]:
+        """
+        Lists images with the given tag
+
+        Example::
+            train_images = my_dataset.images_by_tag('train')
+
+        Args:
+            tag: image tag
+
+        Returns:
+            List[:class:`remo.Image`]
+        """
+        return self.sdk.list_images_by_tag(self.id, tag)
+
+    def images_by_name(self, img_filenames: List[str]) -> List[Image]:
+        """
+        Returns images with matching file names.
+        Use it instead of calling :func:`image` in a loop, e.g. to match model predictions to images.
+
+        Example::
+            images = my_dataset.images_by_name(['cat.jpg', 'dog.jpg'])
+
+        Args:
+            img_filenames: list of image file names
+
+        Returns:
+            List[:class:`remo.Image`] - images in the same order as file names, None for images not found
+        """
+        return self.sdk.get_images_by_name(self.id, img_filenames)
+
     def delete(self):
         """
         Deletes dataset
@@ -572,6 +733,50 @@ Annotation Sets: {n_annotation_sets}""".format(
                                       image_name_contains = image_name_contains,
                                       limit = limit)
 
+    def iter_search_images(
+            self,
+            annotation_sets_id: int = None,
+            classes: str = None,
+            classes_not: str = None,
+            tags: str = None,
+            tags_not: str = None,
+            image_name_contains: str = None,
+            limit: int = None,
+            page_size: int = None,
+            max_pages_in_flight: int = 4):
+        """
+        Search images by filename, classes and tags, yielding images as soon as they arrive.
+        Next pages of results are fetched in background while iterating.
+
+        Examples::
+            for image in my_dataset.iter_search_images(classes = ["dog","person"]):
+                print(image.name)
+
+        Args:
+            annotation_sets_id: the annotation sets ID to search into (can be multiple, e.g. [1, 2]). No need to specify it if the dataset has only one annotation set
+            classes: string or list of strings - search for images which have objects of all the given classes
+            classes_not: string or list of strings - search for images excluding those that have objects of all the given classes
+            tags: string or list of strings - search for images having all the given tags
+            tags_not: string or list of strings - search for images excluding those that have all the given tags
+            image_name_contains: search for images whose name contains the given string
+            limit: limits number of search results (by default returns all results)
+            page_size: number of results per page. By default it adapts to server response time
+            max_pages_in_flight: maximum number of pages requested at the same time
+
+        Returns:
+            Iterator[:class:`remo.AnnotatedImage`]
+        """
+        return self.sdk.iter_search_images(dataset_id=self.id,
+                                           annotation_sets_id=annotation_sets_id,
+                                           classes=classes,
+                                           classes_not=classes_not,
+                                           tags=tags,
+                                           tags_not=tags_not,
+                                           image_name_contains=image_name_contains,
+                                           limit=limit,
+                                           page_size=page_size,
+                                           max_pages_in_flight=max_pages_in_flight)
+
     def view(self):
         """
         Opens browser on dataset page
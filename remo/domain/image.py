@@ -1,7 +1,8 @@
 import os
-import shutil
 from typing import TypeVar, List
 
+from remo.utils import link_file
+
 
 Annotation = TypeVar('Annotation')
 AnnotationSet = TypeVar('AnnotationSet')
@@ -24,6 +25,7 @@ class Image:
     """
 
     __fields = ['id', 'name', 'dataset_id', 'path', 'url', 'size', 'width', 'height', 'upload_date']
+    __slots__ = tuple(__fields) + ('_sdk',)
 
     def __init__(
         self,
@@ -38,10 +40,6 @@ class Image:
         upload_date: str = None,
         **kwargs
     ):
-        from remo import _sdk
-
-        self.sdk = _sdk
-
         self.id = id
         self.name = name
         self.dataset_id = dataset_id
@@ -51,6 +49,7 @@ class Image:
         self.width = width
         self.height = height
         self.upload_date = upload_date
+        self._sdk = None
 
     def __str__(self):
         return 'Image: {} - {}'.format(self.id, self.name)
@@ -58,6 +57,15 @@ class Image:
     def __repr__(self):
         return self.__str__()
 
+    @property
+    def sdk(self):
+        if self._sdk is not None:
+            return self._sdk
+
+        from remo import _get_sdk
+
+        return _get_sdk()
+
     def fetch_details(self):
         """
         Fetch the latest image details from the database and updating all fields
@@ -86,26 +94,33 @@ class Image:
 
         return self.sdk.get_image_content(self.url)
 
-    def save_to(self, dir_path: str):
+    def save_to(self, dir_path: str, link: str = 'copy'):
         """
-        Save image to giving directory
+        Save image to giving directory. The image is streamed to disk, or copied from the image cache if enabled
+
+        Images added from local files can be linked instead of copied, so no extra disk space is used.
+        If a link can't be created, e.g. a hardlink across filesystems, it falls back to reflink and then to copy.
+
+        Example::
+            for img in my_dataset.search_images(tags='train'):
+                img.save_to('./train', link='hardlink')
 
         Args:
             dir_path: path to the directory
+            link: one of ``hardlink``, ``symlink``, ``reflink``, ``copy``. See also: :func:`remo.utils.link_file`
         """
         dir_path = self.sdk._resolve_path(dir_path)
         os.makedirs(dir_path, exist_ok=True)
         file_path = os.path.join(dir_path, self.name)
 
         if self.path:
-            shutil.copy(self.path, file_path)
+            self.sdk._write_atomically(file_path, lambda tmp_file: link_file(self.path, tmp_file, link))
             return
 
-        img_content = self.get_content()
-        if not img_content:
-            return
+        if not self.url:
+            raise Exception("ERROR: image url is not set")
 
-        self.sdk._save_to_file(img_content, file_path)
+        self.sdk.download_image(self.url, file_path, link=link)
 
     def list_annotation_sets(self) -> List[AnnotationSet]:
         """
@@ -170,6 +185,8 @@ class Image:
 class AnnotatedImage(Image):
     """Image with raw json annotations"""
 
+    __slots__ = ('annotations',)
+
     def __init__(self, image: Image, annotations: list):
         super().__init__()
         self.update_fields(image)
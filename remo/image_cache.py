@@ -0,0 +1,168 @@
+import hashlib
+import os
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from typing import Iterable
+
+from .config import remo_home_path
+
+
+class ImageCache:
+    """
+    On-disk cache of image files, so images used many times, e.g. in every training epoch, are downloaded once.
+
+    Files are content-addressed: each file is stored once, by SHA-256 of its content,
+    in ``REMO_HOME/image_cache/<2 chars>/<sha256>``, and an SQLite index maps image urls to file hashes.
+    Identical images of different datasets share the same file.
+
+    When the total size of cached files is above ``max_size``, least recently used files are removed.
+    Cached files are read-only, as they are shared by all images with the same content.
+
+    Args:
+        max_size: maximum total size of cached files, in bytes
+        path: cache folder. By default is ``REMO_HOME/image_cache``
+    """
+
+    dir_name = 'image_cache'
+
+    def __init__(self, max_size: int = 10 * 2 ** 30, path: str = None):
+        self.max_size = max_size
+        self.path = path or os.path.dirname(remo_home_path(self.dir_name, 'index.sqlite3'))
+        os.makedirs(self.path, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(self.path, 'index.sqlite3'), check_same_thread=False)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, digest TEXT)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS entries_by_digest ON entries (digest)')
+            self._db.execute('CREATE TABLE IF NOT EXISTS files (digest TEXT PRIMARY KEY, size INTEGER, last_access REAL)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS files_by_last_access ON files (last_access)')
+
+    def close(self):
+        self._db.close()
+
+    def _file_path(self, digest: str) -> str:
+        return os.path.join(self.path, digest[:2], digest)
+
+    def get(self, key: str) -> str:
+        """
+        Returns path of the cached file, or None if it's not cached
+
+        Args:
+            key: image key, e.g. image url
+        """
+        with self._lock:
+            row = self._db.execute('SELECT digest FROM entries WHERE key = ?', (key,)).fetchone()
+            if not row:
+                self.misses += 1
+                return None
+
+            digest = row[0]
+            file_path = self._file_path(digest)
+            with self._db:
+                if not os.path.exists(file_path):
+                    # file was removed outside of the cache
+                    self._db.execute('DELETE FROM entries WHERE digest = ?', (digest,))
+                    self._db.execute('DELETE FROM files WHERE digest = ?', (digest,))
+                    self.misses += 1
+                    return None
+
+                self._db.execute('UPDATE files SET last_access = ? WHERE digest = ?', (time.time(), digest))
+            self.hits += 1
+            return file_path
+
+    def put(self, key: str, chunks: Iterable[bytes]) -> str:
+        """
+        Stores file content in the cache. Content is written to disk chunk by chunk
+
+        Args:
+            key: image key, e.g. image url
+            chunks: file content chunks
+
+        Returns:
+            path of the cached file
+        """
+        sha256 = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                for chunk in chunks:
+                    sha256.update(chunk)
+                    size += len(chunk)
+                    file.write(chunk)
+
+            digest = sha256.hexdigest()
+            file_path = self._file_path(digest)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            if os.path.exists(file_path):
+                # same content is already cached for another key
+                os.remove(tmp_path)
+            else:
+                os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+                os.replace(tmp_path, file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?)', (key, digest))
+            self._db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?)', (digest, size, time.time()))
+        self._evict(keep=digest)
+        return file_path
+
+    def _evict(self, keep: str = None):
+        """
+        Removes least recently used files, until cache size is within ``max_size``
+        """
+        with self._lock, self._db:
+            total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM files').fetchone()[0]
+            if total <= self.max_size:
+                return
+
+            rows = self._db.execute('SELECT digest, size FROM files ORDER BY last_access').fetchall()
+            for digest, size in rows:
+                if total <= self.max_size:
+                    break
+                if digest == keep:
+                    continue
+
+                self._db.execute('DELETE FROM entries WHERE digest = ?', (digest,))
+                self._db.execute('DELETE FROM files WHERE digest = ?', (digest,))
+                self._remove_file(digest)
+                total -= size
+
+    def _remove_file(self, digest: str):
+        file_path = self._file_path(digest)
+        try:
+            # read-only files can't be removed on Windows
+            os.chmod(file_path, stat.S_IWUSR | stat.S_IRUSR)
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        """
+        Removes all cached files
+        """
+        self.max_size, max_size = 0, self.max_size
+        try:
+            self._evict()
+        finally:
+            self.max_size = max_size
+
+    def info(self) -> dict:
+        """
+        Returns cache statistics
+
+        Returns:
+            dictionary with hits, misses, number of files, size and max_size of the cache
+        """
+        with self._lock:
+            files, size = self._db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files').fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'files': files, 'size': size, 'max_size': self.max_size}
@@ -0,0 +1,103 @@
+import codecs
+import json
+import re
+from typing import Iterator
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]+\Z')
+
+
+class JSONArrayStream:
+    """
+    Incremental parser of a JSON array, which yields array items one by one while the content is read.
+
+    Only the item being parsed and the unread part of the last chunk are kept in memory,
+    so memory usage doesn't depend on the size of the whole array.
+
+    Args:
+        file: binary file-like object, e.g. a streamed HTTP response
+        chunk_size: number of bytes read at once
+
+    Example::
+
+        with open('annotations.json', 'rb') as file:
+            for item in JSONArrayStream(file):
+                print(item['file_name'])
+    """
+
+    def __init__(self, file, chunk_size: int = 64 * 1024):
+        self.file = file
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _read_more(self, size: int = None) -> bool:
+        """
+        Appends next chunk of content to the buffer, dropping what was already parsed
+
+        Returns:
+            False if there is no more content
+        """
+        if self._eof:
+            return False
+
+        data = self.file.read(size or self.chunk_size)
+        self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(data or b'', final=not data)
+        self._pos = 0
+        if not data:
+            self._eof = True
+        return True
+
+    def _next_char(self) -> str:
+        """
+        Skips whitespace and returns next character, without consuming it. Empty string at the end of content
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                return ''
+
+    def _expect(self, chars: str) -> str:
+        char = self._next_char()
+        if not char or char not in chars:
+            raise ValueError('Expected one of {!r} at position {}, got {!r}'.format(chars, self._pos, char))
+        self._pos += 1
+        return char
+
+    def _decode_value(self):
+        self._next_char()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                # value is not complete yet. Reading as much as already buffered keeps re-parsing cost linear
+                if not self._read_more(max(self.chunk_size, len(self._buffer))):
+                    raise
+                continue
+
+            # a value at the end of the buffer, or a number followed only by number characters, e.g. ``12.``,
+            # might continue in the next chunk
+            is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+            at_end = end == len(self._buffer) or (is_number and _NUMBER_TAIL.match(self._buffer, end))
+            if at_end and self._read_more():
+                continue
+
+            self._pos = end
+            return value
+
+    def __iter__(self) -> Iterator:
+        self._expect('[')
+        if self._next_char() == ']':
+            self._pos += 1
+            return
+
+        while True:
+            yield self._decode_value()
+            if self._expect(',]') == ']':
+                return
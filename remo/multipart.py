@@ -0,0 +1,119 @@
+import os
+import uuid
+
+
+class MultipartEncoder:
+    """
+    Streaming ``multipart/form-data`` request body.
+
+    Files are opened one at a time, only when the body reaches them, read in chunks of ``chunk_size`` bytes
+    and closed as soon as they are fully sent. The total length is computed upfront from file sizes,
+    so the body can be sent with ``Content-Length`` and memory usage doesn't depend on the size of the files.
+
+    Args:
+        fields: list of ``(name, value)`` form fields
+        files: list of ``(name, path)`` files to send
+        chunk_size: number of bytes read from disk at once
+
+    Example::
+
+        encoder = MultipartEncoder([('session_id', '1')], [('files', 'image.jpg')])
+        requests.post(url, data=encoder, headers={'Content-Type': encoder.content_type})
+    """
+
+    def __init__(self, fields: list = None, files: list = None, chunk_size: int = 64 * 1024):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = 'multipart/form-data; boundary={}'.format(self.boundary)
+        self.chunk_size = chunk_size
+
+        self._parts = []
+        for name, value in fields or []:
+            header = self._part_header(name)
+            self._parts.append((header + str(value).encode('utf-8') + b'\r\n', None, 0))
+
+        if files:
+            import filetype
+
+        for name, path in files or []:
+            header = self._part_header(name, os.path.basename(path), filetype.guess_mime(path))
+            self._parts.append((header, path, os.path.getsize(path)))
+
+        self._tail = '--{}--\r\n'.format(self.boundary).encode()
+        self._length = len(self._tail) + sum(
+            len(header) + size + (2 if path else 0) for header, path, size in self._parts
+        )
+
+        self._chunks = None
+        self._buffer = b''
+
+    def _part_header(self, name: str, filename: str = None, content_type: str = None) -> bytes:
+        header = '--{}\r\nContent-Disposition: form-data; name="{}"'.format(self.boundary, self._quote(name))
+        if filename is not None:
+            header += '; filename="{}"'.format(self._quote(filename))
+        if content_type:
+            header += '\r\nContent-Type: {}'.format(content_type)
+        return '{}\r\n\r\n'.format(header).encode('utf-8')
+
+    @staticmethod
+    def _quote(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+
+    def __len__(self):
+        return self._length
+
+    def _iter_chunks(self):
+        for header, path, size in self._parts:
+            yield header
+            if not path:
+                continue
+
+            remaining = size
+            with open(path, 'rb') as file:
+                while remaining > 0:
+                    chunk = file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        raise Exception('File {} changed while uploading'.format(path))
+                    remaining -= len(chunk)
+                    yield chunk
+            yield b'\r\n'
+        yield self._tail
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Reads up to ``size`` bytes of the body, or the whole remaining body if ``size`` is negative
+        """
+        if self._chunks is None:
+            self._chunks = self._iter_chunks()
+
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def rewind(self):
+        """
+        Restarts the body from the beginning, e.g. to send it again
+        """
+        self.close()
+        self._buffer = b''
+
+    def close(self):
+        """
+        Closes currently opened file, if any
+        """
+        if self._chunks is not None:
+            self._chunks.close()
+            self._chunks = None
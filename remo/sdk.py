@@ -1,12 +1,26 @@
+import http
 import os
+import stat
+import threading
 import time
-from typing import List
+import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Iterator
 import csv
 
-from .domain import Image, Dataset, AnnotationSet, class_encodings, Annotation, AnnotatedImage
-from .api import API
+from .domain import Image, Dataset, AnnotationSet, class_encodings, Annotation, AnnotatedImage, AnnotationTable
+from .annotation_utils import iter_csv_chunks, peek_annotation_task
+from .api import API, ExportError
+from .cache import MetadataCache
+from .image_cache import ImageCache
+from .json_stream import JSONArrayStream
+from .store import MetadataStore
+from .upload_manifest import UploadManifest
 
+from . import arrow
 from .endpoints import frontend
+from .utils import iter_pages, link_file
 from .viewer import factory
 
 
@@ -20,6 +34,15 @@ class SDK:
         password: user credentials
         viewer: allows to choose between browser, electron and jupyter viewer.
             To be able change viewer, you can use :func:`set_viewer` function. See example.
+        cache_ttl: if set, caches datasets, annotation sets and images metadata for the given number of seconds.
+            See also: :func:`enable_cache`
+        cache_maxsize: maximum number of cached entries
+        local_store: if True, keeps a local copy of datasets metadata and reads it from there.
+            If the server is not reachable, works offline using the local copy. See also: :func:`enable_local_store`
+        image_cache_size: if set, caches downloaded image files on disk, up to the given size in bytes.
+            See also: :func:`enable_image_cache`
+        api_options: connection pool settings, e.g. ``pool_maxsize``, ``keep_alive``, ``timeout``.
+            See also: :class:`remo.api.BaseAPI`
 
     Example::
 
@@ -29,15 +52,228 @@ class SDK:
 
     """
 
-    def __init__(self, server: str, email: str, password: str, viewer: str = 'browser'):
-        self.api = API(server, email, password)
+    def __init__(
+        self,
+        server: str,
+        email: str,
+        password: str,
+        viewer: str = 'browser',
+        cache_ttl: float = None,
+        cache_maxsize: int = 256,
+        local_store: bool = False,
+        image_cache_size: int = None,
+        **api_options
+    ):
+        self.api = API(server, email, password, login=not local_store, **api_options)
 
         self.viewer = None
         self.set_viewer(viewer)
 
+        self.cache = None
+        if cache_ttl:
+            self.enable_cache(cache_ttl, cache_maxsize)
+
+        self.image_cache = None
+        if image_cache_size:
+            self.enable_image_cache(image_cache_size)
+
+        self.store = None
+        self.store_sync_interval = 60
+        self.offline = False
+        self._synced_datasets = {}
+        self._image_indexes = {}
+        self._dataset_locks = {}
+        self._dataset_locks_lock = threading.Lock()
+        if local_store:
+            self.enable_local_store()
+            try:
+                self.api.login()
+            except Exception as err:
+                if not self._is_connection_error(err):
+                    raise
+                self._go_offline()
+
     def set_public_url(self, public_url: str):
         self.api.set_public_url(public_url)
 
+    def enable_cache(self, ttl: float = 60, maxsize: int = 256):
+        """
+        Enables caching of datasets, annotation sets and images metadata, which rarely change.
+        Cached entries are refreshed after ``ttl`` seconds, and invalidated by changes made with this SDK,
+        e.g. adding data to a dataset or creating an annotation set.
+
+        Example::
+
+            remo.enable_cache(ttl=300)
+            ...
+            print(remo.cache_info())
+
+        Args:
+            ttl: time to live of cached entries, in seconds
+            maxsize: maximum number of cached entries
+        """
+        self.cache = MetadataCache(ttl, maxsize)
+
+    def disable_cache(self):
+        """
+        Disables metadata cache
+        """
+        self.cache = None
+
+    def cache_info(self) -> dict:
+        """
+        Returns metadata cache statistics
+
+        Returns:
+            dictionary with hits, misses, size and maxsize of the cache, or None if cache is disabled
+        """
+        if self.cache:
+            return self.cache.info()
+
+    def enable_image_cache(self, max_size: int = 10 * 2 ** 30, path: str = None):
+        """
+        Enables on-disk cache of image files, under remo home. Images are downloaded once,
+        and then :func:`get_image_content` and :func:`download_image` read them from the cache.
+        When the cache is bigger than ``max_size``, least recently used images are removed.
+
+        Example::
+
+            remo.enable_image_cache(max_size=50 * 2 ** 30)
+            for img in my_dataset.images():
+                content = img.get_content()
+
+        Args:
+            max_size: maximum total size of cached images, in bytes. Default: 10 GB
+            path: cache folder. By default is stored in remo home
+        """
+        self.image_cache = ImageCache(max_size, path)
+
+    def disable_image_cache(self):
+        """
+        Disables image cache. Cached images are kept on disk
+        """
+        self.image_cache = None
+
+    def image_cache_info(self) -> dict:
+        """
+        Returns image cache statistics
+
+        Returns:
+            dictionary with hits, misses, number of files, size and max_size of the cache, or None if cache is disabled
+        """
+        if self.image_cache:
+            return self.image_cache.info()
+
+    def _cached(self, key: tuple, load, parse):
+        """
+        Loads data through cache, if enabled. Responses which fail to parse are not kept in cache
+        """
+        if self.cache is None:
+            return parse(load())
+
+        try:
+            return parse(self.cache.get(key, load))
+        except Exception:
+            self.cache.invalidate(*key)
+            raise
+
+    def enable_local_store(self, path: str = None, sync_interval: float = 60):
+        """
+        Enables local metadata store: datasets, images, annotation sets and classes are kept in a local SQLite database,
+        under remo home, and read from there.
+        Local copy of a dataset is synced with the server when first used, and then at most every ``sync_interval`` seconds.
+        Only what changed since the last sync is downloaded again.
+
+        If the server is not reachable, stored metadata is still available in read-only mode.
+
+        Example::
+
+            remo.enable_local_store()
+            my_dataset = remo.get_dataset(1)
+            my_dataset.images()
+
+        Args:
+            path: location of the database. By default is stored in remo home
+            sync_interval: minimum time between syncs of a dataset, in seconds
+        """
+        self.store = MetadataStore(self.api.server, path)
+        self.store_sync_interval = sync_interval
+        self._synced_datasets = {}
+
+    def sync_local_store(self, dataset_ids: List[int] = None):
+        """
+        Syncs local metadata store with the server, e.g. to prepare for working offline
+
+        Args:
+            dataset_ids: datasets to sync. By default syncs all datasets
+        """
+        if self.store is None:
+            raise Exception('Local store is not enabled. You can enable it with remo.enable_local_store()')
+
+        datasets = self.api.list_datasets().get('results', [])
+        self.store.save_datasets(datasets, complete=True)
+        for dataset_id in dataset_ids or [ds['id'] for ds in datasets]:
+            with self._dataset_lock(dataset_id, 'sync'):
+                self.store.sync_dataset(self.api, dataset_id)
+                self._synced_datasets[dataset_id] = time.monotonic()
+
+    def _dataset_lock(self, dataset_id: int, purpose: str) -> threading.Lock:
+        """
+        Returns lock of the dataset for the given purpose, e.g. ``'sync'``,
+        so that concurrent callers wait for one of them to do the work instead of repeating it
+        """
+        with self._dataset_locks_lock:
+            return self._dataset_locks.setdefault((dataset_id, purpose), threading.Lock())
+
+    def _needs_sync(self, dataset_id: int) -> bool:
+        synced_at = self._synced_datasets.get(dataset_id)
+        return not self.offline and (synced_at is None or time.monotonic() - synced_at > self.store_sync_interval)
+
+    def _is_local(self, dataset_id: int) -> bool:
+        """
+        Checks if dataset metadata should be read from local store. Syncs the dataset first, if needed
+        """
+        if self.store is None:
+            return False
+
+        if self._needs_sync(dataset_id):
+            with self._dataset_lock(dataset_id, 'sync'):
+                # checked again, as the dataset may have been synced while waiting for the lock
+                if self._needs_sync(dataset_id):
+                    try:
+                        self.store.sync_dataset(self.api, dataset_id)
+                        self._synced_datasets[dataset_id] = time.monotonic()
+                    except Exception as err:
+                        if not self._is_connection_error(err):
+                            raise
+                        self._go_offline()
+
+        return self.store.is_synced(dataset_id)
+
+    def _go_offline(self):
+        self.offline = True
+        print('Warning: cannot connect to server {}. Using local metadata store in read-only mode'.format(self.api.server))
+
+    @staticmethod
+    def _is_connection_error(err: Exception) -> bool:
+        return isinstance(err, requests.exceptions.ConnectionError) or isinstance(
+            err.__context__, requests.exceptions.ConnectionError
+        )
+
+    def _invalidate_dataset(self, dataset_id: int):
+        """
+        Invalidates cached metadata of dataset and its annotation sets
+        """
+        self._synced_datasets.pop(dataset_id, None)
+        self._image_indexes.pop(dataset_id, None)
+        if self.cache is None:
+            return
+
+        self.cache.invalidate('datasets')
+        self.cache.invalidate('dataset', dataset_id)
+        self.cache.invalidate('annotation_sets', dataset_id)
+        self.cache.invalidate('annotation_set')
+
     def set_viewer(self, viewer: str):
         """
         Allows to choose one of available viewers
@@ -55,7 +291,8 @@ class SDK:
         urls: List[str] = None,
         annotation_task: str = None,
         class_encoding=None,
-        wait_for_complete=True
+        wait_for_complete=True,
+        max_workers: int = 1,
     ) -> Dataset:
         """
         Creates a new dataset in Remo and optionally populate it with images and annotations.
@@ -85,15 +322,19 @@ class SDK:
 
             wait_for_complete: blocks function until upload data completes
 
+            max_workers: number of parallel uploads for ``paths_to_upload``
+
         Returns:
             :class:`remo.Dataset`
         """
 
         json_data = self.api.create_dataset(name)
+        if self.cache:
+            self.cache.invalidate('datasets')
         ds = Dataset(**json_data)
         ds.add_data(
             local_files, paths_to_upload, urls, annotation_task=annotation_task, class_encoding=class_encoding,
-            wait_for_complete=wait_for_complete
+            wait_for_complete=wait_for_complete, max_workers=max_workers
         )
         ds.fetch()
         return ds
@@ -108,7 +349,10 @@ class SDK:
         folder_id: int = None,
         annotation_set_id: int = None,
         class_encoding=None,
-        wait_for_complete=True
+        wait_for_complete=True,
+        max_workers: int = 1,
+        resume: bool = False,
+        deduplicate: bool = False,
     ) -> dict:
         """
         Adds images and/or annotations to an existing dataset.
@@ -143,6 +387,17 @@ class SDK:
 
             wait_for_complete: blocks function until upload data completes
 
+            max_workers: number of parallel uploads for ``paths_to_upload``.
+                Files are uploaded in groups of about 8 MB, and up to ``max_workers`` groups are sent at the same time
+
+            resume: if True, resumes the latest interrupted upload of the same data to this dataset.
+                Progress of the upload is recorded in ``REMO_HOME/uploads``, so already uploaded groups of files are skipped
+                and the same upload session is reused. Nothing is recorded when False.
+                If some groups of files fail, the session is left open and an exception is raised, so they can be retried
+
+            deduplicate: if True, images in ``paths_to_upload`` whose content was already uploaded to this dataset
+                from this machine are skipped. Content hashes are cached in ``REMO_HOME``
+
         Returns:
             Dictionary with results for linking files, upload files and upload urls::
 
@@ -180,33 +435,166 @@ class SDK:
         if urls:
             self._raise_value_error(urls, 'urls', list, 'list of URLs')
 
-        session_id = self.api.create_new_upload_session(dataset_id)
+        fingerprint = UploadManifest.fingerprint_of(
+            local_files=local_files,
+            paths_to_upload=paths_to_upload,
+            urls=urls,
+            class_encoding=class_encoding,
+            deduplicate=deduplicate,
+            **kwargs
+        )
+        manifest = UploadManifest.find(dataset_id, fingerprint) if resume else None
+        if manifest and not self._is_upload_session_open(manifest.session_id):
+            print('Upload session {} is already closed, starting a new one'.format(manifest.session_id))
+            manifest.remove()
+            manifest = None
+
+        if manifest:
+            session_id = manifest.session_id
+            print('Resuming upload session {}'.format(session_id))
+        else:
+            session_id = self.api.create_new_upload_session(dataset_id)
+            # progress is written to disk only when it can be resumed
+            manifest = UploadManifest(dataset_id, session_id, fingerprint) if resume else None
         kwargs['session_id'] = session_id
 
-        if local_files:
+        if local_files and not (manifest and manifest.is_step_done('local_files')):
             encoding = class_encodings.for_linking(class_encoding)
             self.api.upload_local_files(
                 dataset_id, local_files, class_encoding=encoding, **kwargs
             )
+            if manifest:
+                manifest.mark_step_done('local_files')
 
-        if paths_to_upload:
+        if paths_to_upload and not (manifest and manifest.is_step_done('paths_to_upload')):
             encoding = class_encodings.for_upload(class_encoding)
             self.api.bulk_upload_files(
-                dataset_id, paths_to_upload, class_encoding=encoding, **kwargs
+                dataset_id,
+                paths_to_upload,
+                class_encoding=encoding,
+                max_workers=max_workers,
+                manifest=manifest,
+                deduplicate=deduplicate,
+                **kwargs
             )
-
-        if urls:
+            if manifest:
+                failed = [index for index in range(len(manifest.groups)) if not manifest.is_group_done(index)]
+                if failed:
+                    # the session is kept open and the manifest is kept, so a resumed call uploads only failed groups
+                    raise Exception(
+                        'Failed to upload {} of {} groups of files, upload session {} is kept open. '
+                        'Call again with resume=True to retry them'.format(len(failed), len(manifest.groups), session_id)
+                    )
+                manifest.mark_step_done('paths_to_upload')
+
+        if urls and not (manifest and manifest.is_step_done('urls')):
             encoding = class_encodings.for_linking(class_encoding)
             self.api.upload_urls(
                 dataset_id, urls, class_encoding=encoding, **kwargs
             )
+            if manifest:
+                manifest.mark_step_done('urls')
 
         self.api.complete_upload_session(session_id)
+        if manifest:
+            manifest.remove()
+        self._invalidate_dataset(dataset_id)
 
         if not wait_for_complete:
             return {'session_id': session_id}
 
-        return self._report_processing_data_progress(session_id)
+        result = self._report_processing_data_progress(session_id)
+        self._invalidate_dataset(dataset_id)
+        return result
+
+    def upload_annotations(
+        self,
+        dataset_id: int,
+        annotation_set_id: int,
+        annotations: Iterable[Annotation],
+        chunk_size: int = 100000,
+        chunk_bytes: int = None,
+        max_workers: int = 4,
+        wait_for_complete: bool = True,
+    ) -> dict:
+        """
+        Uploads annotations in chunks. Annotations are split into CSV files of ``chunk_size`` annotations
+        or about ``chunk_bytes`` bytes, which are uploaded concurrently in one upload session, while next chunks are written.
+        A failed chunk doesn't stop the others: it's reported in the result.
+
+        Example::
+            def predictions():
+                for img_filename, box, label in model_outputs:
+                    annotation = remo.Annotation(img_filename, label)
+                    annotation.bbox = box
+                    yield annotation
+
+            remo.upload_annotations(dataset_id=1, annotation_set_id=2, annotations=predictions(), chunk_size=50000)
+
+        Args:
+            dataset_id: dataset id
+            annotation_set_id: annotation set id
+            annotations: annotations, all of the same task. Can be any iterable, e.g. a generator
+            chunk_size: maximum number of annotations in each chunk
+            chunk_bytes: approximate maximum size of each chunk, in bytes
+            max_workers: number of chunks uploaded at the same time
+            wait_for_complete: blocks function until upload data completes
+
+        Returns:
+            dictionary with ``session_id``, ``chunks`` - list of results of each chunk, and ``errors`` - number of failed chunks
+        """
+        annotation_task, annotations = peek_annotation_task(annotations)
+        session_id = self.api.create_new_upload_session(dataset_id)
+        chunks = []
+
+        def upload_chunk(index, path, n_rows):
+            try:
+                r = self.api._upload_files(
+                    dataset_id,
+                    [path],
+                    annotation_task=annotation_task,
+                    annotation_set_id=annotation_set_id,
+                    session_id=session_id,
+                )
+                result = r.json()
+                if r.status_code != http.HTTPStatus.OK or 'errors' in result:
+                    raise Exception('status code {}, response: {}'.format(r.status_code, result))
+                chunk = {'chunk': index, 'annotations': n_rows, 'result': result}
+                print('Chunk {}: uploaded {} annotations'.format(index, n_rows))
+            except Exception as err:
+                chunk = {'chunk': index, 'annotations': n_rows, 'error': str(err)}
+                print('Chunk {}: failed to upload {} annotations - {}'.format(index, n_rows, err))
+            finally:
+                os.remove(path)
+            return chunk
+
+        try:
+            with ThreadPoolExecutor(max_workers) as ex:
+                in_flight = deque()
+                for index, (path, n_rows) in enumerate(iter_csv_chunks(annotations, chunk_size, chunk_bytes)):
+                    # limits number of chunk files waiting on disk
+                    if len(in_flight) >= 2 * max_workers:
+                        chunks.append(in_flight.popleft().result())
+                    in_flight.append(ex.submit(upload_chunk, index, path, n_rows))
+                chunks += [future.result() for future in in_flight]
+        finally:
+            # closes the session also when annotations fail to be written, so it's not left open.
+            # Chunks uploaded so far are kept
+            self.api.complete_upload_session(session_id)
+            self._invalidate_dataset(dataset_id)
+
+        errors = sum(1 for chunk in chunks if 'error' in chunk)
+        result = {'session_id': session_id, 'chunks': chunks, 'errors': errors}
+        if errors:
+            print('Failed to upload {} of {} chunks'.format(errors, len(chunks)))
+
+        if wait_for_complete:
+            result['session'] = self._report_processing_data_progress(session_id)
+        return result
+
+    def _is_upload_session_open(self, session_id: str) -> bool:
+        session = self.api.get_upload_session_status(session_id)
+        return session.get('status') == 'not complete'
 
     def _report_processing_data_progress(self, session_id: str):
         """
@@ -222,25 +610,6 @@ class SDK:
             msg = msg.format(*args)
             return '{} {}'.format(msg, ' ' * (max_length - len(msg)))
 
-        def print_session_errors(data, key='error'):
-            for err in data:
-                msg = err[key] if 'value' not in err else '{}: {}'.format(err['value'], err[key])
-                print(msg)
-
-        def print_session_warnings(data):
-            print_session_errors(data, key='warning')
-
-        def print_file_errors(data, key='errors'):
-            errors = data.get(key, [])
-            for err in errors:
-                filename, errs = err['filename'], err[key]
-                msg = errs[0] if len(errs) == 1 else '\n * ' + '\n * '.join(errs)
-                msg = '{}: {}'.format(filename, msg)
-                print(msg)
-
-        def print_file_warnings(data):
-            print_file_errors(data, key='warnings')
-
         last_msg = ''
         while True:
             session = self.api.get_upload_session_status(session_id)
@@ -276,22 +645,48 @@ class SDK:
 
             elif status in ('done', 'failed'):
                 print(format_msg('Processing data - completed'))
-                msg = 'Data upload completed' if status == 'done' else 'Data upload completed with some errors:'
+                self._print_session_result(session)
+                return session
+            time.sleep(1)
+
+    @staticmethod
+    def _print_session_result(session: dict):
+        """
+        Prints result of completed upload session, including errors and warnings
+        """
+        def print_session_errors(data, key='error'):
+            for err in data:
+                msg = err[key] if 'value' not in err else '{}: {}'.format(err['value'], err[key])
                 print(msg)
 
-                if status == 'failed':
-                    print_session_errors(session.get('errors', []))
-                    print_file_errors(session['images'])
-                    print_file_errors(session['annotations'])
+        def print_session_warnings(data):
+            print_session_errors(data, key='warning')
 
-                if session.get('warnings', []) or session['images'].get('warnings', []) or session['annotations'].get('warnings', []):
-                    print('With some warnings:')
-                    print_session_warnings(session.get('warnings', []))
-                    print_file_warnings(session['images'])
-                    print_file_warnings(session['annotations'])
+        def print_file_errors(data, key='errors'):
+            errors = data.get(key, [])
+            for err in errors:
+                filename, errs = err['filename'], err[key]
+                msg = errs[0] if len(errs) == 1 else '\n * ' + '\n * '.join(errs)
+                msg = '{}: {}'.format(filename, msg)
+                print(msg)
 
-                return session
-            time.sleep(1)
+        def print_file_warnings(data):
+            print_file_errors(data, key='warnings')
+
+        status = session.get('status')
+        msg = 'Data upload completed' if status == 'done' else 'Data upload completed with some errors:'
+        print(msg)
+
+        if status == 'failed':
+            print_session_errors(session.get('errors', []))
+            print_file_errors(session['images'])
+            print_file_errors(session['annotations'])
+
+        if session.get('warnings', []) or session['images'].get('warnings', []) or session['annotations'].get('warnings', []):
+            print('With some warnings:')
+            print_session_warnings(session.get('warnings', []))
+            print_file_warnings(session['images'])
+            print_file_warnings(session['annotations'])
 
     @staticmethod
     def _raise_value_error(value, value_name, expected_type, expected_description):
@@ -309,8 +704,21 @@ class SDK:
         Returns:
             List[:class:`remo.Dataset`]
         """
-        json_data = self.api.list_datasets()
-        return [Dataset(**ds_item) for ds_item in json_data.get('results', [])]
+        if self.store is not None:
+            if not self.offline:
+                try:
+                    self.store.save_datasets(self.api.list_datasets().get('results', []))
+                except Exception as err:
+                    if not self._is_connection_error(err):
+                        raise
+                    self._go_offline()
+            return [Dataset(**ds_item) for ds_item in self.store.list_datasets().get('results', [])]
+
+        return self._cached(
+            ('datasets',),
+            self.api.list_datasets,
+            lambda json_data: [Dataset(**ds_item) for ds_item in json_data.get('results', [])],
+        )
 
     def get_dataset(self, dataset_id: int) -> Dataset:
         """
@@ -322,8 +730,17 @@ class SDK:
         Returns:
             :class:`remo.Dataset`
         """
-        json_data = self.api.get_dataset(dataset_id)
+        if self._is_local(dataset_id):
+            return self._parse_dataset(self.store.get_dataset(dataset_id), dataset_id)
+
+        return self._cached(
+            ('dataset', dataset_id),
+            lambda: self.api.get_dataset(dataset_id),
+            lambda json_data: self._parse_dataset(json_data, dataset_id),
+        )
 
+    @staticmethod
+    def _parse_dataset(json_data: dict, dataset_id: int) -> Dataset:
         if json_data.get('detail') == "Not found.":
             raise Exception(
                 "Dataset ID {} not found. "
@@ -340,6 +757,11 @@ class SDK:
             dataset_id: dataset id
         """
         self.api.delete_dataset(dataset_id)
+        self._invalidate_dataset(dataset_id)
+        if self.store is not None:
+            self.store.remove_dataset(dataset_id)
+        if self.cache:
+            self.cache.invalidate('image')
 
     def list_annotation_sets(self, dataset_id: int) -> List[AnnotationSet]:
         """
@@ -352,7 +774,17 @@ class SDK:
             List[:class:`remo.AnnotationSet`]
         """
 
-        result = self.api.list_annotation_sets(dataset_id)
+        if self._is_local(dataset_id):
+            return self._parse_annotation_sets(self.store.list_annotation_sets(dataset_id), dataset_id)
+
+        return self._cached(
+            ('annotation_sets', dataset_id),
+            lambda: self.api.list_annotation_sets(dataset_id),
+            lambda result: self._parse_annotation_sets(result, dataset_id),
+        )
+
+    @staticmethod
+    def _parse_annotation_sets(result: dict, dataset_id: int) -> List[AnnotationSet]:
         return [
             AnnotationSet(
                 id=annotation_set['id'],
@@ -378,8 +810,14 @@ class SDK:
         Returns:
              :class:`remo.AnnotationSet`
         """
-        annotation_set = self.api.get_annotation_set(annotation_set_id)
+        return self._cached(
+            ('annotation_set', annotation_set_id),
+            lambda: self.api.get_annotation_set(annotation_set_id),
+            lambda annotation_set: self._parse_annotation_set(annotation_set, annotation_set_id),
+        )
 
+    @staticmethod
+    def _parse_annotation_set(annotation_set: dict, annotation_set_id: int) -> AnnotationSet:
         if 'detail' in annotation_set:
             raise Exception(
                 'Annotation set with ID = {} not found. '
@@ -491,8 +929,139 @@ class SDK:
         )
         self._save_to_file(content, output_file)
 
-    def _save_to_file(self, content: bytes, output_file: str):
+    def export_annotations_to_arrow(
+        self,
+        annotation_set_id: int,
+        export_coordinates: str = 'pixel',
+        append_path: bool = False,
+        filter_by_tags: list = None
+    ):
+        """
+        Exports annotations to an Arrow table.
+        Annotations are exported in CSV format and parsed by Arrow while they are downloaded,
+        without creating Python objects for each annotation. Columns are the same as in the CSV export.
+
+        Args:
+            annotation_set_id: annotation set id
+            export_coordinates: converts output values to percentage or pixels, can be one of ['pixel', 'percent']. Default: 'pixel'
+            append_path: if True, appends the path to the filename (e.g. local path). Default: False
+            filter_by_tags: allows to export annotations only for images containing certain image tags. It can be of type List[str] or str. Default: None
+
+        Returns:
+            :class:`pyarrow.Table`
+        """
+        file = self.api.open_export_annotations(
+            annotation_set_id,
+            annotation_format='csv',
+            export_coordinates=export_coordinates,
+            full_path=append_path,
+            filter_by_tags=filter_by_tags
+        )
+        with file:
+            return arrow.open_csv_batches(file).read_all()
+
+    def export_annotations_to_parquet(
+        self,
+        output_file: str,
+        annotation_set_id: int,
+        export_coordinates: str = 'pixel',
+        append_path: bool = False,
+        filter_by_tags: list = None
+    ):
+        """
+        Exports annotations to a Parquet file.
+        Annotations are parsed by Arrow while they are downloaded and written to the file batch by batch,
+        so memory usage doesn't depend on the size of the annotation set.
+
+        Args:
+            output_file: output Parquet file path
+            annotation_set_id: annotation set id
+            export_coordinates: converts output values to percentage or pixels, can be one of ['pixel', 'percent']. Default: 'pixel'
+            append_path: if True, appends the path to the filename (e.g. local path). Default: False
+            filter_by_tags: allows to export annotations only for images containing certain image tags. It can be of type List[str] or str. Default: None
+        """
+        output_file = self._resolve_path(output_file)
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        file = self.api.open_export_annotations(
+            annotation_set_id,
+            annotation_format='csv',
+            export_coordinates=export_coordinates,
+            full_path=append_path,
+            filter_by_tags=filter_by_tags
+        )
+        with file:
+            reader = arrow.open_csv_batches(file)
+            arrow.write_parquet(reader, reader.schema, output_file)
+
+    def iter_exported_annotations(
+        self,
+        annotation_set_id: int,
+        export_coordinates: str = 'pixel',
+        append_path: bool = False,
+        filter_by_tags: list = None,
+        chunk_size: int = 64 * 1024
+    ) -> Iterator[dict]:
+        """
+        Exports annotations in JSON format and yields them image by image, while they are downloaded.
+        The export is parsed incrementally, so memory usage doesn't depend on the size of the annotation set.
+
+        Example::
+            for record in remo.iter_exported_annotations(annotation_set_id=1):
+                print(record['file_name'], len(record['annotations']))
+
+        Args:
+            annotation_set_id: annotation set id
+            export_coordinates: converts output values to percentage or pixels, can be one of ['pixel', 'percent']. Default: 'pixel'
+            append_path: if True, appends the path to the filename (e.g. local path). Default: False
+            filter_by_tags: allows to export annotations only for images containing certain image tags. It can be of type List[str] or str. Default: None
+            chunk_size: number of bytes read at once
+
+        Returns:
+            Iterator[dict] of image records, as in the JSON export
+
+        Raises:
+            :class:`remo.api.ExportError`: if the server doesn't return a JSON export
+        """
+        file = self.api.open_export_annotations(
+            annotation_set_id,
+            annotation_format='json',
+            export_coordinates=export_coordinates,
+            full_path=append_path,
+            filter_by_tags=filter_by_tags
+        )
+        with file:
+            try:
+                yield from JSONArrayStream(file, chunk_size)
+            except ValueError as err:
+                raise ExportError('Unexpected export content of annotation set {}: {}'.format(annotation_set_id, err))
+
+    def export_dataset_images_to_parquet(self, output_file: str, dataset_id: int, page_size: int = 1000):
+        """
+        Exports metadata of dataset images to a Parquet file.
+        Images are requested page by page, and each page is written to the file as an Arrow record batch.
+
+        Args:
+            output_file: output Parquet file path
+            dataset_id: dataset id
+            page_size: number of images requested at once
+        """
         output_file = self._resolve_path(output_file)
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+        # synced once, before pages are fetched concurrently
+        is_local = self._is_local(dataset_id)
+
+        def fetch_page(offset, limit):
+            if is_local:
+                return self.store.list_images(dataset_id, limit=limit, offset=offset).get('results', [])
+            return self.api.list_dataset_images(dataset_id, limit=limit, offset=offset).get('results', [])
+
+        pages = iter_pages(fetch_page, page_size)
+        arrow.write_parquet(arrow.image_batches(pages, dataset_id), arrow.image_schema(), output_file)
+
+    @staticmethod
+    def _save_to_file(content: bytes, output_file: str):
+        output_file = SDK._resolve_path(output_file)
         dir_path = os.path.dirname(output_file)
         os.makedirs(dir_path, exist_ok=True)
         with open(output_file, 'wb') as out_file:
@@ -540,9 +1109,16 @@ class SDK:
         if not img:
             return None
 
+        return self._parse_annotation_info(annotation_items, img.name)
+
+    @staticmethod
+    def _parse_annotation_info(annotation_items: list, img_filename: str) -> List[Annotation]:
+        """
+        Converts annotation info, as returned by the server, to list of annotations
+        """
         annotations = []
         for item in annotation_items:
-            annotation = Annotation(img_filename=img.name)
+            annotation = Annotation(img_filename=img_filename)
 
             if 'lower' in item:
                 annotation.classes = item.get('name')
@@ -566,21 +1142,86 @@ class SDK:
 
         return annotations
 
-    def list_annotations(self, dataset_id: int, annotation_set_id: int) -> List[Annotation]:
+    def list_annotations(
+        self, dataset_id: int, annotation_set_id: int, max_workers: int = 8, as_table: bool = False
+    ):
         """
-        Returns all annotations for a given annotation set
+        Returns all annotations for a given annotation set.
+
+        The whole annotation set is fetched in one request, by exporting it in JSON format.
+        If the export can't be used, annotations of each image are requested concurrently.
+        Image classes, in image classification, are returned as one annotation per class, as in :func:`list_image_annotations`.
 
         Args:
             dataset_id: dataset id
             annotation_set_id: annotation set id
+            max_workers: number of concurrent requests, if annotations are requested by image
+            as_table: if True, returns annotations as :class:`remo.AnnotationTable`, which requires numpy
 
         Returns:
-             List[:class:`remo.Annotation`]
+             List[:class:`remo.Annotation`] or :class:`remo.AnnotationTable`
         """
+        annotations = self._list_annotations(dataset_id, annotation_set_id, max_workers)
+        if not as_table:
+            return annotations
+
+        names = list({annotation.img_filename for annotation in annotations})
+        images = self.get_images_by_name(dataset_id, names)
+        image_ids = {name: img.id for name, img in zip(names, images) if img}
+        return AnnotationTable.from_annotations(annotations, image_ids)
+
+    def _list_annotations(self, dataset_id: int, annotation_set_id: int, max_workers: int) -> List[Annotation]:
+        try:
+            return self._parse_exported_annotations(self.iter_exported_annotations(annotation_set_id))
+        except ExportError:
+            # e.g. older servers without JSON export
+            pass
+
         images = self.list_dataset_images(dataset_id)
+
+        def image_annotations(img):
+            annotation_items = self.get_annotation_info(dataset_id, annotation_set_id, img.id)
+            return self._parse_annotation_info(annotation_items, img.name)
+
+        annotations = []
+        with ThreadPoolExecutor(max_workers) as ex:
+            for items in ex.map(image_annotations, images):
+                annotations += items
+        return annotations
+
+    @staticmethod
+    def _parse_exported_annotations(json_data: Iterable[dict]) -> List[Annotation]:
+        """
+        Converts annotation set exported in JSON format to list of annotations,
+        in the same shape as :func:`_parse_annotation_info`: one annotation for each image class,
+        and one for each object, with bounding box or segment
+
+        Raises:
+            ExportError: if the content is not an annotation export
+        """
+        if isinstance(json_data, (dict, str, bytes)):
+            raise ExportError('Unexpected export content')
+
         annotations = []
-        for img in images:
-            annotations += self.list_image_annotations(dataset_id, annotation_set_id, img.id)
+        for item in json_data:
+            if not isinstance(item, dict) or 'file_name' not in item:
+                raise ExportError('Unexpected export content')
+
+            img_filename = os.path.basename(item['file_name'])
+            for class_name in item.get('classes') or []:
+                annotations.append(Annotation(img_filename=img_filename, classes=class_name))
+
+            for obj in item.get('annotations', []):
+                annotation = Annotation(img_filename=img_filename, classes=obj.get('classes'))
+                bbox = obj.get('bbox')
+                segments = obj.get('segments')
+                if bbox:
+                    annotation.bbox = [bbox['xmin'], bbox['ymin'], bbox['xmax'], bbox['ymax']]
+                elif segments:
+                    # segments are exported as list of points ``{'x': ..., 'y': ...}``
+                    annotation.segment = [coord for point in segments for coord in (point['x'], point['y'])]
+                annotations.append(annotation)
+
         return annotations
 
     def create_annotation_set(
@@ -599,6 +1240,11 @@ class SDK:
             :class:`remo.AnnotationSet`
         """
         annotation_set = self.api.create_annotation_set(annotation_task, dataset_id, name, classes)
+        self._invalidate_dataset(dataset_id)
+        return self._parse_created_annotation_set(annotation_set)
+
+    @staticmethod
+    def _parse_created_annotation_set(annotation_set: dict) -> AnnotationSet:
         if 'error' in annotation_set:
             raise Exception(
                 'Error while creating an annotation set. Message:\n{}'.format(annotation_set['error'])
@@ -626,8 +1272,88 @@ class SDK:
         dataset_id = annotation_set.dataset_id
 
         annotation_info = self.get_annotation_info(dataset_id, annotation_set_id, image_id)
-        object_id = len(annotation_info)
+        classes, objects = self._prepare_annotations_payload(annotations, len(annotation_info))
+
+        result = self.api.add_annotation(
+            dataset_id, annotation_set_id, image_id, annotation_info, classes=classes, objects=objects
+        )
+        if self.cache:
+            self.cache.invalidate('annotation_set', annotation_set_id)
+            self.cache.invalidate('annotation_sets', dataset_id)
+        return result
+
+    def add_annotations_to_images(
+        self, annotation_set_id: int, annotations: List[Annotation], max_workers: int = 8
+    ) -> dict:
+        """
+        Adds annotations to many images at once.
+        Annotations are grouped by image file name, and images are annotated concurrently.
+        A failure on one image doesn't stop the others: failed images are reported in the result.
+
+        Example::
+            result = remo.add_annotations_to_images(annotation_set_id=1, annotations=predictions)
+            for img_filename, error in result['errors'].items():
+                print(img_filename, error)
+
+        Args:
+            annotation_set_id: annotation set id
+            annotations: list of annotations, with ``img_filename`` set
+            max_workers: maximum number of images annotated at the same time
+
+        Returns:
+            dictionary with number of ``annotated`` images and ``errors`` by image file name
+        """
+        annotation_set = self.get_annotation_set(annotation_set_id)
+        dataset_id = annotation_set.dataset_id
+
+        grouped = {}
+        for annotation in annotations:
+            grouped.setdefault(annotation.img_filename, []).append(annotation)
+
+        names = list(grouped)
+        images = dict(zip(names, self.get_images_by_name(dataset_id, names)))
+
+        def annotate(img_filename):
+            img = images[img_filename]
+            if not img:
+                return 'Image not found in dataset {}'.format(dataset_id)
+
+            try:
+                annotation_info = self.get_annotation_info(dataset_id, annotation_set_id, img.id)
+                classes, objects = self._prepare_annotations_payload(grouped[img_filename], len(annotation_info))
+                result = self.api.add_annotation(
+                    dataset_id, annotation_set_id, img.id, annotation_info, classes=classes, objects=objects
+                )
+            except Exception as err:
+                return str(err) or repr(err)
+
+            if isinstance(result, dict) and ('error' in result or 'detail' in result):
+                return result.get('error') or result.get('detail')
+
+        with ThreadPoolExecutor(max_workers) as ex:
+            errors = {name: error for name, error in zip(names, ex.map(annotate, names)) if error}
+
+        if self.cache:
+            self.cache.invalidate('annotation_set', annotation_set_id)
+            self.cache.invalidate('annotation_sets', dataset_id)
+
+        print('Annotated {} images'.format(len(names) - len(errors)))
+        if errors:
+            print('Failed to annotate {} images'.format(len(errors)))
+        return {'annotated': len(names) - len(errors), 'errors': errors}
+
+    @staticmethod
+    def _prepare_annotations_payload(annotations: List[Annotation], object_id: int = 0) -> (list, list):
+        """
+        Converts annotations to classes and objects, as expected by the server
+
+        Args:
+            annotations: list of annotations
+            object_id: position number of the first new object
 
+        Returns:
+            tuple of image classes and annotation objects
+        """
         objects = []
         classes = []
 
@@ -671,9 +1397,7 @@ class SDK:
                     {"name": cls, "lower": cls.lower(), "questionable": False} for cls in item.classes
                 ]
 
-        return self.api.add_annotation(
-            dataset_id, annotation_set_id, image_id, annotation_info, classes=classes, objects=objects
-        )
+        return classes, objects
 
     def list_annotation_set_classes(self, annotation_set_id: int) -> List[str]:
         """
@@ -685,8 +1409,18 @@ class SDK:
         Returns:
             list of classes
         """
-        classes_with_ids = self.api.list_annotation_set_classes(annotation_set_id)
-        return [item.get('name') for item in classes_with_ids]
+        if self.store is not None:
+            dataset_id = self.store.get_annotation_set_dataset_id(annotation_set_id)
+            if dataset_id is not None and self._is_local(dataset_id):
+                classes_with_ids = self.store.list_annotation_set_classes(annotation_set_id)
+                if classes_with_ids is not None:
+                    return [item.get('name') for item in classes_with_ids]
+
+        return self._cached(
+            ('annotation_set', annotation_set_id, 'classes'),
+            lambda: self.api.list_annotation_set_classes(annotation_set_id),
+            lambda classes_with_ids: [item.get('name') for item in classes_with_ids],
+        )
 
     def list_dataset_images(self, dataset_id: int, limit: int = None, offset: int = None) -> List[Image]:
         """
@@ -699,7 +1433,130 @@ class SDK:
         Returns:
              List[:class:`remo.Image`]
         """
-        json_data = self.api.list_dataset_images(dataset_id, limit=limit, offset=offset)
+        if self._is_local(dataset_id):
+            json_data = self.store.list_images(dataset_id, limit=limit, offset=offset)
+        else:
+            json_data = self.api.list_dataset_images(dataset_id, limit=limit, offset=offset)
+        return self._parse_dataset_images(json_data, dataset_id)
+
+    def get_image_by_name(self, dataset_id: int, img_filename: str) -> Image:
+        """
+        Retrieves image of the dataset by file name
+
+        Args:
+            dataset_id: dataset id
+            img_filename: image file name
+
+        Returns:
+            :class:`remo.Image` or None, if not found
+        """
+        return self.get_images_by_name(dataset_id, [img_filename])[0]
+
+    def get_images_by_name(self, dataset_id: int, img_filenames: List[str]) -> List[Image]:
+        """
+        Retrieves images of the dataset by file names.
+
+        Images are looked up in an index of the dataset images by name, built on first use and
+        rebuilt when data is added to the dataset, so many lookups cost as much as listing the dataset once.
+
+        Args:
+            dataset_id: dataset id
+            img_filenames: list of image file names
+
+        Returns:
+            List[:class:`remo.Image`] - images in the same order as file names, None for images not found
+        """
+        if self._is_local(dataset_id):
+            images = self._parse_dataset_images(
+                {'results': self.store.find_images(dataset_id, names=img_filenames)}, dataset_id
+            )
+            index = {img.name: img for img in images}
+        else:
+            index = self._image_index(dataset_id)
+        return [index.get(name) for name in img_filenames]
+
+    def list_dataset_tags(self, dataset_id: int) -> List[str]:
+        """
+        Lists tags of images within the dataset.
+        With local store, tags are read from the local copy, also when working offline.
+
+        Args:
+            dataset_id: dataset id
+
+        Returns:
+            sorted list of tags
+        """
+        if self._is_local(dataset_id):
+            return self.store.list_tags(dataset_id)
+
+        return sorted({tag for img in self._iter_dataset_images_json(dataset_id) for tag in img.get('tags') or []})
+
+    def list_images_by_tag(self, dataset_id: int, tag: str) -> List[Image]:
+        """
+        Lists images of the dataset with the given tag.
+        With local store, images are looked up in the local copy, also when working offline.
+
+        Args:
+            dataset_id: dataset id
+            tag: image tag
+
+        Returns:
+            List[:class:`remo.Image`]
+        """
+        if self._is_local(dataset_id):
+            images = self.store.find_images(dataset_id, tag=tag)
+        else:
+            images = [img for img in self._iter_dataset_images_json(dataset_id) if tag in (img.get('tags') or [])]
+        return self._parse_dataset_images({'results': images}, dataset_id)
+
+    def _iter_dataset_images_json(self, dataset_id: int, page_size: int = 1000) -> Iterator[dict]:
+        """
+        Iterates over images of the dataset as returned by the server, including fields not kept in :class:`remo.Image`
+        """
+
+        def fetch_page(offset, limit):
+            return self.api.list_dataset_images(dataset_id, limit=limit, offset=offset).get('results', [])
+
+        for page in iter_pages(fetch_page, page_size):
+            yield from page
+
+    def _image_index(self, dataset_id: int) -> dict:
+        """
+        Returns index of dataset images by file name
+        """
+        index = self._image_indexes.get(dataset_id)
+        if index is None:
+            with self._dataset_lock(dataset_id, 'index'):
+                index = self._image_indexes.get(dataset_id)
+                if index is None:
+                    index = {img.name: img for img in self.iter_dataset_images(dataset_id, page_size=1000)}
+                    self._image_indexes[dataset_id] = index
+        return index
+
+    def iter_dataset_images(
+        self, dataset_id: int, page_size: int = 100, max_pages_in_flight: int = 2, limit: int = None
+    ) -> Iterator[Image]:
+        """
+        Iterates over images within a dataset, loading them page by page.
+        While images of a page are consumed, next pages are fetched in background.
+
+        Args:
+            dataset_id: dataset id
+            page_size: number of images requested at once
+            max_pages_in_flight: maximum number of pages fetched ahead
+            limit: limits number of images. By default iterates over all images
+
+        Returns:
+            Iterator[:class:`remo.Image`]
+        """
+        def fetch_page(offset, limit):
+            return self.list_dataset_images(dataset_id, limit=limit, offset=offset)
+
+        for page in iter_pages(fetch_page, page_size, max_pages_in_flight, limit):
+            yield from page
+
+    @staticmethod
+    def _parse_dataset_images(json_data: dict, dataset_id: int) -> List[Image]:
         if 'error' in json_data:
             raise Exception(
                 'Failed to get all images for dataset ID = {}. Error message:\n: {}'.format(
@@ -720,7 +1577,181 @@ class SDK:
         Returns:
             image binary data
         """
-        return self.api.get_image_content(url)
+        if self.image_cache is None:
+            return self.api.get_image_content(url)
+
+        def read(path):
+            with open(path, 'rb') as file:
+                return file.read()
+
+        return self._use_cached_image(url, read)
+
+    def download_image(self, url: str, output_file: str, chunk_size: int = 1 << 20, link: str = 'copy') -> str:
+        """
+        Downloads image file to disk. The file is downloaded in chunks, without loading it in memory,
+        and written to a temporary file which is renamed when complete, so partial files are never left behind.
+        If image cache is enabled, the image is materialized from the cache, as set by ``link``.
+
+        Args:
+            url: image url
+            output_file: output file path
+            chunk_size: size of downloaded chunks, in bytes
+            link: how to materialize cached images, one of ``hardlink``, ``symlink``, ``reflink``, ``copy``.
+                Cached images are not hardlinked, so editing the output file can't change the cache:
+                ``hardlink`` makes a reflink, or a copy if not supported.
+                Symlinks point to read-only cached files, and break when the image is evicted from the cache.
+                See also: :func:`remo.utils.link_file`
+
+        Returns:
+            output file path
+        """
+        def write(tmp_file):
+            if self.image_cache is not None:
+                cache_link = 'reflink' if link == 'hardlink' else link
+                used = self._use_cached_image(url, lambda path: link_file(path, tmp_file, cache_link))
+                if used != 'symlink':
+                    # copies keep the read-only mode of cached files
+                    os.chmod(tmp_file, os.stat(tmp_file).st_mode | stat.S_IWUSR)
+            else:
+                with open(tmp_file, 'wb') as file:
+                    for chunk in self.api.iter_image_content(url, chunk_size):
+                        file.write(chunk)
+
+        return self._write_atomically(output_file, write)
+
+    @staticmethod
+    def _write_atomically(output_file: str, write) -> str:
+        """
+        Calls ``write`` with a temporary file path, then renames the temporary file to ``output_file``
+
+        Returns:
+            output file path
+        """
+        # only the folder is resolved: if the output file is a symlink, e.g. from an earlier ``link='symlink'``,
+        # the link itself is replaced, and its target is left untouched
+        dir_path, name = os.path.split(os.path.expanduser(output_file))
+        output_file = os.path.join(os.path.abspath(dir_path), name)
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        tmp_file = '{}.{}.part'.format(output_file, threading.get_ident())
+        try:
+            write(tmp_file)
+            os.replace(tmp_file, output_file)
+            # renaming a hardlink over another hardlink of the same file does nothing
+            if os.path.lexists(tmp_file):
+                os.remove(tmp_file)
+        except BaseException:
+            if os.path.lexists(tmp_file):
+                os.remove(tmp_file)
+            raise
+        return output_file
+
+    def download_images(
+        self,
+        images: Iterable[Image],
+        output_dir: str,
+        max_workers: int = 8,
+        overwrite: bool = False,
+        link: str = 'copy',
+    ) -> dict:
+        """
+        Downloads many images to a folder concurrently.
+        Images which already exist in the folder with the same size are skipped, unless ``overwrite`` is set,
+        so an interrupted download can be run again to complete it.
+        Each file is written atomically, so partially downloaded files are never left in the folder.
+
+        Images added from local files, and cached images, can be linked instead of copied with ``link``,
+        e.g. to build train and validation folders without using more disk space.
+        If a link can't be created, e.g. a hardlink across filesystems, it falls back to reflink and then to copy.
+
+        Example::
+            images = remo.iter_search_images(dataset_id=1, classes='Dog')
+            remo.download_images(images, './dogs', max_workers=16)
+
+        Args:
+            images: images to download, e.g. results of :func:`iter_search_images`. Can be any iterable
+            output_dir: output folder
+            max_workers: maximum number of images downloaded at the same time
+            overwrite: if True, downloads also images which already exist in the folder
+            link: how to materialize local and cached images, one of ``hardlink``, ``symlink``, ``reflink``, ``copy``.
+                See also: :func:`remo.utils.link_file`
+
+        Returns:
+            dictionary with number of ``downloaded`` and ``skipped`` images, ``bytes`` downloaded,
+            ``seconds`` taken and ``errors`` by image file name
+        """
+        output_dir = self._resolve_path(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+        result = {'downloaded': 0, 'skipped': 0, 'bytes': 0, 'seconds': 0, 'errors': {}}
+
+        def download(img):
+            output_file = os.path.join(output_dir, img.name)
+            if not overwrite and img.size is not None and os.path.isfile(output_file):
+                if os.path.getsize(output_file) == img.size:
+                    return img, None, None
+
+            try:
+                if img.path:
+                    self._write_atomically(output_file, lambda tmp_file: link_file(img.path, tmp_file, link))
+                else:
+                    self.download_image(img.url, output_file, link=link)
+                return img, os.path.getsize(output_file), None
+            except Exception as err:
+                return img, None, err
+
+        def collect(future):
+            img, size, err = future.result()
+            if err is not None:
+                result['errors'][img.name] = str(err)
+            elif size is None:
+                result['skipped'] += 1
+            else:
+                result['downloaded'] += 1
+                result['bytes'] += size
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers) as ex:
+            in_flight = deque()
+            for img in images:
+                # keeps memory bounded when images come from a long iterator
+                if len(in_flight) >= 4 * max_workers:
+                    collect(in_flight.popleft())
+                in_flight.append(ex.submit(download, img))
+            for future in in_flight:
+                collect(future)
+
+        result['seconds'] = time.monotonic() - start
+        print(
+            'Downloaded {} images, {:.1f} MB in {:.1f}s ({:.1f} MB/s). Skipped {} existing images'.format(
+                result['downloaded'],
+                result['bytes'] / 2 ** 20,
+                result['seconds'],
+                result['bytes'] / 2 ** 20 / max(result['seconds'], 1e-6),
+                result['skipped'],
+            )
+        )
+        if result['errors']:
+            print('Failed to download {} images'.format(len(result['errors'])))
+        return result
+
+    def _cached_image_path(self, url: str) -> str:
+        """
+        Returns path of image in the image cache, downloading it first if it's not cached
+        """
+        key = '{}|{}'.format(self.api.server, url)
+        return self.image_cache.get(key) or self.image_cache.put(key, self.api.iter_image_content(url))
+
+    def _use_cached_image(self, url: str, use):
+        """
+        Calls ``use`` with path of image in the image cache. If the file is evicted by another thread or process
+        between lookup and use, the image is downloaded again
+
+        Returns:
+            result of ``use``
+        """
+        try:
+            return use(self._cached_image_path(url))
+        except FileNotFoundError:
+            return use(self._cached_image_path(url))
 
     def get_image(self, image_id: int) -> Image:
         """
@@ -732,7 +1763,17 @@ class SDK:
         Returns:
             :class:`remo.Image`
         """
-        json_data = self.api.get_image(image_id)
+        if self.offline:
+            return self._parse_image(self.store.get_image(image_id), image_id)
+
+        return self._cached(
+            ('image', image_id),
+            lambda: self.api.get_image(image_id),
+            lambda json_data: self._parse_image(json_data, image_id),
+        )
+
+    @staticmethod
+    def _parse_image(json_data: dict, image_id: int) -> Image:
         if 'error' in json_data:
             raise Exception(
                 'Failed to get image by ID = {}. Error message:\n: {}'.format(
@@ -772,6 +1813,76 @@ class SDK:
             List[:class:`remo.AnnotatedImage`]
         """
 
+        annotation_sets_id = self._search_annotation_sets(
+            dataset_id, annotation_sets_id, classes, classes_not, tags, tags_not
+        )
+
+        json_data = self.api.search_images(
+            dataset_id,
+            annotation_sets=annotation_sets_id,
+            classes=classes, classes_not=classes_not,
+            tags=tags, tags_not=tags_not,
+            image_name_contains=image_name_contains,
+            limit=limit)
+        return self._parse_search_results(json_data, dataset_id)
+
+    def iter_search_images(
+            self,
+            dataset_id: int,
+            annotation_sets_id: int = None,
+            classes: str = None, classes_not: str = None,
+            tags: str = None, tags_not: str = None,
+            image_name_contains: str = None,
+            limit: int = None,
+            page_size: int = None,
+            max_pages_in_flight: int = 4,
+    ) -> Iterator[AnnotatedImage]:
+        """
+        Search images by classes and tags, yielding images as soon as they arrive, while next pages are fetched in background.
+        Use it instead of :func:`search_images` to start processing results before the search finishes.
+
+        Example::
+            for image in remo.iter_search_images(dataset_id=1, classes=["dog","person"]):
+                image.save_to('./dogs')
+
+        Args:
+            dataset_id: the ID of the dataset to search into
+            annotation_sets_id: the annotation sets ID to search into (can be multiple, e.g. [1, 2]). No need to specify it if the dataset has only one annotation set
+            classes: string or list of strings - search for images which have objects of all the given classes
+            classes_not: string or list of strings - search for images excluding those that have objects of all the given classes
+            tags: string or list of strings - search for images having all the given tags
+            tags_not: string or list of strings - search for images excluding those that have all the given tags
+            image_name_contains: search for images whose name contains the given string
+            limit: limits number of search results (by default returns all results)
+            page_size: number of results per page. By default it adapts to server response time
+            max_pages_in_flight: maximum number of pages requested at the same time
+
+        Returns:
+            Iterator[:class:`remo.AnnotatedImage`]
+        """
+        annotation_sets_id = self._search_annotation_sets(
+            dataset_id, annotation_sets_id, classes, classes_not, tags, tags_not
+        )
+
+        results = self.api.iter_search_images(
+            dataset_id,
+            annotation_sets=annotation_sets_id,
+            classes=classes, classes_not=classes_not,
+            tags=tags, tags_not=tags_not,
+            image_name_contains=image_name_contains,
+            limit=limit,
+            page_size=page_size,
+            max_pages_in_flight=max_pages_in_flight)
+
+        for entry in results:
+            yield from self._parse_search_results([entry], dataset_id)
+
+    def _search_annotation_sets(
+        self, dataset_id: int, annotation_sets_id, classes, classes_not, tags, tags_not
+    ):
+        """
+        Returns annotation sets to search into. If not specified, and the dataset has only one annotation set, uses that one.
+        """
         if not isinstance(dataset_id, int):
             raise Exception("Enter a valid dataset_id to search into")
             
@@ -788,16 +1899,11 @@ class SDK:
 
             elif len(annotation_sets) == 1:
                 annotation_sets_id = annotation_sets[0].id
-                
 
-        json_data = self.api.search_images(
-            dataset_id,
-            annotation_sets=annotation_sets_id,
-            classes=classes, classes_not=classes_not,
-            tags=tags, tags_not=tags_not,
-            image_name_contains=image_name_contains,
-            limit=limit)
+        return annotation_sets_id
 
+    @staticmethod
+    def _parse_search_results(json_data: list, dataset_id: int) -> List[AnnotatedImage]:
         result = []
         for entry in json_data:
             img_json = entry.get('image', {})
@@ -0,0 +1,326 @@
+import json
+import sqlite3
+import threading
+from typing import List
+
+from .config import remo_home_path
+from .utils import iter_pages
+
+
+class MetadataStore:
+    """
+    Local copy of datasets, images, annotation sets, classes and tags metadata, used to browse datasets
+    without going back to the server, also when the server is not reachable.
+
+    Data is kept in ``REMO_HOME/metadata.sqlite3``, separately for each server, and stored as returned by the server,
+    so it can be parsed by the same code as server responses.
+
+    Sync is incremental: images of a dataset are downloaded again only if the dataset ``updated_at`` or
+    number of images changed, and classes of an annotation set only if the annotation set ``updated_at`` changed.
+
+    Args:
+        server: server address, used to keep data of different servers apart
+        path: location of the database. By default is stored in remo home
+    """
+
+    name = 'metadata.sqlite3'
+
+    def __init__(self, server: str, path: str = None):
+        self.server = server
+        self.path = path or remo_home_path(self.name)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS datasets '
+                '(server TEXT, id INTEGER, json TEXT, synced_version TEXT, PRIMARY KEY (server, id))'
+            )
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS images '
+                '(server TEXT, dataset_id INTEGER, id INTEGER, name TEXT, json TEXT, PRIMARY KEY (server, id))'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS images_by_name ON images (server, dataset_id, name)')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS image_tags '
+                '(server TEXT, dataset_id INTEGER, image_id INTEGER, tag TEXT)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS image_tags_by_tag ON image_tags (server, dataset_id, tag)')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS annotation_sets '
+                '(server TEXT, id INTEGER, dataset_id INTEGER, updated_at TEXT, json TEXT, classes TEXT, '
+                'PRIMARY KEY (server, id))'
+            )
+
+    def close(self):
+        self._db.close()
+
+    @staticmethod
+    def _version(dataset: dict) -> str:
+        return '{}:{}'.format(dataset.get('updated_at'), dataset.get('quantity'))
+
+    def save_datasets(self, datasets: List[dict], complete: bool = True):
+        """
+        Stores datasets, as returned by the server
+
+        Args:
+            datasets: list of datasets
+            complete: if True, datasets not in the list are removed, with their images and annotation sets
+        """
+        if complete:
+            ids = {ds['id'] for ds in datasets}
+            for dataset_id in set(self._dataset_ids()) - ids:
+                self.remove_dataset(dataset_id)
+
+        with self._lock, self._db:
+            for ds in datasets:
+                self._db.execute(
+                    'INSERT OR IGNORE INTO datasets (server, id) VALUES (?, ?)', (self.server, ds['id'])
+                )
+                self._db.execute(
+                    'UPDATE datasets SET json = ? WHERE server = ? AND id = ?', (json.dumps(ds), self.server, ds['id'])
+                )
+
+    def _dataset_ids(self) -> List[int]:
+        with self._lock:
+            rows = self._db.execute('SELECT id FROM datasets WHERE server = ?', (self.server,)).fetchall()
+        return [row[0] for row in rows]
+
+    def list_datasets(self) -> dict:
+        """
+        Returns stored datasets, in the same format as :func:`remo.api.API.list_datasets`
+        """
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT json FROM datasets WHERE server = ? ORDER BY id', (self.server,)
+            ).fetchall()
+        return {'results': [json.loads(row[0]) for row in rows]}
+
+    def get_dataset(self, dataset_id: int) -> dict:
+        """
+        Returns stored dataset, in the same format as :func:`remo.api.API.get_dataset`
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT json FROM datasets WHERE server = ? AND id = ?', (self.server, dataset_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else {'detail': 'Not found.'}
+
+    def is_synced(self, dataset_id: int) -> bool:
+        """
+        Checks if images and annotation sets of the dataset were stored
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT synced_version FROM datasets WHERE server = ? AND id = ?', (self.server, dataset_id)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def sync_dataset(self, api, dataset_id: int, page_size: int = 1000) -> bool:
+        """
+        Updates stored dataset, with its images and annotation sets, from the server.
+        Annotation sets are updated one by one, while images are downloaded again all together
+        whenever the dataset changed, as the server doesn't report which images changed.
+        Datasets without ``updated_at`` are downloaded again on every sync.
+
+        Args:
+            api: :class:`remo.api.API` connected to the server
+            dataset_id: dataset id
+            page_size: number of images requested at once
+
+        Returns:
+            True if images were downloaded again, False if they were up to date
+        """
+        dataset = api.get_dataset(dataset_id)
+        if 'id' not in dataset:
+            self.remove_dataset(dataset_id)
+            return False
+
+        self.save_datasets([dataset], complete=False)
+        self._sync_annotation_sets(api, dataset_id)
+
+        with self._lock:
+            row = self._db.execute(
+                'SELECT synced_version FROM datasets WHERE server = ? AND id = ?', (self.server, dataset_id)
+            ).fetchone()
+        version = self._version(dataset)
+        if row[0] == version and dataset.get('updated_at'):
+            return False
+
+        def fetch_page(offset, limit):
+            return api.list_dataset_images(dataset_id, limit=limit, offset=offset).get('results', [])
+
+        images = [img for page in iter_pages(fetch_page, page_size) for img in page]
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM images WHERE server = ? AND dataset_id = ?', (self.server, dataset_id))
+            self._db.execute('DELETE FROM image_tags WHERE server = ? AND dataset_id = ?', (self.server, dataset_id))
+            self._db.executemany(
+                'INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?)',
+                [(self.server, dataset_id, img['id'], img.get('name'), json.dumps(img)) for img in images],
+            )
+            self._db.executemany(
+                'INSERT INTO image_tags VALUES (?, ?, ?, ?)',
+                [
+                    (self.server, dataset_id, img['id'], tag)
+                    for img in images
+                    for tag in img.get('tags') or []
+                ],
+            )
+            self._db.execute(
+                'UPDATE datasets SET synced_version = ? WHERE server = ? AND id = ?',
+                (version, self.server, dataset_id),
+            )
+        return True
+
+    def _sync_annotation_sets(self, api, dataset_id: int):
+        annotation_sets = api.list_annotation_sets(dataset_id).get('results', [])
+        with self._lock:
+            stored = {
+                row[0]: row[1:]
+                for row in self._db.execute(
+                    'SELECT id, updated_at, classes FROM annotation_sets WHERE server = ? AND dataset_id = ?',
+                    (self.server, dataset_id),
+                )
+            }
+
+        rows = []
+        for annotation_set in annotation_sets:
+            updated_at, classes = stored.get(annotation_set['id'], (None, None))
+            if not updated_at or updated_at != annotation_set.get('updated_at'):
+                classes = json.dumps(api.list_annotation_set_classes(annotation_set['id']))
+            rows.append((annotation_set, classes))
+
+        with self._lock, self._db:
+            ids = {annotation_set['id'] for annotation_set in annotation_sets}
+            for annotation_set_id in set(stored) - ids:
+                self._db.execute(
+                    'DELETE FROM annotation_sets WHERE server = ? AND id = ?', (self.server, annotation_set_id)
+                )
+            for annotation_set, classes in rows:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO annotation_sets VALUES (?, ?, ?, ?, ?, ?)',
+                    (
+                        self.server,
+                        annotation_set['id'],
+                        dataset_id,
+                        annotation_set.get('updated_at'),
+                        json.dumps(annotation_set),
+                        classes,
+                    ),
+                )
+
+    def list_images(self, dataset_id: int, limit: int = None, offset: int = None) -> dict:
+        """
+        Returns stored images of the dataset, in the same format as :func:`remo.api.API.list_dataset_images`
+        """
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT json FROM images WHERE server = ? AND dataset_id = ? ORDER BY id LIMIT ? OFFSET ?',
+                (self.server, dataset_id, limit if limit is not None else -1, offset or 0),
+            ).fetchall()
+        return {'results': [json.loads(row[0]) for row in rows]}
+
+    def find_images(self, dataset_id: int, names: List[str] = None, tag: str = None) -> List[dict]:
+        """
+        Finds stored images of the dataset by file name or by tag
+
+        Args:
+            dataset_id: dataset id
+            names: list of image file names
+            tag: image tag
+
+        Returns:
+            list of images
+        """
+        query = 'SELECT json FROM images WHERE server = ? AND dataset_id = ?'
+        params = [self.server, dataset_id]
+        if tag is not None:
+            query += ' AND id IN (SELECT image_id FROM image_tags WHERE server = ? AND dataset_id = ? AND tag = ?)'
+            params += [self.server, dataset_id, tag]
+
+        if names is None:
+            batches = [[]]
+        else:
+            # keeps number of query parameters below SQLite limit
+            names = list(names)
+            batches = [names[i:i + 500] for i in range(0, len(names), 500)]
+
+        images = []
+        with self._lock:
+            for batch in batches:
+                batch_query = query
+                if names is not None:
+                    batch_query += ' AND name IN ({})'.format(', '.join('?' * len(batch)))
+                rows = self._db.execute(batch_query + ' ORDER BY id', params + batch).fetchall()
+                images += [json.loads(row[0]) for row in rows]
+        return images
+
+    def get_image(self, image_id: int) -> dict:
+        """
+        Returns stored image, in the same format as :func:`remo.api.API.get_image`
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT json FROM images WHERE server = ? AND id = ?', (self.server, image_id)
+            ).fetchone()
+        if not row:
+            return {'error': 'Image not found in local store'}
+        return json.loads(row[0])
+
+    def list_tags(self, dataset_id: int) -> List[str]:
+        """
+        Returns tags of images in the dataset
+        """
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT DISTINCT tag FROM image_tags WHERE server = ? AND dataset_id = ? ORDER BY tag',
+                (self.server, dataset_id),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def list_annotation_sets(self, dataset_id: int) -> dict:
+        """
+        Returns stored annotation sets of the dataset, in the same format as :func:`remo.api.API.list_annotation_sets`
+        """
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT json FROM annotation_sets WHERE server = ? AND dataset_id = ? ORDER BY id',
+                (self.server, dataset_id),
+            ).fetchall()
+        return {'results': [json.loads(row[0]) for row in rows]}
+
+    def list_annotation_set_classes(self, annotation_set_id: int) -> list:
+        """
+        Returns stored classes of the annotation set, in the same format as :func:`remo.api.API.list_annotation_set_classes`,
+        or None if the annotation set is not stored
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT classes FROM annotation_sets WHERE server = ? AND id = ?', (self.server, annotation_set_id)
+            ).fetchone()
+        if row and row[0]:
+            return json.loads(row[0])
+
+    def get_annotation_set_dataset_id(self, annotation_set_id: int) -> int:
+        """
+        Returns dataset id of the stored annotation set, or None if the annotation set is not stored
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT dataset_id FROM annotation_sets WHERE server = ? AND id = ?', (self.server, annotation_set_id)
+            ).fetchone()
+        return row[0] if row else None
+
+    def remove_dataset(self, dataset_id: int):
+        """
+        Removes stored dataset with its images and annotation sets
+        """
+        with self._lock, self._db:
+            for table, column in (
+                ('datasets', 'id'),
+                ('images', 'dataset_id'),
+                ('image_tags', 'dataset_id'),
+                ('annotation_sets', 'dataset_id'),
+            ):
+                self._db.execute(
+                    'DELETE FROM {} WHERE server = ? AND {} = ?'.format(table, column), (self.server, dataset_id)
+                )
@@ -0,0 +1,103 @@
+import hashlib
+import os
+import tempfile
+
+from .config import remo_home_path
+
+
+class _FileLock:
+    """
+    Exclusive lock on a file, shared by all processes on the machine. Blocks until the lock is acquired
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, 'a+')
+        if os.name == 'nt':
+            import msvcrt
+
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after 10 seconds
+                    continue
+        else:
+            import fcntl
+
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if os.name == 'nt':
+            import msvcrt
+
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+
+class TokenCache:
+    """
+    Auth tokens shared by all processes of the same user on the machine, so that many short-lived workers
+    reuse one token instead of logging in one by one.
+
+    Tokens are stored in ``REMO_HOME/tokens``, one file per server and user, readable only by the owner.
+    Files are replaced atomically, so they can be read without locking, and :func:`lock` is held while logging in,
+    so when a token expires only one process logs in again and the others pick up the new token.
+
+    Args:
+        path: tokens folder. By default is ``REMO_HOME/tokens``
+    """
+
+    dir_name = 'tokens'
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.dirname(remo_home_path(self.dir_name, 'tokens'))
+        os.makedirs(self.path, exist_ok=True)
+
+    def _key_path(self, server: str, email: str) -> str:
+        key = '{}|{}'.format(server.rstrip('/'), email)
+        return os.path.join(self.path, hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    def get(self, server: str, email: str) -> str:
+        """
+        Returns cached token, or None if there is no token for the server and user
+        """
+        try:
+            with open(self._key_path(server, email)) as file:
+                return file.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def set(self, server: str, email: str, token: str):
+        """
+        Stores token for the server and user
+        """
+        path = self._key_path(server, email)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.part')
+        try:
+            # mkstemp creates files readable only by the owner
+            with os.fdopen(fd, 'w') as file:
+                file.write(token)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def lock(self, server: str, email: str) -> _FileLock:
+        """
+        Returns exclusive lock for the server and user, to be used as context manager while logging in
+        """
+        return _FileLock(self._key_path(server, email) + '.lock')
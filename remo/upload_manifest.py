@@ -0,0 +1,132 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+
+from .config import remo_home_path
+
+
+class UploadManifest:
+    """
+    On-disk checkpoint of an upload session, used to resume interrupted uploads.
+
+    The manifest is stored in ``REMO_HOME/uploads/<dataset_id>_<session_id>.jsonl``.
+    It's an append-only log: the first line identifies the upload, following lines record
+    how files were split in groups, which groups were uploaded, with their results, and which upload steps are done.
+    Appending keeps the cost of each checkpoint constant, no matter how many files the upload has.
+
+    Args:
+        dataset_id: dataset id
+        session_id: upload session id
+        fingerprint: identifies the upload request, so only the same request can be resumed
+    """
+
+    dir_name = 'uploads'
+
+    def __init__(self, dataset_id: int, session_id: str, fingerprint: str = None):
+        self.dataset_id = dataset_id
+        self.session_id = session_id
+        self.fingerprint = fingerprint
+        self.groups = None
+        self.results = {}
+        self.steps = set()
+        self.path = remo_home_path(self.dir_name, '{}_{}.jsonl'.format(dataset_id, session_id))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint_of(**params) -> str:
+        """
+        Computes fingerprint of upload request parameters
+        """
+        content = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def find(cls, dataset_id: int, fingerprint: str):
+        """
+        Finds the latest manifest for the given dataset and upload request
+
+        Returns:
+            :class:`UploadManifest` or None
+        """
+        pattern = remo_home_path(cls.dir_name, '{}_*.jsonl'.format(dataset_id))
+        paths = sorted(glob.glob(pattern), key=os.path.getmtime, reverse=True)
+        for path in paths:
+            manifest = cls.load(path)
+            if manifest and manifest.fingerprint == fingerprint:
+                return manifest
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Loads manifest from file
+
+        Returns:
+            :class:`UploadManifest` or None, if the file is not a valid manifest
+        """
+        manifest = None
+        with open(path) as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # last line may be incomplete, if the process was killed while writing it
+                    break
+
+                if manifest is None:
+                    if 'session_id' not in record:
+                        return None
+                    manifest = cls(record['dataset_id'], record['session_id'], record.get('fingerprint'))
+                elif 'groups' in record:
+                    manifest.groups = record['groups']
+                elif 'group' in record:
+                    manifest.results[record['group']] = record.get('result')
+                elif 'step' in record:
+                    manifest.steps.add(record['step'])
+        return manifest
+
+    def _append(self, record: dict):
+        with self._lock:
+            is_new = not os.path.exists(self.path)
+            with open(self.path, 'a') as file:
+                if is_new:
+                    header = {'dataset_id': self.dataset_id, 'session_id': self.session_id, 'fingerprint': self.fingerprint}
+                    file.write(json.dumps(header) + '\n')
+                file.write(json.dumps(record, default=str) + '\n')
+                file.flush()
+                os.fsync(file.fileno())
+
+    def set_groups(self, groups: list):
+        """
+        Records how files are split in upload groups
+        """
+        self.groups = groups
+        self._append({'groups': groups})
+
+    def is_group_done(self, index: int) -> bool:
+        return index in self.results
+
+    def mark_group_done(self, index: int, result):
+        """
+        Records successful upload of a group
+        """
+        self.results[index] = result
+        self._append({'group': index, 'result': result})
+
+    def is_step_done(self, step: str) -> bool:
+        return step in self.steps
+
+    def mark_step_done(self, step: str):
+        """
+        Records that an upload step, e.g. ``'local_files'`` or ``'urls'``, is completed
+        """
+        self.steps.add(step)
+        self._append({'step': step})
+
+    def remove(self):
+        """
+        Deletes manifest file, once the upload session is completed
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
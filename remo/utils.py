@@ -1,4 +1,8 @@
 import os
+import shutil
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 IMAGE_EXTENSIONS = {'.jpeg', '.jpg', '.png', '.tiff', '.tif'}
 ANNOTATION_EXTENSIONS = {'.csv', '.xml', '.json'}
@@ -78,3 +82,152 @@ class FileResolver:
             for name in filenames:
                 file_path = os.path.join(dirpath, name)
                 self._check_file(file_path)
+
+
+def iter_pages(
+    fetch_page,
+    page_size: int,
+    max_pages_in_flight: int = 2,
+    limit: int = None,
+    offset: int = 0,
+    adapt_page_size=None,
+):
+    """
+    Iterates over paginated results, fetching next pages in background threads.
+
+    Pages are requested by offset, up to ``max_pages_in_flight`` at a time, and yielded in order.
+    Iteration stops at the first empty page, or once ``limit`` items are fetched.
+
+    A page shorter than requested doesn't end the iteration, as the server may cap page size:
+    the rest of the requested range is fetched again, and page size is never increased above
+    the largest page the server returned.
+
+    Args:
+        fetch_page: function ``fetch_page(offset, limit) -> list`` returning one page
+        page_size: number of items per page
+        max_pages_in_flight: maximum number of pages fetched or waiting to be consumed at the same time
+        limit: maximum number of items to fetch. None means all
+        offset: offset of the first page
+        adapt_page_size: optional function ``adapt_page_size(page_size, elapsed) -> int``,
+            called with size and fetch time in seconds of each received page, which returns size of next pages
+
+    Returns:
+        generator of pages
+    """
+    max_pages_in_flight = max(1, max_pages_in_flight)
+    end = None if limit is None else offset + limit
+    # largest page returned by the server, known once a page is shorter than requested
+    max_page_size = None
+    pending = deque()
+
+    def timed_fetch_page(offset, size):
+        start = time.monotonic()
+        page = fetch_page(offset, size)
+        return page, time.monotonic() - start
+
+    with ThreadPoolExecutor(max_pages_in_flight) as ex:
+
+        def fetch(page_offset, size):
+            return page_offset, size, ex.submit(timed_fetch_page, page_offset, size)
+
+        def submit():
+            nonlocal offset
+            size = page_size if end is None else min(page_size, end - offset)
+            if size > 0:
+                pending.append(fetch(offset, size))
+                offset += size
+
+        try:
+            for _ in range(max_pages_in_flight):
+                submit()
+
+            while pending:
+                page_offset, size, future = pending.popleft()
+                page, elapsed = future.result()
+                if not page:
+                    return
+
+                yield page
+                if len(page) < size:
+                    # last page, or page size capped by the server: requests the rest of the range,
+                    # before pages already in flight
+                    max_page_size = max(len(page), max_page_size or 0)
+                    page_size = min(page_size, max_page_size)
+                    pending.appendleft(fetch(page_offset + len(page), size - len(page)))
+                    continue
+
+                if adapt_page_size:
+                    page_size = adapt_page_size(size, elapsed)
+                    if max_page_size:
+                        page_size = min(page_size, max_page_size)
+                submit()
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+
+
+LINK_MODES = ('hardlink', 'symlink', 'reflink', 'copy')
+
+# Linux ioctl to clone file extents, supported by btrfs, xfs and other copy-on-write filesystems
+_FICLONE = 0x40049409
+
+
+def _reflink(src: str, dst: str):
+    import fcntl
+
+    with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+        try:
+            fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+        except OSError:
+            dst_file.close()
+            os.remove(dst)
+            raise
+
+
+def link_file(src: str, dst: str, link: str = 'copy') -> str:
+    """
+    Materializes file ``src`` at ``dst`` without copying its content, if possible.
+
+    - ``hardlink``: ``dst`` is another name of the same file. Needs both paths on the same filesystem
+    - ``symlink``: ``dst`` points to ``src``, and breaks if ``src`` is moved or removed
+    - ``reflink``: ``dst`` is a copy-on-write clone, which shares data blocks with ``src`` until one is modified.
+      Needs a filesystem which supports it, e.g. btrfs or xfs
+    - ``copy``: copies file content
+
+    If the requested mode is not supported, e.g. hardlink across filesystems, it falls back to
+    reflink and then to copy.
+
+    Args:
+        src: existing file
+        dst: path of the new file, which must not exist
+        link: one of ``hardlink``, ``symlink``, ``reflink``, ``copy``
+
+    Returns:
+        link mode actually used
+    """
+    if link not in LINK_MODES:
+        raise Exception('Invalid link mode {!r}. Use one of: {}'.format(link, ', '.join(LINK_MODES)))
+
+    if link == 'hardlink':
+        try:
+            os.link(src, dst)
+            return link
+        except (OSError, AttributeError):
+            link = 'reflink'
+
+    elif link == 'symlink':
+        try:
+            os.symlink(os.path.abspath(src), dst)
+            return link
+        except (OSError, NotImplementedError):
+            link = 'reflink'
+
+    if link == 'reflink':
+        try:
+            _reflink(src, dst)
+            return link
+        except (OSError, ImportError):
+            pass
+
+    shutil.copy(src, dst)
+    return 'copy'
@@ -14,6 +14,11 @@ setup(
         'filetype>=1.0.5',
         'requests>=2.21.0',
     ],
+    extras_require={
+        'async': ['aiohttp>=3.6'],
+        'numpy': ['numpy>=1.16'],
+        'arrow': ['pyarrow>=1.0'],
+    },
     classifiers=[
         'Development Status :: 3 - Alpha',
 
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from remo.api import API
+
+
+class FakeResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.text = json.dumps(data)
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeServer:
+    """
+    Upload endpoints of the server. Multipart uploads get queued responses, or 200 if none is queued
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.calls = []
+        self.sessions = {}
+
+    def respond(self, status_code, data):
+        self.responses.append(FakeResponse(status_code, data))
+
+    def create_session(self, dataset_id):
+        session_id = 'session-{}'.format(len(self.sessions) + 1)
+        self.sessions[session_id] = 'not complete'
+        self.calls.append(('new', session_id))
+        return session_id
+
+    def complete_session(self, session_id):
+        self.sessions[session_id] = 'pending'
+        self.calls.append(('complete', session_id))
+
+    def session_status(self, session_id):
+        return {'status': self.sessions[session_id]}
+
+    def upload(self, url, encoder):
+        self.calls.append(('upload', url))
+        return self.responses.pop(0) if self.responses else FakeResponse(200, {'files': 1})
+
+
+@pytest.fixture
+def remo_home(tmp_path, monkeypatch):
+    home = tmp_path / 'home'
+    home.mkdir()
+    monkeypatch.setenv('REMO_HOME', str(home))
+    return home
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / 'image.jpg'
+    path.write_bytes(b'\xff\xd8\xff' + b'0' * 100)
+    return str(path)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeServer()
+    monkeypatch.setattr(API, 'login', lambda self: None)
+    monkeypatch.setattr(API, 'create_new_upload_session', lambda self, dataset_id: server.create_session(dataset_id))
+    monkeypatch.setattr(API, 'complete_upload_session', lambda self, session_id: server.complete_session(session_id))
+    monkeypatch.setattr(API, 'get_upload_session_status', lambda self, session_id: server.session_status(session_id))
+    monkeypatch.setattr(API, '_post_multipart', lambda self, url, encoder: server.upload(url, encoder))
+    return server
+
+
+@pytest.fixture
+def api(server):
+    return API('http://localhost:8123', 'user@remo.ai', 'password', login=False)
@@ -0,0 +1,16 @@
+from remo.domain import Annotation
+from remo.domain.annotation import Segment
+
+
+def test_segment_points_from_coordinates():
+    segment = Segment([1, 2, 3, 4, 5, 6])
+    assert segment.points == [{'x': 1, 'y': 2}, {'x': 3, 'y': 4}, {'x': 5, 'y': 6}]
+
+
+def test_segment_points_setter_updates_coordinates():
+    annotation = Annotation('image.png', 'Dog')
+    annotation.segment = [1, 2, 3, 4, 5, 6]
+    annotation.segment.points = [{'x': 10, 'y': 20}, {'x': 30, 'y': 40}, {'x': 50, 'y': 60}]
+    assert annotation.segment.coordinates == [10, 20, 30, 40, 50, 60]
+    assert annotation.coordinates == [10, 20, 30, 40, 50, 60]
+    assert annotation.segment.points[1] == {'x': 30, 'y': 40}
@@ -0,0 +1,68 @@
+import os
+import tempfile
+
+import pytest
+
+from remo.annotation_utils import iter_csv_chunks
+from remo.domain import Annotation
+from remo.sdk import SDK
+
+
+def classification(file_name, class_name):
+    return Annotation(img_filename=file_name, classes=class_name)
+
+
+def temp_csv_files():
+    return {name for name in os.listdir(tempfile.gettempdir()) if name.endswith('.csv')}
+
+
+def test_chunk_size_is_counted_in_bytes():
+    annotations = [classification('{}.jpg'.format(i), 'ñandú 猫') for i in range(100)]
+    chunks = list(iter_csv_chunks(annotations, max_bytes=1000))
+    try:
+        assert sum(n_rows for _, n_rows in chunks) == 100
+        for path, _ in chunks[:-1]:
+            size = os.path.getsize(path)
+            # a chunk stops at the first row which reaches the limit
+            assert 1000 <= size < 1000 + 40
+    finally:
+        for path, _ in chunks:
+            os.remove(path)
+
+
+def test_temp_file_is_removed_when_validation_fails():
+    def annotations():
+        for i in range(10):
+            yield classification('{}.jpg'.format(i), 'cat')
+        annotation = Annotation(img_filename='box.jpg', classes='cat')
+        annotation.bbox = [0, 0, 10, 10]
+        yield annotation
+
+    before = temp_csv_files()
+    with pytest.raises(Exception, match='Expected annotation task'):
+        for path, _ in iter_csv_chunks(annotations(), max_rows=100):
+            os.remove(path)
+    assert temp_csv_files() == before
+
+
+def test_upload_session_is_completed_when_annotations_fail(server):
+    def annotations():
+        for i in range(10):
+            yield classification('{}.jpg'.format(i), 'cat')
+        raise ValueError('model failed')
+
+    sdk = SDK('http://localhost:8123', 'user@remo.ai', 'password')
+    with pytest.raises(ValueError, match='model failed'):
+        sdk.upload_annotations(1, 2, annotations(), chunk_size=4)
+    assert [call for call, _ in server.calls] == ['new', 'upload', 'upload', 'complete']
+
+
+def test_rejected_chunks_are_reported(server):
+    for _ in range(2):
+        server.respond(500, {'detail': 'boom'})
+    annotations = [classification('{}.jpg'.format(i), 'cat') for i in range(10)]
+
+    sdk = SDK('http://localhost:8123', 'user@remo.ai', 'password')
+    result = sdk.upload_annotations(1, 2, annotations, chunk_size=5, max_workers=1, wait_for_complete=False)
+    assert result['errors'] == 2
+    assert all('boom' in chunk['error'] for chunk in result['chunks'])
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from remo import annotation_parsers
+from remo.annotation_parsers import parse_coco, parse_csv, parse_voc, parse_yolo
+
+np = pytest.importorskip('numpy')
+
+VOC_XML = """<annotation>
+    <filename>{name}</filename>
+    <object><name>Dog</name><bndbox><xmin>1</xmin><ymin>2</ymin><xmax>30</xmax><ymax>40</ymax></bndbox></object>
+    <object><name>Cat</name><bndbox><xmin>5</xmin><ymin>6</ymin><xmax>7</xmax><ymax>8</ymax></bndbox></object>
+</annotation>
+"""
+
+
+def summary(annotations):
+    return [(a.img_filename, a.classes, a.coordinates) for a in annotations]
+
+
+def test_parse_csv_object_detection(tmp_path):
+    path = tmp_path / 'boxes.csv'
+    path.write_text('file_name,class_name,xmin,ymin,xmax,ymax\na.jpg,Dog;Animal,0,0,10,20\nb.jpg,Cat,1,2,3,4\n')
+    assert summary(parse_csv(str(path))) == [
+        ('a.jpg', ['Dog', 'Animal'], [0, 0, 10, 20]),
+        ('b.jpg', ['Cat'], [1, 2, 3, 4]),
+    ]
+    assert parse_csv(str(path), as_table=True).class_counts() == {'Animal': 1, 'Cat': 1, 'Dog': 1}
+
+
+def test_parse_csv_segments(tmp_path):
+    path = tmp_path / 'segments.csv'
+    path.write_text('file_name,class_name,coordinates\na.jpg,Dog,0; 0; 10; 0; 10; 10\nb.jpg,Cat,1; 2; 3; 4\n')
+    assert summary(parse_csv(str(path))) == [
+        ('a.jpg', ['Dog'], [0, 0, 10, 0, 10, 10]),
+        ('b.jpg', ['Cat'], [1, 2, 3, 4]),
+    ]
+
+
+def test_parse_coco(tmp_path):
+    path = tmp_path / 'coco.json'
+    path.write_text(json.dumps({
+        'images': [{'id': 1, 'file_name': 'a.jpg'}],
+        'categories': [{'id': 7, 'name': 'Dog'}],
+        'annotations': [
+            {'image_id': 1, 'category_id': 7, 'bbox': [10, 20, 30, 40]},
+            {'image_id': 1, 'category_id': 7, 'segmentation': [[0, 0, 5, 0, 5, 5]]},
+        ],
+    }))
+    assert summary(parse_coco(str(path))) == [
+        ('a.jpg', ['Dog'], [10, 20, 40, 60]),
+        ('a.jpg', ['Dog'], [0, 0, 5, 0, 5, 5]),
+    ]
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_parse_voc_folder(tmp_path, monkeypatch, max_workers):
+    monkeypatch.setattr(annotation_parsers, 'MIN_FILES_FOR_PROCESS_POOL', 2)
+    for i in range(5):
+        (tmp_path / '{}.xml'.format(i)).write_text(VOC_XML.format(name='{}.jpg'.format(i)))
+
+    table = parse_voc(str(tmp_path), as_table=True, max_workers=max_workers)
+    assert table.image_names.tolist() == ['{}.jpg'.format(i) for i in range(5) for _ in range(2)]
+    assert table.class_counts() == {'Cat': 5, 'Dog': 5}
+    assert table.bboxes[:2].tolist() == [[1, 2, 30, 40], [5, 6, 7, 8]]
+
+
+def test_parse_yolo_to_pixels(tmp_path):
+    (tmp_path / 'a.txt').write_text('0 0.5 0.5 0.2 0.4\n1 0.25 0.25 0.5 0.5\n')
+    (tmp_path / 'b.txt').write_text('1 0.5 0.5 1 1\n')
+    annotations = parse_yolo(str(tmp_path), classes=['Dog', 'Cat'], image_sizes={'a.jpg': (100, 200)})
+    assert summary(annotations) == [
+        ('a.jpg', ['Dog'], [40, 60, 60, 140]),
+        ('a.jpg', ['Cat'], [0, 0, 50, 100]),
+        # without image size, coordinates stay relative
+        ('b.jpg', ['Cat'], [0, 0, 1, 1]),
+    ]
@@ -0,0 +1,62 @@
+import pytest
+
+from remo.domain import Annotation, AnnotationTable
+
+np = pytest.importorskip('numpy')
+
+
+def box(file_name, classes, coordinates):
+    annotation = Annotation(file_name, classes)
+    annotation.bbox = coordinates
+    return annotation
+
+
+def segment(file_name, classes, coordinates):
+    annotation = Annotation(file_name, classes)
+    annotation.segment = coordinates
+    return annotation
+
+
+@pytest.fixture
+def annotations():
+    return [
+        box('a.jpg', ['Dog', 'Animal'], [0, 0, 10, 20]),
+        box('a.jpg', 'Cat', [5, 5, 10, 10]),
+        segment('b.jpg', 'Dog', [0, 0, 100, 0, 100, 100]),
+        box('c.jpg', 'Dog', [0, 0, 200, 100]),
+        Annotation('d.jpg', 'Cat'),
+    ]
+
+
+def test_rows_per_class(annotations):
+    table = AnnotationTable.from_annotations(annotations, image_ids={'a.jpg': 1, 'b.jpg': 2})
+    assert len(table) == 6
+    assert table.class_counts() == {'Dog': 3, 'Animal': 1, 'Cat': 2}
+    assert table.image_ids.tolist() == [1, 1, 1, 2, -1, -1]
+    assert table.segment_lengths.tolist() == [0, 0, 0, 6, 0, 0]
+
+
+def test_filter_by_class_and_box_area(annotations):
+    table = AnnotationTable.from_annotations(annotations)
+    dogs = table.filter(classes='Dog')
+    large_dogs = dogs.filter(dogs.box_areas() > 1000)
+    assert large_dogs.image_names.tolist() == ['c.jpg']
+    assert large_dogs.box_aspect_ratios().tolist() == [2.0]
+
+    # segments are kept with their rows
+    dog_segments = dogs.filter(dogs.segment_lengths > 0)
+    assert dog_segments.segment_coordinates.tolist() == [0, 0, 100, 0, 100, 100]
+
+
+def test_groupby_class(annotations):
+    groups = AnnotationTable.from_annotations(annotations).groupby_class()
+    assert sorted(groups) == ['Animal', 'Cat', 'Dog']
+    assert groups['Cat'].image_names.tolist() == ['a.jpg', 'd.jpg']
+    assert groups['Dog'].segment_offsets.tolist() == [0, 0, 6, 6]
+
+
+def test_round_trip_to_annotations(annotations):
+    restored = AnnotationTable.from_annotations(annotations).to_annotations()
+    assert [(a.img_filename, a.classes, a.coordinates) for a in restored] == [
+        (a.img_filename, a.classes, a.coordinates) for a in annotations
+    ]
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+import remo
+from remo.async_api import AsyncAPI, Response
+from remo.async_sdk import AsyncSDK
+
+
+class FakeServer:
+    """
+    Accepts only the latest token, as if previous ones expired
+    """
+
+    def __init__(self):
+        self.logins = 0
+        self.requests = []
+
+    async def request(self, api, method, url, headers=None, data=None, **kwargs):
+        if 'login' in url:
+            self.logins += 1
+            await asyncio.sleep(0.01)
+            return Response(200, '{{"key": "token-{}"}}'.format(self.logins).encode())
+
+        if headers.get('Authorization') != 'Token token-{}'.format(self.logins):
+            return Response(401, b'{"detail": "Invalid token"}')
+
+        body = b''
+        if data is not None and hasattr(data, '__aiter__'):
+            async for chunk in data:
+                body += chunk
+        self.requests.append((method, url, len(body)))
+        return Response(200, b'{"id": 1, "name": "ds", "quantity": 0}')
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeServer()
+
+    async def request(self, method, url, **kwargs):
+        self._get_session()
+        return await server.request(self, method, url, **kwargs)
+
+    monkeypatch.setattr(AsyncAPI, '_request', request)
+    return server
+
+
+def run(coroutine_function):
+    async def main():
+        api = AsyncAPI('http://localhost:8123', 'user@remo.ai', 'password')
+        try:
+            return await coroutine_function(api)
+        finally:
+            await api.close()
+
+    return asyncio.run(main())
+
+
+def test_rejected_token_logs_in_once(server):
+    async def requests(api):
+        await api.login()
+        # the server drops the token
+        server.logins += 1
+        return await asyncio.gather(*[api.get_dataset(1) for _ in range(10)])
+
+    results = run(requests)
+    assert all(result['id'] == 1 for result in results)
+    assert server.logins == 3
+    assert len(server.requests) == 10
+
+
+def test_rejected_upload_is_sent_again(server, tmp_path):
+    path = tmp_path / 'image.jpg'
+    path.write_bytes(b'\xff\xd8\xff' + b'0' * 100000)
+
+    async def upload(api):
+        await api.login()
+        server.logins += 1
+        return await api.upload_files(1, [str(path)])
+
+    run(upload)
+    assert server.logins == 3
+    method, url, body_length = server.requests[0]
+    assert body_length > 100000
+
+
+def test_returned_objects_do_not_use_blocking_sdk(server, monkeypatch):
+    monkeypatch.setattr(remo, '_get_sdk', lambda: pytest.fail('connected blocking SDK'))
+
+    async def main():
+        sdk = AsyncSDK('http://localhost:8123', 'user@remo.ai', 'password')
+        try:
+            return await sdk.get_dataset(1)
+        finally:
+            await sdk.close()
+
+    dataset = asyncio.run(main())
+    assert dataset.name == 'ds'
+    with pytest.raises(Exception, match='await sdk.list_annotation_sets'):
+        dataset.annotation_sets()
@@ -0,0 +1,39 @@
+import asyncio
+import threading
+
+from remo.async_api import AsyncAPI, Response
+
+
+def test_upload_files_reads_body_outside_event_loop(tmp_path, monkeypatch):
+    path = tmp_path / 'image.jpg'
+    path.write_bytes(b'\xff\xd8\xff' + b'0' * 200000)
+    reads = []
+
+    async def post(self, url, data=None, headers=None):
+        body = b''
+        async for chunk in data:
+            body += chunk
+        reads.append((threading.get_ident(), len(body), int(headers['Content-Length'])))
+        return Response(200, b'{}')
+
+    monkeypatch.setattr(AsyncAPI, 'post', post)
+    from remo import multipart
+
+    read = multipart.MultipartEncoder.read
+    threads = set()
+
+    def tracked_read(self, size=-1):
+        threads.add(threading.get_ident())
+        return read(self, size)
+
+    monkeypatch.setattr(multipart.MultipartEncoder, 'read', tracked_read)
+
+    async def upload():
+        api = AsyncAPI('http://localhost:8123', 'user@remo.ai', 'password')
+        api.token = 'token'
+        return await api.upload_files(1, [str(path)])
+
+    assert asyncio.run(upload()) == {}
+    loop_thread, body_length, content_length = reads[0]
+    assert body_length == content_length
+    assert threads and loop_thread not in threads
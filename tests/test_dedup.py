@@ -0,0 +1,23 @@
+import pytest
+
+from remo.api import API
+from remo.dedup import UploadIndex
+
+
+def test_delete_dataset_does_not_create_remo_home(tmp_path, monkeypatch, api, server):
+    remo_home = tmp_path / 'missing'
+    monkeypatch.setenv('REMO_HOME', str(remo_home))
+    server.respond(204, {})
+    monkeypatch.setattr(API, 'delete', lambda self, url: server.responses.pop(0))
+    api.delete_dataset(1)
+    assert not remo_home.exists()
+
+
+@pytest.mark.parametrize('status_code, uploaded', [(200, True), (500, False)])
+def test_files_are_recorded_only_when_accepted(tmp_path, api, server, image, status_code, uploaded):
+    api._upload_index = UploadIndex(str(tmp_path / UploadIndex.name))
+    server.respond(status_code, {})
+    api.bulk_upload_files(1, [image], session_id='session', deduplicate=True)
+
+    new_files, _ = api.upload_index.filter_new(api.server, 1, [image])
+    assert new_files == ([] if uploaded else [image])
@@ -0,0 +1,73 @@
+import os
+import stat
+
+import pytest
+
+from remo.api import API
+from remo.image_cache import ImageCache
+from remo.sdk import SDK
+
+URL = 'http://localhost:8123/images/1.jpg'
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    downloads = []
+
+    def iter_image_content(self, url, chunk_size=1 << 20):
+        downloads.append(url)
+        yield b'cached content'
+
+    monkeypatch.setattr(API, 'login', lambda self: None)
+    monkeypatch.setattr(API, 'iter_image_content', iter_image_content)
+    return downloads
+
+
+@pytest.fixture
+def sdk(tmp_path, downloads):
+    sdk = SDK('http://localhost:8123', 'user@remo.ai', 'password')
+    sdk.enable_image_cache(path=str(tmp_path / 'cache'))
+    return sdk
+
+
+def test_cached_files_are_read_only(tmp_path):
+    cache = ImageCache(path=str(tmp_path / 'cache'))
+    path = cache.put('key', [b'content'])
+    assert not os.stat(path).st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+    cache.clear()
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize('link', ['hardlink', 'copy'])
+def test_editing_output_does_not_change_cache(tmp_path, sdk, link):
+    output_file = str(tmp_path / 'out' / '1.jpg')
+    sdk.download_image(URL, output_file, link=link)
+    cached_file = sdk._cached_image_path(URL)
+    assert not os.path.samefile(output_file, cached_file)
+
+    with open(output_file, 'wb') as file:
+        file.write(b'edited')
+    assert sdk.get_image_content(URL) == b'cached content'
+
+
+def test_file_evicted_after_lookup_is_downloaded_again(tmp_path, sdk, downloads, monkeypatch):
+    cached_path = SDK._cached_image_path
+
+    def evicted_after_lookup(self, url):
+        path = cached_path(self, url)
+        if len(downloads) == 1:
+            self.image_cache.clear()
+        return path
+
+    monkeypatch.setattr(SDK, '_cached_image_path', evicted_after_lookup)
+    assert sdk.get_image_content(URL) == b'cached content'
+    assert len(downloads) == 2
+
+    output_file = str(tmp_path / 'out' / '1.jpg')
+    sdk.image_cache.clear()
+    downloads.clear()
+    sdk.download_image(URL, output_file)
+    with open(output_file, 'rb') as file:
+        assert file.read() == b'cached content'
+    assert len(downloads) == 2
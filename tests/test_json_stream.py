@@ -0,0 +1,45 @@
+import io
+import json
+
+import pytest
+
+from remo.json_stream import JSONArrayStream
+
+
+def parse(content: bytes, chunk_size: int) -> list:
+    return list(JSONArrayStream(io.BytesIO(content), chunk_size))
+
+
+@pytest.mark.parametrize(
+    'content',
+    [
+        '[12.5, 3]',
+        '[1e5,2]',
+        '[-0.25]',
+        '[1.5E-10, -7, 0, 123456789012345678901234567890]',
+        '[true, false, null, 1]',
+        '[[1.25, 2], {"x": -3.5e2}, "a,b]"]',
+        ' [ 10 , 20 ] ',
+    ],
+)
+def test_values_split_across_chunks(content):
+    expected = json.loads(content)
+    for chunk_size in range(1, len(content) + 1):
+        assert parse(content.encode(), chunk_size) == expected
+
+
+def test_multibyte_characters_split_across_chunks():
+    data = [{'file_name': 'ü{}.jpg'.format(i), 'classes': ['é', '猫']} for i in range(50)]
+    content = json.dumps(data, ensure_ascii=False, indent=1).encode('utf-8')
+    for chunk_size in (1, 2, 3, 7, 64):
+        assert parse(content, chunk_size) == data
+
+
+def test_empty_array():
+    assert parse(b' [ ] ', 1) == []
+
+
+@pytest.mark.parametrize('content', [b'{"detail": "Not found."}', b'[1, 2', b'[1 2]', b'[12.]', b''])
+def test_invalid_content(content):
+    with pytest.raises(ValueError):
+        parse(content, 2)
@@ -0,0 +1,42 @@
+import inspect
+
+import pytest
+
+import remo
+
+
+@pytest.fixture
+def sdk_calls(monkeypatch):
+    calls = []
+
+    class FakeSDK:
+        def list_datasets(self):
+            calls.append('list_datasets')
+            return []
+
+    def get_sdk():
+        calls.append('connect')
+        return FakeSDK()
+
+    monkeypatch.setattr(remo, '_get_sdk', get_sdk)
+    yield calls
+    vars(remo).pop('list_datasets', None)
+
+
+def test_lookup_does_not_connect(sdk_calls):
+    assert hasattr(remo, 'list_datasets')
+    assert callable(remo.list_datasets)
+    assert 'dataset_id' in inspect.signature(remo.get_dataset).parameters
+    assert 'self' not in inspect.signature(remo.get_dataset).parameters
+    vars(remo).pop('get_dataset', None)
+    assert sdk_calls == []
+
+
+def test_call_connects(sdk_calls):
+    assert remo.list_datasets() == []
+    assert sdk_calls == ['connect', 'list_datasets']
+
+
+def test_unknown_attribute(sdk_calls):
+    assert not hasattr(remo, 'no_such_function')
+    assert sdk_calls == []
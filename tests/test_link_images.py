@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from remo.api import API
+from remo.domain import Image
+from remo.sdk import SDK
+
+
+@pytest.fixture
+def sdk(monkeypatch):
+    monkeypatch.setattr(API, 'login', lambda self: None)
+    return SDK('http://localhost:8123', 'user@remo.ai', 'password')
+
+
+@pytest.mark.parametrize('link', ['hardlink', 'copy'])
+def test_materialize_over_existing_symlink(tmp_path, sdk, link):
+    source_dir = tmp_path / 'source'
+    source_dir.mkdir()
+    source = source_dir / 'image.jpg'
+    source.write_bytes(b'original')
+    image = Image(id=1, name='image.jpg', path=str(source), size=len(b'original'))
+    output_dir = tmp_path / 'output'
+    output_file = output_dir / 'image.jpg'
+
+    result = sdk.download_images([image], str(output_dir), link='symlink')
+    assert result['errors'] == {}
+    assert output_file.is_symlink()
+
+    result = sdk.download_images([image], str(output_dir), overwrite=True, link=link)
+    assert result['errors'] == {}
+    assert not output_file.is_symlink()
+    assert output_file.read_bytes() == b'original'
+
+    # the source is not written through the old link, and no temporary files are left behind
+    output_file.unlink()
+    assert source.read_bytes() == b'original'
+    assert os.listdir(str(source_dir)) == ['image.jpg']
+    assert os.listdir(str(output_dir)) == []
+
+
+def test_hardlink_twice_leaves_no_temporary_file(tmp_path, sdk):
+    source = tmp_path / 'image.jpg'
+    source.write_bytes(b'original')
+    image = Image(id=1, name='image.jpg', path=str(source), size=len(b'original'))
+    output_dir = tmp_path / 'output'
+
+    for _ in range(2):
+        sdk.download_images([image], str(output_dir), overwrite=True, link='hardlink')
+    assert os.listdir(str(output_dir)) == ['image.jpg']
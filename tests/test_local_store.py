@@ -0,0 +1,60 @@
+import time
+from collections import Counter
+
+import pytest
+
+from remo.api import API
+from remo.sdk import SDK
+from remo.store import MetadataStore
+
+N_IMAGES = 250
+
+
+@pytest.fixture
+def requests(monkeypatch):
+    requests = Counter()
+
+    def get_dataset(self, dataset_id):
+        requests['get_dataset'] += 1
+        # widens the window in which concurrent callers find the dataset not synced
+        time.sleep(0.05)
+        return {'id': dataset_id, 'name': 'ds', 'quantity': N_IMAGES, 'updated_at': '2020-01-01'}
+
+    def list_dataset_images(self, dataset_id, limit=None, offset=None):
+        requests['list_dataset_images'] += 1
+        images = [{'id': i, 'name': '{}.jpg'.format(i), 'tags': []} for i in range(N_IMAGES)]
+        return {'results': images[offset : offset + limit]}
+
+    monkeypatch.setattr(API, 'login', lambda self: None)
+    monkeypatch.setattr(API, 'get_dataset', get_dataset)
+    monkeypatch.setattr(API, 'list_annotation_sets', lambda self, dataset_id: {'results': []})
+    monkeypatch.setattr(API, 'list_dataset_images', list_dataset_images)
+    return requests
+
+
+@pytest.fixture
+def sdk(tmp_path, requests):
+    sdk = SDK('http://localhost:8123', 'user@remo.ai', 'password')
+    sdk.enable_local_store(str(tmp_path / 'store.sqlite3'))
+    return sdk
+
+
+def test_concurrent_pages_sync_dataset_once(tmp_path, sdk, requests):
+    MetadataStore(sdk.api.server, str(tmp_path / 'other.sqlite3')).sync_dataset(sdk.api, 1)
+    one_sync = requests.copy()
+    requests.clear()
+
+    images = list(sdk.iter_dataset_images(1, page_size=10, max_pages_in_flight=4))
+    assert [img.id for img in images] == list(range(N_IMAGES))
+    # pages are read from the store, after one sync
+    assert requests == one_sync
+
+
+def test_image_index_is_built_once(sdk, requests):
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(4) as ex:
+        indexes = list(ex.map(lambda _: sdk._image_index(1), range(4)))
+    assert all(index is indexes[0] for index in indexes)
+    assert len(indexes[0]) == N_IMAGES
+    assert requests['get_dataset'] == 1
@@ -0,0 +1,69 @@
+from urllib.parse import parse_qs, urlparse
+
+from remo.api import API
+from remo.utils import iter_pages
+
+N_RESULTS = 2500
+SERVER_MAX_PAGE_SIZE = 100
+
+
+def capped_page(offset, limit):
+    limit = min(limit, SERVER_MAX_PAGE_SIZE)
+    return list(range(N_RESULTS))[offset : offset + limit]
+
+
+class CappedSearchAPI(API):
+    """
+    Search endpoint paginated by offset, which returns at most ``SERVER_MAX_PAGE_SIZE`` results per page
+    """
+
+    def __init__(self, with_count=True):
+        super().__init__('http://localhost:8123', 'user@remo.ai', 'password', login=False)
+        self.with_count = with_count
+
+    def _search_page(self, url):
+        query = parse_qs(urlparse(url).query)
+        offset = int(query.get('offset', [0])[0])
+        limit = int(query['limit'][0])
+        results = [{'image': {'id': i}} for i in capped_page(offset, limit)]
+        data = {'results': results, 'next': None}
+        if offset + len(results) < N_RESULTS:
+            data['next'] = 'http://localhost:8123/search/?limit={}&offset={}'.format(limit, offset + len(results))
+        if self.with_count:
+            data['count'] = N_RESULTS
+        return data
+
+
+def test_iter_pages_with_capped_page_size():
+    items = [item for page in iter_pages(capped_page, 1000, max_pages_in_flight=4) for item in page]
+    assert items == list(range(N_RESULTS))
+
+
+def test_iter_pages_never_grows_page_size_above_server_cap():
+    sizes = []
+
+    def fetch_page(offset, limit):
+        sizes.append(limit)
+        return capped_page(offset, limit)
+
+    pages = iter_pages(fetch_page, 100, adapt_page_size=lambda size, elapsed: size * 2)
+    items = [item for page in pages for item in page]
+    assert items == list(range(N_RESULTS))
+    assert max(sizes[4:]) <= SERVER_MAX_PAGE_SIZE
+
+
+def test_iter_pages_with_limit():
+    items = [item for page in iter_pages(capped_page, 300, limit=777, offset=10) for item in page]
+    assert items == list(range(10, 787))
+
+
+def test_iter_search_images_with_capped_page_size():
+    for with_count in (True, False):
+        api = CappedSearchAPI(with_count)
+        ids = [entry['image']['id'] for entry in api.iter_search_images(1)]
+        assert ids == list(range(N_RESULTS))
+
+
+def test_iter_search_images_with_capped_page_size_and_limit():
+    ids = [entry['image']['id'] for entry in CappedSearchAPI().iter_search_images(1, limit=1234, page_size=500)]
+    assert ids == list(range(1234))
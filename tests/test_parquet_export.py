@@ -0,0 +1,48 @@
+import io
+
+import pytest
+
+from remo.api import API
+from remo.sdk import SDK
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+@pytest.fixture
+def sdk(monkeypatch):
+    monkeypatch.setattr(API, 'login', lambda self: None)
+    return SDK('http://localhost:8123', 'user@remo.ai', 'password')
+
+
+def test_annotations_csv_is_streamed_to_parquet(tmp_path, sdk, monkeypatch):
+    rows = ['file_name,class_name,xmin,ymin,xmax,ymax']
+    rows += ['image_{}.jpg,Dog,{},{},{},{}'.format(i, i, i, i + 10, i + 20) for i in range(50000)]
+    content = '\n'.join(rows).encode()
+    monkeypatch.setattr(API, 'open_export_annotations', lambda self, *args, **kwargs: io.BytesIO(content))
+
+    output_file = str(tmp_path / 'annotations.parquet')
+    sdk.export_annotations_to_parquet(output_file, annotation_set_id=1)
+
+    parquet = pq.ParquetFile(output_file)
+    # written block by block, while the CSV is read
+    assert parquet.num_row_groups > 1
+    table = parquet.read()
+    assert table.num_rows == 50000
+    assert table.column('file_name')[49999].as_py() == 'image_49999.jpg'
+    assert table.column('ymax')[1].as_py() == 21
+
+
+def test_dataset_images_are_written_page_by_page(tmp_path, sdk, monkeypatch):
+    images = [{'id': i, 'name': '{}.jpg'.format(i), 'size': 100 + i} for i in range(250)]
+
+    def list_dataset_images(self, dataset_id, limit=None, offset=None):
+        return {'results': images[offset : offset + limit]}
+
+    monkeypatch.setattr(API, 'list_dataset_images', list_dataset_images)
+    output_file = str(tmp_path / 'images.parquet')
+    sdk.export_dataset_images_to_parquet(output_file, dataset_id=3, page_size=100)
+
+    table = pq.read_table(output_file)
+    assert table.column('id').to_pylist() == list(range(250))
+    assert set(table.column('dataset_id').to_pylist()) == {3}
+    assert pq.ParquetFile(output_file).num_row_groups == 3
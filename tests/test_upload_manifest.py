@@ -0,0 +1,51 @@
+import pytest
+
+from remo.api import API
+from remo.sdk import SDK
+from remo.upload_manifest import UploadManifest
+
+
+@pytest.fixture
+def sdk(server):
+    return SDK('http://localhost:8123', 'user@remo.ai', 'password')
+
+
+def test_manifest_is_not_written_without_resume(remo_home, image, sdk):
+    sdk.add_data_to_dataset(1, paths_to_upload=[image], wait_for_complete=False)
+    assert not (remo_home / UploadManifest.dir_name).exists()
+
+
+def test_failed_group_is_not_marked_done(remo_home, image, server, api):
+    server.respond(500, {'detail': 'server error'})
+    manifest = UploadManifest(1, 'session', 'fingerprint')
+    api.bulk_upload_files(1, [image], session_id='session', manifest=manifest)
+    assert not manifest.is_group_done(0)
+
+    resumed = UploadManifest.load(manifest.path)
+    api.bulk_upload_files(1, [image], session_id='session', manifest=resumed)
+    assert resumed.is_group_done(0)
+    assert UploadManifest.load(manifest.path).results == {0: {'files': 1}}
+
+
+def test_failed_group_is_retried_on_resume(remo_home, tmp_path, server, sdk, monkeypatch):
+    images = []
+    for i in range(3):
+        path = tmp_path / '{}.jpg'.format(i)
+        path.write_bytes(b'\xff\xd8\xff' + b'0' * 100)
+        images.append(str(path))
+    # one group per image
+    monkeypatch.setattr(API, 'split_files_by_size', staticmethod(lambda files: [[path] for path in sorted(files)]))
+
+    server.respond(200, {'files': 1})
+    server.respond(500, {'detail': 'server error'})
+    server.respond(200, {'files': 1})
+    with pytest.raises(Exception, match='Failed to upload 1 of 3 groups'):
+        sdk.add_data_to_dataset(1, paths_to_upload=images, resume=True, wait_for_complete=False)
+    assert [call for call, _ in server.calls] == ['new', 'upload', 'upload', 'upload']
+    assert len(list((remo_home / UploadManifest.dir_name).iterdir())) == 1
+
+    server.calls.clear()
+    result = sdk.add_data_to_dataset(1, paths_to_upload=images, resume=True, wait_for_complete=False)
+    assert result == {'session_id': 'session-1'}
+    assert [call for call, _ in server.calls] == ['upload', 'complete']
+    assert list((remo_home / UploadManifest.dir_name).iterdir()) == []